@@ -1,17 +1,37 @@
-import re
+import json
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache, wraps
 from pydantic import BaseModel, Field
 from typing import Dict, Any, Literal, TypedDict, List, Annotated
-from langgraph.types import Command
+from langgraph.types import Command, Send
 from langchain_core.tools import tool
 from langgraph.prebuilt import create_react_agent
+from langgraph.prebuilt.chat_agent_executor import AgentState
 from langgraph.graph import StateGraph, START, END, MessagesState
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-from data_fetch import run_get_tasks, LLM, RETRO_FEEDBACK
+from data_fetch import run_get_tasks, LLM
+from board_query import board_context, filter_tasks
+from comments import COMMENT_CACHE, task_versions
+from metrics import BLOCKED_STATUSES, IN_PROGRESS_STATUSES, compute_metrics, current_sprint, prepare
+from prompt_encoding import encode_tasks
+from retro_store import retro_context
+from planner import BRANCHES, plan_for_messages
+from router import FAST_ROUTER, latest_question
+from streaming import StreamRenderer
+from fence_parser import CODE, CODE_END, CODE_START, FenceParser
+from tracing import traced_node
 import streamlit as st
 import streamlit.components.v1 as components
-from tools import *
-from prompts import *
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from tools import (add_comment, bulk_add_comments, bulk_update_task_status, get_comments_for_tasks,
+                   get_list_members, get_member_workload, get_recurring_issues, get_sprint_metrics, get_task_comments,
+                   math_calculator, query_tasks, search_retrospectives, update_task_status)
+from prompts import scrum_master_prompt
 RETRY_LIMIT = 2
+COMMENTS_BRANCH_LIMIT = 10
+HTML_LANGUAGES = {"html", "htm"}
 
 
 members = ["scrum_master", "writer", "visualizer"]
@@ -23,6 +43,7 @@ class State(MessagesState):
     #     st_thinking = thinking_status
     st_thinking: st.expander = Field(default_factory=lambda: st.expander("Thinking...", expanded=True))
     next: str
+    branches: List[str]
 
 class Router(TypedDict):
     """Worker to route to next. If no workers needed, route to FINISH."""
@@ -57,7 +78,7 @@ Available Agents:
    - Complex relationships would be clearer with visual representation
    - The user needs to or should see patterns or trends in data
 
-4. You are given the RetroSpective Feedback of the last two sprints. When user asks about retrospective report, you will directly call the writer agent to generate the report.  
+4. Retrospective and standup history is looked up for you when the question needs it. When user asks about retrospective report, you will directly call the writer agent to generate the report.  
 
 Your goal is to ensure efficient collaboration between agents without unnecessary steps while delivering complete solutions to user requests.
 
@@ -77,8 +98,14 @@ YOUR RESPONSE: """
         with st.container(border=True):
             with st.spinner():
                 st.write("Superviser Agent: Thinking of next steps...")
-                response = LLM.with_structured_output(Router).invoke(messages)
-                goto = response["next"]
+                route = FAST_ROUTER.route(state["messages"])
+                if route is not None:
+                    goto = route.next
+                else:
+                    started = time.perf_counter()
+                    response = LLM.with_structured_output(Router).invoke(messages)
+                    FAST_ROUTER.stats.record_llm(time.perf_counter() - started)
+                    goto = response["next"]
                 print(f"FROM: Supervisor, TO: {goto}\n{state}")
 
                 if state["invoke_history"][goto] >= RETRY_LIMIT:
@@ -88,16 +115,39 @@ YOUR RESPONSE: """
 
                 return Command(goto=goto, update=state)
 
-def get_scrum_data():
-    return run_get_tasks().to_json(orient="records")
+def get_scrum_data(encoding=None):
+    return encode_tasks(run_get_tasks(), encoding)
 
+def get_board_context():
+    return board_context(run_get_tasks())
 
-def scrum_master_node(state: State) -> Command[Literal["supervisor"]]:
 
-    react_agent = create_react_agent(
-    LLM,  
-    tools=[get_task_comments , get_list_members,add_comment,math_calculator,update_task_status ] , state_modifier=SystemMessage(  scrum_master_prompt.format(get_scrum_data())) )
+SCRUM_MASTER_TOOLS = [query_tasks, get_sprint_metrics, get_member_workload, get_task_comments, get_comments_for_tasks,
+                      get_list_members, search_retrospectives, get_recurring_issues, add_comment,
+                      math_calculator, update_task_status, bulk_update_task_status, bulk_add_comments]
+
+
+class ScrumMasterState(AgentState):
+    board_context: str
+
+
+def scrum_master_prompt_messages(state: ScrumMasterState):
+    return [SystemMessage(scrum_master_prompt.format(state["board_context"]))] + state["messages"]
+
+
+def build_scrum_master_agent(llm=None):
+    """Build the scrum master react agent. The board overview arrives per turn in its state."""
+    return create_react_agent(llm or LLM, tools=SCRUM_MASTER_TOOLS, state_schema=ScrumMasterState,
+                              state_modifier=scrum_master_prompt_messages)
+
 
+@lru_cache(maxsize=None)
+def get_scrum_master_agent():
+    return build_scrum_master_agent()
+
+
+def scrum_master_node(state: State) -> Command[Literal["supervisor"]]:
+    react_agent = get_scrum_master_agent()
 
     if "invoke_history" not in state:
         state["invoke_history"] = {m: 0 for m in members}
@@ -107,12 +157,9 @@ def scrum_master_node(state: State) -> Command[Literal["supervisor"]]:
         with st.container(border=True):
             with st.spinner():
                 st.write("Clickup API: Gathering Data")
-                messages = [{"role": "system", "content": f"""You are an Experienced scrum Master, You are given the Entire Scrum Project Information of the User's project Team. Your task is to help the user search and analyze the project data so that it can be formed into a coherent response. Respond with the relevant data points from the scrum data given to you and your analysis of the data as per the user query, in structured and easily understandable manner.
-                AVAILABLE SCRUM DATA IN JSON:
-                {get_scrum_data()}
-                """}] + state["messages"]
+                board = get_board_context()
                 st.write("Refining Data based on user query...")
-                result = react_agent.invoke(state)
+                result = react_agent.invoke({"messages": state["messages"], "board_context": board})
 
                 last_ai_message = result['messages'][-1]
                 return Command(
@@ -130,10 +177,96 @@ def scrum_master_node(state: State) -> Command[Literal["supervisor"]]:
                 )
 
 
-def extract_from_markdown(text, mark="python"):
-    pattern = r'```{}\s*(.*?)\s*```'.format(mark)
-    match = re.search(pattern, text, re.DOTALL)
-    return match.group(1) if match else None
+@contextmanager
+def thinking_step(state: State, label: str):
+    with state["st_thinking"]:
+        with st.container(border=True):
+            with st.spinner():
+                st.write(label)
+                yield
+
+
+def branch_node(func):
+    """Wrap a node that may run as a parallel branch.
+
+    LangGraph runs parallel branches on worker threads, which have no
+    Streamlit script context; attach the one captured when the branches
+    were planned so their status output still reaches the page.
+    """
+    @wraps(func)
+    def node(state):
+        ctx = state.get("script_ctx")
+        if ctx is not None and get_script_run_ctx(suppress_warning=True) is None:
+            add_script_run_ctx(threading.current_thread(), ctx)
+        return func(state)
+    return node
+
+
+def planner_node(state: State) -> dict:
+    """Pick the analysis branches for the latest question; fan_out starts them in parallel."""
+    st_thinking = state.get("st_thinking") or st.expander("Thinking...", expanded=True)
+    branches = plan_for_messages(state["messages"])
+    with st_thinking:
+        st.write(f"Planner: running {', '.join(branches)} in parallel" if branches else "Planner: no data lookup needed")
+    return {
+        "branches": branches,
+        "invoke_history": state.get("invoke_history") or {m: 0 for m in members},
+        "st_thinking": st_thinking,
+    }
+
+
+def fan_out(state: State):
+    if not state["branches"]:
+        return "supervisor"
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return [Send(branch, {**state, "script_ctx": ctx}) for branch in state["branches"]]
+
+
+def metrics_node(state: State) -> dict:
+    with thinking_step(state, "Metrics Engine: Computing sprint metrics..."):
+        metrics = compute_metrics(run_get_tasks(), include_burndown=False)
+    content = "SPRINT METRICS (JSON):\n" + json.dumps(metrics, default=str)
+    return {"messages": [HumanMessage(content=content, name="metrics")]}
+
+
+def comments_node(state: State) -> dict:
+    with thinking_step(state, "Clickup API: Reading comments on blocked and in-progress tasks..."):
+        df = run_get_tasks()
+        sprint = current_sprint(prepare(df))
+        tasks = filter_tasks(df, status=sorted(BLOCKED_STATUSES | IN_PROGRESS_STATUSES),
+                             sprint_name=[sprint] if sprint else None).head(COMMENTS_BRANCH_LIMIT)
+        comments = COMMENT_CACHE.get_many(tasks["id"], task_versions(tasks))
+    lookup = [
+        {"task_id": task_id, "name": name, "status": status, "assignees": assignees, "comments": task_comments}
+        for task_id, name, status, assignees, task_comments
+        in zip(tasks["id"], tasks["name"], tasks["status"], tasks["assignees"], comments.values())
+    ]
+    content = "COMMENTS ON BLOCKED AND IN-PROGRESS TASKS (JSON):\n" + json.dumps(lookup, default=str)
+    return {"messages": [HumanMessage(content=content, name="comments")]}
+
+
+def chart_data_node(state: State) -> dict:
+    with thinking_step(state, "Metrics Engine: Preparing chart data..."):
+        df = run_get_tasks()
+        metrics = compute_metrics(df, include_burndown=True)
+        status_counts = df.groupby(["sprint_name", "status"]).size().rename("tasks").reset_index()
+    data = {
+        "burndown_sprint": metrics["focus_sprint"],
+        "burndown": metrics.get("burndown", []),
+        "velocity": [{k: row.get(k) for k in ("sprint_name", "committed_points", "velocity", "remaining_points")}
+                     for row in metrics["per_sprint"]],
+        "status_counts": status_counts.to_dict(orient="records"),
+    }
+    content = "CHART DATA (JSON):\n" + json.dumps(data, default=str)
+    return {"messages": [HumanMessage(content=content, name="chart_data")]}
+
+
+def retro_node(state: State) -> dict:
+    with thinking_step(state, "Retrospective History: Looking up past sprints..."):
+        question, _ = latest_question(state["messages"])
+        context = retro_context(question or "")
+    content = "RETROSPECTIVE HISTORY (JSON):\n" + json.dumps(context, default=str)
+    return {"messages": [HumanMessage(content=content, name="retro")]}
 
 
 def visualizer(state: State) -> Command[Literal["__end__"]]:
@@ -167,44 +300,47 @@ def visualizer(state: State) -> Command[Literal["__end__"]]:
 11. **Markdown Formatting**: Ensure your response is properly formatted using Markdown syntax, including headings, lists and code blocks.
                  """,}] + state["messages"]
     html_expander = st.expander("Generating Visuals")
-    html_placeholder = st.empty()
     content_placeholder = st.empty()
     st.session_state.stream_buffer = ""
-    html_block_flag = False
-    html_code = ""
-    with st.chat_message("assistant"):
-        for data in LLM.stream(messages):
-            try:
-                if "```" in data.content:
-                    html_block_flag = True
-                    html_code = ""
-                elif html_block_flag and "```" in data.content:
-                    html_block_flag = False
-                    html_code += data.content
-                    with html_expander:
-                        html_placeholder.markdown(html_code)
-                        html_code_str = extract_from_markdown(html_code, mark='html')
-                        components.html(html_code_str, height=600, scrolling=True)
-                    #html_placeholder.code(html_code.replace("```html", "").replace("```", "").strip())
-                
-                # Accumulate HTML or regular content
-                if html_block_flag:
-                    html_code += data.content
-                    with html_expander:
-                        html_placeholder.markdown(html_code)
-                        # components.html(html_code_str, height=600, scrolling=True)
+    content = StreamRenderer(content_placeholder.write)
+    parser = FenceParser()
+    html_code = None
+
+    def handle(event):
+        nonlocal html_code
+        # HTML blocks are previewed as code and rendered once when they close;
+        # any other code block stays in the answer.
+        if event.kind == CODE_START and event.language in HTML_LANGUAGES:
+            with html_expander:
+                preview = st.empty()
+            html_code = StreamRenderer(lambda code: preview.code(code, language="html"))
+        elif event.kind == CODE_END and html_code is not None:
+            with html_expander:
+                components.html(html_code.close(), height=600, scrolling=True)
+            html_code = None
+        elif event.kind == CODE and html_code is not None:
+            html_code.write(event.text)
+        elif event.kind == CODE_START:
+            content.write(f"```{event.language}\n")
+        elif event.kind == CODE_END:
+            content.write("```\n")
+        else:
+            content.write(event.text)
 
-                else:
-                    st.session_state.stream_buffer += data.content
-                    content_placeholder.write(st.session_state.stream_buffer)
-
-            except Exception as e:
-                st.write(e)
-                pass
+    with st.chat_message("assistant"):
+        try:
+            for data in LLM.stream(messages):
+                for event in parser.feed(data.content):
+                    handle(event)
+            for event in parser.close():
+                handle(event)
+        except Exception as e:
+            st.write(e)
+        st.session_state.stream_buffer = content.close()
 
     return Command(
         update={
-        "messages": messages + [{"role": "assistant", "content": st.session_state.stream_buffer}],
+        "messages": [{"role": "assistant", "content": st.session_state.stream_buffer}],
         "next": "FINISHED",
         "invoke_history": {
             **state["invoke_history"],
@@ -216,33 +352,25 @@ def visualizer(state: State) -> Command[Literal["__end__"]]:
         
 
 def writer_node(state: State) -> Command[Literal["supervisor"]]:
-    messages = [{"role": "system", "content": f"""You are an Expert Writer, You are given all the information needed to answer the user's query in a coherent manner. Your task is to craft a response that is concise, clear, and easy to understand. Use tables and bullets points to structure and organize wherever the information can be expressed in a structured and elegant manner. \
-                You are also given the retrospective feedback of the last two sprints. Use this information only when asked about creating Retrospective Report. RETROSPECTIVE_FEEDBACK: {RETRO_FEEDBACK}. Do not incude Retrospective information for any other question"""}] + state["messages"]
+    messages = [{"role": "system", "content": """You are an Expert Writer, You are given all the information needed to answer the user's query in a coherent manner. Your task is to craft a response that is concise, clear, and easy to understand. Use tables and bullets points to structure and organize wherever the information can be expressed in a structured and elegant manner. \
+                When asked for a Retrospective Report, use the RETROSPECTIVE HISTORY in the conversation: summarise the feedback of the latest sprint, then analyse the recurring issues across sprints, the action items already tried against them and how to rectify them. Do not incude Retrospective information for any other question"""}] + state["messages"]
 
     st.session_state.stream_buffer = ""
 
-    def stream_handler(chunk: str, place_holder) -> None:
-        st.session_state.stream_buffer += chunk
-        # Print each chunk as it comes in
-        place_holder.write(st.session_state.stream_buffer)
-    
-    # Configure the LLM to use the streaming callback
-    config = {}
-    config["callbacks"] = [{"stream": stream_handler}]
-    
-    # Generate a response (streaming happens through the callback)
+    # Generate a response, redrawing the placeholder in batches rather than per token
     with st.chat_message("assistant"):
-        place_holder = st.empty()
+        renderer = StreamRenderer(st.empty().write)
         try:
             for chunk in LLM.stream(messages):
-                stream_handler(chunk.content, place_holder)
+                renderer.write(chunk.content)
         except:
             pass
+        st.session_state.stream_buffer = renderer.close()
     
     # Add the completed response to the state
     return Command(
         update={
-        "messages": messages + [{"role": "assistant", "content": st.session_state.stream_buffer}],
+        "messages": [{"role": "assistant", "content": st.session_state.stream_buffer}],
         "next": "FINISHED",
         "invoke_history": {
             **state["invoke_history"],
@@ -259,11 +387,26 @@ def create_workflow() -> StateGraph:
     # Initialize the graph
     workflow = StateGraph(State)
     
-    # Add the nodes (agents)
-    workflow.add_node("supervisor", supervisor_node)
-    workflow.add_node("scrum_master", scrum_master_node)
-    workflow.add_node("writer", writer_node)
-    workflow.add_node("visualizer", visualizer)
+    # Add the nodes (agents); each run is recorded as a span of the current trace
+    nodes = {
+        "planner": planner_node,
+        "supervisor": supervisor_node,
+        "scrum_master": branch_node(scrum_master_node),
+        "metrics": branch_node(metrics_node),
+        "comments": branch_node(comments_node),
+        "chart_data": branch_node(chart_data_node),
+        "retro": branch_node(retro_node),
+        "writer": writer_node,
+        "visualizer": visualizer,
+    }
+    for name, node in nodes.items():
+        workflow.add_node(name, traced_node(name, node))
+
+    # The planner fans out to the analysis branches, which run in parallel and
+    # join at the supervisor (scrum_master reaches it through its Command).
+    workflow.add_conditional_edges("planner", fan_out, BRANCHES + ["supervisor"])
+    for branch in ("metrics", "comments", "chart_data", "retro"):
+        workflow.add_edge(branch, "supervisor")
     
     # Add the edges (connections between agents)
     # workflow.add_edge("supervisor", "scrum_master")
@@ -271,12 +414,18 @@ def create_workflow() -> StateGraph:
     # workflow.add_edge("writer", END)
     
     # Set the entry point
-    workflow.set_entry_point("scrum_master")
+    workflow.set_entry_point("planner")
     
     # Compile the graph
     return workflow.compile()
 
 
+@lru_cache(maxsize=None)
+def get_workflow():
+    """The compiled workflow, built once per process and shared by every session."""
+    return create_workflow()
+
+
 def CardProperties(BaseModel):
     title: str
     description: str
@@ -1,10 +1,13 @@
+import os
+import threading
 import streamlit as st
 import time
-from streamlit_extras.stylable_container import stylable_container
-from agent import create_workflow
-from data_fetch import LLM, RETRO_FEEDBACK
-graph = create_workflow()
-from data_fetch import run_get_tasks
+from data_fetch import LLM, run_get_tasks
+from memory import ConversationMemory
+import tracing
+
+# Build the agent stack in the background once the first page is out, instead of on the first question.
+PRELOAD_AGENT = os.getenv("PRELOAD_AGENT", "true").lower() in ("1", "true", "yes")
 
 # Page configuration
 st.set_page_config(
@@ -17,6 +20,11 @@ st.set_page_config(
 if "messages" not in st.session_state:
     st.session_state.messages = []
 
+# What the graph sees of the conversation: a rolling summary plus the last few turns, within a token budget.
+# st.session_state.messages keeps the full history for display only.
+if "memory" not in st.session_state:
+    st.session_state.memory = ConversationMemory(LLM)
+
 if "stream_buffer" not in st.session_state:
     st.session_state.stream_buffer = ""
 
@@ -53,6 +61,47 @@ if "expander_expanded" not in st.session_state:
 #     except:
 #         pass
 
+@st.cache_resource(show_spinner=False)
+def warm_up_agent():
+    """Import the agent modules, compile the graph and build the model, once per process."""
+    def build():
+        from agent import get_workflow
+        get_workflow()
+        LLM.get()
+    thread = threading.Thread(target=build, name="agent-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+def render_trace(turn):
+    summary = turn.summary()
+    # Loads, fetches and model calls this turn joined while another session was already making them.
+    shared = sum(value for name, value in summary.items() if name.endswith("_shared"))
+    st.caption(
+        f"Answered in {summary['total_ms'] / 1000:.1f}s · {summary['llm_calls']} LLM calls "
+        f"({summary['input_tokens']} prompt / {summary['output_tokens']} completion tokens, "
+        f"{summary['llm_cache_hits']} cached) · {summary['clickup_requests']} ClickUp requests "
+        f"({summary['clickup_bytes'] / 1024:.0f} KB)" + (f" · {shared} shared with other sessions" if shared else "")
+    )
+    st.dataframe(turn.breakdown(), hide_index=True, use_container_width=True)
+
+def run_graph(question):
+    """Answer the chat history with the graph, tracing the turn and showing its breakdown under "Thinking..."."""
+    # The agent stack is imported and the graph compiled on the first question, once per process.
+    from agent import get_workflow
+    from trace_callbacks import TRACE_CALLBACK
+    graph = get_workflow()
+    st_thinking = None
+    with tracing.trace("query", question=question) as turn:
+        for chunk in graph.stream({"messages": st.session_state.memory.messages(question)}, subgraphs=False,
+                                  config={"callbacks": [TRACE_CALLBACK]}):
+            for update in chunk.values():
+                if isinstance(update, dict) and update.get("st_thinking") is not None:
+                    st_thinking = update["st_thinking"]
+    st.session_state.memory.add_turn(question, st.session_state.stream_buffer)
+    if turn is not None and st_thinking is not None:
+        with st_thinking:
+            render_trace(turn)
+
 # Function to handle question button clicks
 def ask_question(question):
     with st.session_state.history_container:
@@ -63,8 +112,7 @@ def ask_question(question):
         st.session_state.messages.append({"role": "user", "content": question})
 
         # if question != "Get the Retrospective Report":
-        for chunk in graph.stream({"messages": st.session_state.messages}):
-            print(chunk)
+        run_graph(question)
         # else:
         #     generate_retro_report()
             
@@ -279,8 +327,7 @@ def main():
                 # Collapse expander when chat starts
                 st.session_state.expander_expanded = False
                 with history_container:                
-                    for chunk in graph.stream({"messages": st.session_state.messages}, subgraphs=False):
-                        print(chunk)
+                    run_graph(prompt)
                 
                 st.session_state.messages.append({"role": "assistant", "content": st.session_state.stream_buffer})
                 
@@ -296,5 +343,8 @@ def main():
         with st.container(border=True, height=750):
             render_sprint_sidebar()
 
+    if PRELOAD_AGENT:
+        warm_up_agent()
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,50 @@
+"""Per-turn setup overhead: building the react agent and graph every turn vs once.
+
+    python benchmarks/bench_agent_setup.py --turns 50
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel  # noqa: E402
+
+
+class ToolCapableFake(GenericFakeChatModel):
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+def timed(fn, turns):
+    start = time.perf_counter()
+    for _ in range(turns):
+        fn()
+    return (time.perf_counter() - start) / turns * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=50)
+    args = parser.parse_args()
+
+    import agent
+
+    agent.LLM = model = ToolCapableFake(messages=iter([]))
+    agent.get_scrum_master_agent.cache_clear()
+    agent.get_workflow.cache_clear()
+
+    rows = [
+        ("react agent: build per turn", timed(lambda: agent.build_scrum_master_agent(model), args.turns)),
+        ("react agent: cached", timed(agent.get_scrum_master_agent, args.turns)),
+        ("workflow: compile per turn", timed(agent.create_workflow, args.turns)),
+        ("workflow: cached", timed(agent.get_workflow, args.turns)),
+    ]
+    print(f"{'setup':<30} {'ms/turn':>10}")
+    for label, ms in rows:
+        print(f"{label:<30} {ms:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
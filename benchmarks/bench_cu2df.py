@@ -0,0 +1,115 @@
+"""Benchmark the columnar `cu2df` against the original dict-per-task loop.
+
+Also asserts that both produce an identical DataFrame.
+
+    python benchmarks/bench_cu2df.py --sizes 1000 10000 50000
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from synthetic import make_tasks  # noqa: E402
+
+
+def cu2df_rowwise(tasks):
+    """The original per-task implementation, kept as the reference."""
+    task_data = []
+    for task in tasks:
+        task_info = {
+            'id': task.get('id'),
+            'custom_id': task.get('custom_id'),
+            'custom_item_id': task.get('custom_item_id'),
+            'name': task.get('name'),
+            'description': task.get('description'),
+            'status': task.get('status', {}).get('status'),
+            'status_color': task.get('status', {}).get('color'),
+            'date_created': pd.to_datetime(int(task.get('date_created', 0))/1000, unit='s'),
+            'date_updated': pd.to_datetime(int(task.get('date_updated', 0))/1000, unit='s'),
+            'archived': task.get('archived', False),
+            'points': task.get('points', None)
+        }
+        priority = task.get('priority', {})
+        if isinstance(priority, dict):
+            task_info.update({
+                'priority_color': priority.get('color'),
+                'priority_id': priority.get('id'),
+                'priority_orderindex': priority.get('orderindex'),
+                'priority_name': priority.get('priority')
+            })
+        elif isinstance(priority, str):
+            task_info['priority_name'] = priority
+        creator = task.get('creator', {})
+        task_info.update({
+            'creator_id': creator.get('id'),
+            'creator_username': creator.get('username'),
+            'creator_email': creator.get('email'),
+        })
+        custom_fields = {field['name']: field.get('type_config', {}).get('default')
+                         for field in task.get('custom_fields', [])}
+        tshirt_size = None
+        for field in task.get("custom_fields", []):
+            if field.get("name") == "T-shirt Size":
+                options = field.get("type_config", {}).get("options", [])
+                for option in options:
+                    if option.get("orderindex") == field.get("value"):
+                        tshirt_size = option.get("name")
+                        break
+            custom_fields['T-shirt Size'] = tshirt_size
+        task_info.update(custom_fields)
+        tag_names = [tag.get('name', '') for tag in task.get('tags', [])]
+        task_info['item_type'] = next((tag for tag in tag_names if tag in ['story', 'epic', 'task', 'bug', 'improvements']), '')
+        task_info['sprint_name'] = next((tag for tag in tag_names if tag.startswith('sprint ')), '')
+        task_info['tags'] = ', '.join(tag_names)
+        task_info['assignees'] = ', '.join(assignee.get('username', '') for assignee in task.get('assignees', []))
+        task_info.update({
+            'parent_task': task.get('parent'),
+            'top_level_parent': task.get('top_level_parent'),
+            'list_name': task.get('list', {}).get('name'),
+            'project_name': task.get('project', {}).get('name'),
+            'due_date': pd.to_datetime(int(task.get('due_date', 0))/1000, unit='s') if task.get('due_date') else None,
+        })
+        task_data.append(task_info)
+    return pd.DataFrame(task_data)
+
+
+def edge_case_tasks():
+    """Tasks whose key sets differ from the synthetic default."""
+    tasks = make_tasks(6, seed=7)
+    tasks[0]["priority"] = "urgent"
+    tasks[1].pop("priority")
+    tasks[2]["custom_fields"] = []
+    tasks[3]["custom_fields"] = [{"name": "Sprint Goal", "type_config": {"default": "ship"}}]
+    tasks[4]["custom_fields"].append({"name": "T-shirt Size", "value": 9, "type_config": {"options": []}})
+    tasks[5].pop("points")
+    for task in tasks:
+        task["due_date"] = None
+    return tasks
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    args = parser.parse_args()
+
+    from data_fetch import cu2df
+
+    pd.testing.assert_frame_equal(cu2df(edge_case_tasks()), cu2df_rowwise(edge_case_tasks()))
+    print(f"{'tasks':>7} {'rowwise s':>10} {'columnar s':>11} {'speedup':>8}")
+    for n in args.sizes:
+        tasks = make_tasks(n)
+        start = time.perf_counter()
+        expected = cu2df_rowwise(tasks)
+        rowwise = time.perf_counter() - start
+        start = time.perf_counter()
+        actual = cu2df(tasks)
+        columnar = time.perf_counter() - start
+        pd.testing.assert_frame_equal(actual, expected)
+        print(f"{n:>7} {rowwise:>10.3f} {columnar:>11.3f} {rowwise / columnar:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Benchmark sequential vs concurrent paginated task fetching against a local mock.
+
+    python benchmarks/bench_fetch.py --sizes 1000 10000 --latency 0.05
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from mock_clickup import MockClickUp  # noqa: E402
+from synthetic import make_tasks  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per mock request")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    tasks_by_list = {}
+    for n in args.sizes:
+        tasks = make_tasks(n)
+        tasks_by_list[f"list{n}"] = tasks
+        half = n // 2
+        tasks_by_list[f"list{n}a"], tasks_by_list[f"list{n}b"] = tasks[:half], tasks[half:]
+    server = MockClickUp({"lists": tasks_by_list}, latency=args.latency).start()
+    os.environ["CLICKUP_API_URL"] = server.url
+    os.environ["CLICKUP_FETCH_CONCURRENCY"] = str(args.workers)
+    os.environ["CLICKUP_RATE_LIMIT"] = "100000"
+
+    import data_fetch
+
+    print(f"{'tasks':>7} {'mode':<24} {'seconds':>8} {'fetched':>8}")
+    for n in args.sizes:
+        runs = [
+            ("sequential pages", lambda: data_fetch.fetch_clickup_tasks(f"list{n}", max_workers=1)),
+            (f"concurrent x{args.workers}", lambda: data_fetch.fetch_clickup_tasks(f"list{n}", max_workers=args.workers)),
+            ("two lists concurrent", lambda: data_fetch.fetch_clickup_tasks_many([f"list{n}a", f"list{n}b"], max_workers=args.workers)),
+        ]
+        for label, run in runs:
+            start = time.perf_counter()
+            fetched = run()
+            elapsed = time.perf_counter() - start
+            print(f"{n:>7} {label:<24} {elapsed:>8.3f} {len(fetched):>8}")
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""End-to-end run of the full agent graph with the scripted LLM and the mock ClickUp API.
+
+Every model call is answered instantly by llm_backend.ScriptedChatModel and
+ClickUp by benchmarks/mock_clickup.py, so the times below are the app's own
+overhead: graph hops, prompt assembly, tool and DataFrame work, streaming
+render. "model ms" is time spent inside the fake model; for streamed calls it
+also covers the node's own rendering between chunks, so streaming nodes'
+overhead is a lower bound.
+
+    python benchmarks/bench_graph.py --runs 5 --tasks 500
+    python benchmarks/bench_graph.py --tokens-per-second 60 --model-latency 0.4   # model-like pacing
+    python benchmarks/bench_graph.py --trace   # also record each turn with tracing.py, as app.py does
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from uuid import UUID
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from mock_clickup import MockClickUp, synthetic_fixtures  # noqa: E402
+
+from langchain_core.callbacks import BaseCallbackHandler  # noqa: E402
+
+QUESTIONS = [
+    "Summarise the progress of the team",
+    "List blockers that have been long overdue",
+    "What's the team velocity in this sprint?",
+    "Summarise progress and chart the burndown",
+    "Get the Retrospective Report",
+]
+
+
+class NodeTimer(BaseCallbackHandler):
+    """Wall time per graph node and model time inside each node, from LangChain callbacks."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._starts = {}
+        self._node_of_run = {}
+        self.node_ms = defaultdict(list)
+        self.model_ms = defaultdict(float)
+
+    def on_chain_start(self, serialized, inputs, *, run_id: UUID, parent_run_id=None, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node")
+        with self._lock:
+            if parent_run_id in self._node_of_run:
+                self._node_of_run[run_id] = self._node_of_run[parent_run_id]
+            elif node and kwargs.get("name") == node:
+                self._node_of_run[run_id] = node
+                self._starts[run_id] = time.perf_counter()
+
+    def on_chain_end(self, outputs, *, run_id: UUID, **kwargs):
+        self._finish_node(run_id)
+
+    def on_chain_error(self, error, *, run_id: UUID, **kwargs):
+        self._finish_node(run_id)
+
+    def _finish_node(self, run_id):
+        with self._lock:
+            start = self._starts.pop(run_id, None)
+            if start is not None:
+                self.node_ms[self._node_of_run[run_id]].append((time.perf_counter() - start) * 1000)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, parent_run_id=None, **kwargs):
+        with self._lock:
+            self._node_of_run[run_id] = self._node_of_run.get(parent_run_id, "(outside graph)")
+            self._starts[("model", run_id)] = time.perf_counter()
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs):
+        with self._lock:
+            start = self._starts.pop(("model", run_id), None)
+            if start is not None:
+                self.model_ms[self._node_of_run.get(run_id, "(outside graph)")] += (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3, help="passes over the question set")
+    parser.add_argument("--tasks", type=int, default=300)
+    parser.add_argument("--clickup-latency", type=float, default=0.0)
+    parser.add_argument("--model-latency", type=float, default=0.0)
+    parser.add_argument("--tokens-per-second", type=float, default=0.0)
+    parser.add_argument("--response-chars", type=int, default=1500)
+    parser.add_argument("--trace", action="store_true", help="wrap each turn in a tracing.trace, as the app does")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    mock = MockClickUp(synthetic_fixtures(args.tasks), latency=args.clickup_latency).start()
+    workdir = tempfile.mkdtemp(prefix="vantage-bench-")
+    os.environ.update({
+        "CLICKUP_API_URL": mock.url,
+        "CLICKUP_RATE_LIMIT": "100000",
+        "LLM_BACKEND": "fake",
+        "LLM_CACHE_PATH": "",
+        "TASK_STORE_PATH": os.path.join(workdir, "tasks.db"),
+        "FAKE_LLM_LATENCY": str(args.model_latency),
+        "FAKE_LLM_TOKENS_PER_SECOND": str(args.tokens_per_second),
+        "FAKE_LLM_RESPONSE_CHARS": str(args.response_chars),
+        "TRACING": "true" if args.trace else "false",
+        "TRACE_PATH": os.path.join(workdir, "traces.jsonl"),
+    })
+
+    import agent
+    import tracing
+    from llm_backend import create_llm
+    from trace_callbacks import TRACE_CALLBACK
+
+    # Bypass the response cache so every run pays for its model calls.
+    agent.LLM, _ = create_llm("fake")
+    agent.get_scrum_master_agent.cache_clear()
+    graph = agent.create_workflow()
+
+    timer = NodeTimer()
+    turn_ms = defaultdict(list)
+    for _ in range(args.runs):
+        for question in QUESTIONS:
+            start = time.perf_counter()
+            with tracing.trace("query", question=question):
+                for _chunk in graph.stream({"messages": [{"role": "user", "content": question}]},
+                                           config={"callbacks": [timer, TRACE_CALLBACK]}):
+                    pass
+            turn_ms[question].append((time.perf_counter() - start) * 1000)
+
+    print(f"{'node':<14} {'calls':>6} {'mean ms':>9} {'total ms':>10} {'model ms':>9} {'overhead ms':>12}")
+    for node, times in sorted(timer.node_ms.items(), key=lambda item: -sum(item[1])):
+        total = sum(times)
+        model = timer.model_ms.get(node, 0.0)
+        print(f"{node:<14} {len(times):>6} {total / len(times):>9.2f} {total:>10.1f} {model:>9.1f} {total - model:>12.1f}")
+    print()
+    print(f"{'question':<45} {'mean turn ms':>12}")
+    for question, times in turn_ms.items():
+        print(f"{question:<45} {sum(times) / len(times):>12.1f}")
+    print(f"\nClickUp requests: {mock.stats()['requests']}")
+    if args.trace:
+        print(f"Spans written to {os.environ['TRACE_PATH']}")
+    mock.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Import-time check of the app's startup path, from `python -X importtime`.
+
+Each run imports the target module in a fresh interpreter and reports the
+cumulative import time, the slowest modules and whether any of the heavy
+modules that should only load on the first question were imported, or the
+task store was opened.
+
+    python benchmarks/bench_import.py --runs 5
+    python benchmarks/bench_import.py --module agent --top 25
+    python benchmarks/bench_import.py --max-ms 900    # exit 1 when startup regresses past the budget
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Loaded by the first question (agent, model client), never by the first page.
+DEFERRED = ["agent", "langgraph", "langchain_openai", "openai", "langchain_core", "llm_backend", "tools"]
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def import_times(module, env):
+    """One fresh-interpreter import; returns {module: (self_us, cumulative_us, depth)}."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise SystemExit(f"importing {module} failed:\n{result.stderr[-2000:]}")
+    times = {}
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            times[name] = (int(self_us), int(cumulative_us), len(indent) // 2)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="app")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to list")
+    parser.add_argument("--max-ms", type=float, default=None, help="fail when the median import exceeds this")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="vantage-import-")
+    task_store_path = os.path.join(workdir, "tasks.db")
+    # Keep module-level stores off the repo; nothing here talks to ClickUp or a model.
+    env = dict(os.environ, LLM_CACHE_PATH="", TASK_STORE_PATH=task_store_path,
+               PYTHONDONTWRITEBYTECODE="1", PYTHONWARNINGS="ignore")
+    import_times(args.module, env)  # warm the OS file cache and __pycache__
+
+    runs = [import_times(args.module, env) for _ in range(args.runs)]
+    totals = [run[args.module][1] / 1000 for run in runs]
+    median = statistics.median(totals)
+
+    last = runs[-1]
+    print(f"{'module':<50} {'self ms':>9} {'cumulative ms':>14}")
+    for name, (self_us, cumulative_us, depth) in sorted(last.items(), key=lambda item: -item[1][1])[:args.top]:
+        print(f"{'  ' * min(depth, 6) + name:<50} {self_us / 1000:>9.1f} {cumulative_us / 1000:>14.1f}")
+
+    print(f"\nimport {args.module}: median {median:.0f} ms over {args.runs} runs "
+          f"(min {min(totals):.0f}, max {max(totals):.0f})")
+    loaded = [name for name in DEFERRED if name in last]
+    if args.module == "app":
+        print(f"deferred modules loaded at startup: {', '.join(loaded) if loaded else 'none'}")
+        print(f"task store opened at startup: {'yes' if os.path.exists(task_store_path) else 'no'}")
+    if args.max_ms is not None and median > args.max_ms:
+        print(f"FAIL: {median:.0f} ms is over the {args.max_ms:.0f} ms budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
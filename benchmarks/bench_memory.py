@@ -0,0 +1,61 @@
+"""History tokens sent per question: the whole chat log vs ConversationMemory.
+
+Simulates a long session with answers of realistic size (some carrying
+chart code) and counts the history tokens each approach sends with the
+next question. The summary is written by the scripted fake model.
+
+    python benchmarks/bench_memory.py --turns 40 --answer-chars 2500
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llm_backend import CHART_HTML, FILLER, ScriptedChatModel  # noqa: E402
+from memory import ConversationMemory, history_tokens  # noqa: E402
+
+QUESTIONS = [
+    "Summarise the progress of the team",
+    "List blockers that have been long overdue",
+    "Chart the burndown for this sprint",
+    "Who is overloaded right now?",
+    "Are we on track for the sprint?",
+]
+
+
+def answer(turn, chars):
+    text = (FILLER * (chars // len(FILLER) + 1))[:chars]
+    return text + "\n\n" + CHART_HTML if turn % len(QUESTIONS) == 2 else text
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=40)
+    parser.add_argument("--answer-chars", type=int, default=2500)
+    parser.add_argument("--every", type=int, default=5, help="print every n-th turn")
+    args = parser.parse_args()
+
+    memory = ConversationMemory(ScriptedChatModel(response_chars=1200))
+    log = []
+    refresh_ms = 0.0
+    print(f"{'turn':>5} {'full log tokens':>16} {'memory tokens':>14}")
+    for turn in range(args.turns):
+        question = QUESTIONS[turn % len(QUESTIONS)]
+        full = log + [{"role": "user", "content": question}]
+        bounded = memory.messages(question)
+        if turn % args.every == 0 or turn == args.turns - 1:
+            print(f"{turn + 1:>5} {history_tokens(full):>16} {history_tokens(bounded):>14}")
+        reply = answer(turn, args.answer_chars)
+        log += [{"role": "user", "content": question}, {"role": "assistant", "content": reply}]
+        start = time.perf_counter()
+        memory.add_turn(question, reply)
+        memory.wait()
+        refresh_ms += (time.perf_counter() - start) * 1000
+    print(f"\nbudget {memory.token_budget} tokens; {memory.stats()}; "
+          f"mean add_turn + summary refresh {refresh_ms / args.turns:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Compare prompt token counts of the task-frame encodings.
+
+Counts with tiktoken's o200k_base (the gpt-4o tokenizer) when its data is
+available locally, otherwise with a rough word/punctuation approximation.
+
+    python benchmarks/bench_prompt_tokens.py --sizes 25 100 500
+"""
+import argparse
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from synthetic import make_tasks  # noqa: E402
+
+
+def token_counter():
+    try:
+        import tiktoken
+        encoding = tiktoken.get_encoding("o200k_base")
+        return "o200k_base", lambda text: len(encoding.encode(text))
+    except Exception:
+        pattern = re.compile(r"\w+|[^\w\s]")
+        return "approx", lambda text: len(pattern.findall(text))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[25, 100, 500])
+    args = parser.parse_args()
+
+    from data_fetch import cu2df, preprocess
+    from prompt_encoding import ENCODERS
+
+    tokenizer, count = token_counter()
+    names = list(ENCODERS)
+    print(f"tokenizer: {tokenizer}")
+    print(f"{'tasks':>6} " + " ".join(f"{name:>10}" for name in names) + f" {'saving':>8}")
+    for n in args.sizes:
+        df = preprocess(cu2df(make_tasks(n)))
+        tokens = {name: count(encoder(df)) for name, encoder in ENCODERS.items()}
+        saving = 1 - tokens["compact"] / tokens["json"]
+        print(f"{n:>6} " + " ".join(f"{tokens[name]:>10}" for name in names) + f" {saving:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
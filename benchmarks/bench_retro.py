@@ -0,0 +1,87 @@
+"""Retrospective context size and lookup time as the history grows.
+
+Builds a store of synthetic retrospectives (recurring themes reworded from
+sprint to sprint, plus one-off notes and standup updates) and compares the
+tokens of pasting every note into the prompt, as the writer used to, with
+retro_store.retro_context.
+
+    python benchmarks/bench_retro.py --sprints 2 12 48
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from memory import count_tokens  # noqa: E402
+from retro_store import Entry, RetroStore, retro_context  # noqa: E402
+
+THEMES = [
+    ["Communication about blockers happened too late in the standups",
+     "Blockers were still raised too late to resolve them in time",
+     "Late communication about blockers and dependencies again delayed stories"],
+    ["Documentation of completed components was inconsistent",
+     "Documentation is still missing or inconsistent across components",
+     "Component documentation lagged behind the code"],
+    ["Acceptance criteria were vague for several stories",
+     "Stories entered the sprint with unclear acceptance criteria",
+     "Vague acceptance criteria caused rework on stories"],
+    ["Knowledge silos around the MLOps infrastructure slowed reviews",
+     "MLOps infrastructure knowledge is still held by one person",
+     "Knowledge silos persist around deployment and MLOps"],
+]
+ONE_OFF = ["The {} migration took longer than estimated", "Test data for the {} service was missing",
+           "The {} demo went smoothly", "Pairing on the {} work helped the new joiners"]
+AREAS = ["billing", "search", "auth", "reporting", "forecasting", "ingestion", "dashboard", "export"]
+ACTIONS = ["Add a blocker check to every standup", "Create documentation templates for components",
+           "Review acceptance criteria in refinement", "Rotate MLOps on-call to spread knowledge"]
+MEMBERS = ["ankan", "riya", "kabir", "arushi"]
+
+
+def make_history(sprints, seed=0):
+    rng = random.Random(seed)
+    entries = []
+    for n in range(1, sprints + 1):
+        sprint = f"Sprint {n}"
+        for template in ONE_OFF:
+            entries.append(Entry(sprint, "went_well" if "smoothly" in template or "helped" in template else "improve",
+                                 template.format(rng.choice(AREAS))))
+        for theme in rng.sample(THEMES, 2):
+            entries.append(Entry(sprint, "improve", rng.choice(theme)))
+        for action in rng.sample(ACTIONS, 2):
+            entries.append(Entry(sprint, "action_item", f"{action} ({sprint})"))
+        for member in MEMBERS:
+            entries.append(Entry(sprint, "update", f"Worked on the {rng.choice(AREAS)} stories", member=member,
+                                 source="standup"))
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sprints", type=int, nargs="+", default=[2, 12, 48])
+    parser.add_argument("--question", default="Get the Retrospective Report")
+    args = parser.parse_args()
+
+    print(f"{'sprints':>8} {'notes':>6} {'all notes tokens':>17} {'context tokens':>15} {'context ms':>11} "
+          f"{'search ms':>10} {'themes':>7}")
+    for sprints in args.sprints:
+        store = RetroStore(":memory:", seed_path=None)
+        entries = make_history(sprints)
+        store.add_many(entries)
+        everything = "\n".join(f"{e.sprint} {e.category}: {e.text}" for e in entries)
+
+        start = time.perf_counter()
+        context = retro_context(args.question, store)
+        context_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        store.search("blockers raised too late")
+        search_ms = (time.perf_counter() - start) * 1000
+        print(f"{sprints:>8} {len(entries):>6} {count_tokens(everything):>17} "
+              f"{count_tokens(json.dumps(context)):>15} {context_ms:>11.1f} {search_ms:>10.2f} "
+              f"{len(context['recurring_issues']):>7}")
+
+
+if __name__ == "__main__":
+    main()
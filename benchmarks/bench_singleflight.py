@@ -0,0 +1,84 @@
+"""Standup burst: many sessions asking the same quick question at the same moment.
+
+Each simulated session does what a first question does on a cold process:
+load the task snapshot, the list members and the comments of the open
+tasks, then stream the model's answer to an identical prompt. All sessions
+start together against benchmarks/mock_clickup.py and the scripted model,
+and the singleflight counters show how many upstream calls were shared
+instead of repeated.
+
+    python benchmarks/bench_singleflight.py --sessions 8 --clickup-latency 0.05 --model-latency 0.5
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from mock_clickup import MockClickUp, synthetic_fixtures  # noqa: E402
+
+QUESTION = "Summarise the progress of the team"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--tasks", type=int, default=300)
+    parser.add_argument("--comments", type=int, default=20, help="open tasks whose comments each session reads")
+    parser.add_argument("--clickup-latency", type=float, default=0.05)
+    parser.add_argument("--model-latency", type=float, default=0.5)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    mock = MockClickUp(synthetic_fixtures(args.tasks), latency=args.clickup_latency).start()
+    workdir = tempfile.mkdtemp(prefix="vantage-bench-")
+    os.environ.update({
+        "CLICKUP_API_URL": mock.url,
+        "CLICKUP_RATE_LIMIT": "100000",
+        "LLM_BACKEND": "fake",
+        "LLM_CACHE_PATH": "",
+        "TASK_STORE_PATH": os.path.join(workdir, "tasks.db"),
+        "FAKE_LLM_LATENCY": str(args.model_latency),
+        "TRACING": "false",
+    })
+
+    import singleflight
+    from comments import COMMENT_CACHE, task_versions
+    from data_fetch import LLM, get_snapshot
+    from members import MEMBER_DIRECTORY
+
+    LLM.get()
+    barrier = threading.Barrier(args.sessions)
+    timings = []
+
+    def session():
+        barrier.wait()
+        start = time.perf_counter()
+        snapshot = get_snapshot()
+        MEMBER_DIRECTORY.members(snapshot)
+        open_tasks = snapshot.df[snapshot.df["status"].str.lower() != "completed"].head(args.comments)
+        COMMENT_CACHE.get_many(open_tasks["id"], task_versions(open_tasks))
+        answer = "".join(chunk.content for chunk in LLM.stream([{"role": "user", "content": QUESTION}]))
+        assert answer
+        timings.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=session) for _ in range(args.sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    mock.stop()
+
+    print(f"{args.sessions} sessions, slowest {max(timings):.2f}s, mean {sum(timings) / len(timings):.2f}s\n")
+    print(f"{'group':<18} {'calls':>7} {'executed':>9} {'shared':>7}")
+    for name, counters in sorted(singleflight.stats().items()):
+        print(f"{name:<18} {counters['calls']:>7} {counters['executed']:>9} {counters['shared']:>7}")
+    print(f"\nClickUp requests: {mock.stats()['requests']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Time-to-complete for streamed output: redraw per token vs StreamRenderer batching.
+
+Renders into a real `st.empty()` placeholder (bare mode, no browser), so the
+timings include Streamlit's per-redraw message building; "chars sent" is the
+text volume the browser would have to re-render.
+
+    python benchmarks/bench_streaming.py --chars 5000 20000 80000
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import streamlit as st  # noqa: E402
+
+from streaming import StreamRenderer  # noqa: E402
+
+WORDS = "the sprint velocity dropped because two blocked stories carried over from the previous sprint".split()
+
+
+def make_chunks(total_chars):
+    chunks, size, i = [], 0, 0
+    while size < total_chars:
+        chunk = WORDS[i % len(WORDS)] + (" " if i % 12 else "\n\n")
+        chunks.append(chunk)
+        size += len(chunk)
+        i += 1
+    return chunks
+
+
+class CountingPlaceholder:
+    def __init__(self):
+        self.placeholder = st.empty()
+        self.redraws = 0
+        self.chars = 0
+
+    def markdown(self, text):
+        self.redraws += 1
+        self.chars += len(text)
+        self.placeholder.markdown(text)
+
+
+def per_token(chunks, placeholder):
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        placeholder.markdown(buffer)
+    return buffer
+
+
+def batched(chunks, placeholder, flush_ms, flush_chars):
+    with StreamRenderer(placeholder.markdown, flush_ms=flush_ms, flush_chars=flush_chars) as renderer:
+        for chunk in chunks:
+            renderer.write(chunk)
+    return renderer.text
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chars", type=int, nargs="+", default=[5000, 20000, 80000])
+    parser.add_argument("--flush-ms", type=float, default=100)
+    parser.add_argument("--flush-chars", type=int, default=400)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    print(f"{'chars':>7} {'mode':<9} {'seconds':>9} {'redraws':>8} {'chars sent':>12}")
+    for total in args.chars:
+        chunks = make_chunks(total)
+        results = {}
+        for mode in ("per-token", "batched"):
+            placeholder = CountingPlaceholder()
+            start = time.perf_counter()
+            if mode == "per-token":
+                text = per_token(chunks, placeholder)
+            else:
+                text = batched(chunks, placeholder, args.flush_ms, args.flush_chars)
+            elapsed = time.perf_counter() - start
+            results[mode] = text
+            print(f"{total:>7} {mode:<9} {elapsed:>9.3f} {placeholder.redraws:>8} {placeholder.chars:>12,}")
+        assert results["per-token"] == results["batched"]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""Local stand-in for the ClickUp API v2, for offline end-to-end runs and benchmarks.
+
+Serves the endpoints the app uses from synthetic or recorded fixtures, with
+configurable latency and a per-window rate limit that sends ClickUp's
+X-RateLimit-* headers and 429s:
+
+    GET  /list/{id}/task      paged by 100, date_updated_gt/lt filters
+    GET  /list/{id}/member
+    GET  /task/{id}
+    PUT  /task/{id}           {"status": ...}
+    GET  /task/{id}/comment
+    POST /task/{id}/comment   {"comment_text": ...}
+
+Point the app at it with CLICKUP_API_URL:
+
+    python benchmarks/mock_clickup.py --tasks 500 --latency 0.05 --rate-limit 100 --port 8765
+    CLICKUP_API_URL=http://127.0.0.1:8765 streamlit run app.py
+
+Record fixtures from the live API (needs CLICKUP_API_KEY) and serve them later:
+
+    python benchmarks/mock_clickup.py --record 901607242495 --out fixtures.json
+    python benchmarks/mock_clickup.py --fixtures fixtures.json
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from synthetic import USERS, make_comments, make_tasks  # noqa: E402
+
+BOARD_LIST_ID = "901607242495"  # data_fetch.DEFAULT_LIST_ID
+MEMBERS_LIST_ID = "901607182023"  # members.MEMBERS_LIST_ID
+PAGE_SIZE = 100
+
+ROUTES = [
+    ("GET", re.compile(r"^/list/([^/]+)/task$"), "list_tasks"),
+    ("GET", re.compile(r"^/list/([^/]+)/member$"), "list_members"),
+    ("GET", re.compile(r"^/task/([^/]+)$"), "get_task"),
+    ("PUT", re.compile(r"^/task/([^/]+)$"), "update_task"),
+    ("GET", re.compile(r"^/task/([^/]+)/comment$"), "get_comments"),
+    ("POST", re.compile(r"^/task/([^/]+)/comment$"), "add_comment"),
+]
+
+
+def synthetic_fixtures(n_tasks=300, seed=0, list_id=BOARD_LIST_ID, members_list_id=MEMBERS_LIST_ID):
+    tasks = make_tasks(n_tasks, seed)
+    return {
+        "lists": {list_id: tasks},
+        "comments": make_comments(tasks, seed),
+        "members": {members_list_id: [dict(user) for user in USERS]},
+    }
+
+
+def load_fixtures(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def record_fixtures(list_ids, path, members_list_id=MEMBERS_LIST_ID):
+    """Download lists, their comments and the members from the live API into a fixture file."""
+    from clickup_client import get_client
+    from data_fetch import fetch_clickup_tasks
+
+    client = get_client()
+    lists = {list_id: fetch_clickup_tasks(list_id) for list_id in list_ids}
+    comments = {task["id"]: client.get(f"task/{task['id']}/comment").json().get("comments", [])
+                for tasks in lists.values() for task in tasks}
+    members = {members_list_id: client.get(f"list/{members_list_id}/member").json()["members"]}
+    with open(path, "w") as f:
+        json.dump({"lists": lists, "comments": comments, "members": members}, f)
+
+
+class MockClickUp:
+    """Threaded mock server over a fixture dict; writes change the in-memory fixtures.
+
+    Args:
+        fixtures: {"lists": {list_id: [task]}, "comments": {task_id: [comment]}, "members": {list_id: [member]}}
+        latency: Seconds added to every response
+        jitter: Extra random seconds, uniform in [0, jitter]
+        rate_limit: Requests allowed per `period` before answering 429; None for no limit
+        period: Rate limit window in seconds
+    """
+
+    def __init__(self, fixtures, latency=0.0, jitter=0.0, rate_limit=None, period=60.0,
+                 host="127.0.0.1", port=0):
+        self.lists = fixtures.get("lists", {})
+        self.comments = fixtures.get("comments", {})
+        self.members = fixtures.get("members", {})
+        self.tasks = {task["id"]: task for tasks in self.lists.values() for task in tasks}
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.period = period
+        self.requests = {}
+        self.throttled = 0
+        self._window_start = time.time()
+        self._window_count = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def stats(self):
+        with self._lock:
+            return {"requests": dict(self.requests), "throttled": self.throttled}
+
+    def _take_slot(self):
+        """Count a request against the window; returns (allowed, remaining, reset_epoch)."""
+        with self._lock:
+            now = time.time()
+            if now - self._window_start >= self.period:
+                self._window_start, self._window_count = now, 0
+            reset = int(self._window_start + self.period)
+            if self.rate_limit is None:
+                return True, None, reset
+            if self._window_count >= self.rate_limit:
+                self.throttled += 1
+                return False, 0, reset
+            self._window_count += 1
+            return True, self.rate_limit - self._window_count, reset
+
+    # Endpoint handlers return (status, body).
+
+    def list_tasks(self, list_id, query, body):
+        if list_id not in self.lists:
+            return 404, {"err": "List not found", "ECODE": "ITEM_015"}
+        tasks = self.lists[list_id]
+        if "date_updated_gt" in query:
+            tasks = [t for t in tasks if int(t["date_updated"]) > int(query["date_updated_gt"])]
+        if "date_updated_lt" in query:
+            tasks = [t for t in tasks if int(t["date_updated"]) < int(query["date_updated_lt"])]
+        page = int(query.get("page", 0))
+        chunk = tasks[page * PAGE_SIZE:(page + 1) * PAGE_SIZE]
+        return 200, {"tasks": chunk, "last_page": (page + 1) * PAGE_SIZE >= len(tasks)}
+
+    def list_members(self, list_id, query, body):
+        if list_id not in self.members:
+            return 404, {"err": "List not found", "ECODE": "ITEM_015"}
+        return 200, {"members": self.members[list_id]}
+
+    def get_task(self, task_id, query, body):
+        task = self.tasks.get(task_id)
+        return (200, task) if task else (404, {"err": "Task not found", "ECODE": "ITEM_013"})
+
+    def update_task(self, task_id, query, body):
+        task = self.tasks.get(task_id)
+        if task is None:
+            return 404, {"err": "Task not found", "ECODE": "ITEM_013"}
+        if "status" in body:
+            task["status"] = dict(task["status"], status=str(body["status"]).lower())
+        task["date_updated"] = str(int(time.time() * 1000))
+        return 200, task
+
+    def get_comments(self, task_id, query, body):
+        if task_id not in self.tasks:
+            return 404, {"err": "Task not found", "ECODE": "ITEM_013"}
+        return 200, {"comments": self.comments.get(task_id, [])}
+
+    def add_comment(self, task_id, query, body):
+        task = self.tasks.get(task_id)
+        if task is None:
+            return 404, {"err": "Task not found", "ECODE": "ITEM_013"}
+        now = str(int(time.time() * 1000))
+        comment = {"id": f"{task_id}-c{len(self.comments.get(task_id, []))}",
+                   "comment_text": body.get("comment_text", ""), "user": dict(USERS[0]), "date": now}
+        self.comments.setdefault(task_id, []).insert(0, comment)
+        task["date_updated"] = now
+        return 200, {"id": comment["id"], "hist_id": comment["id"], "date": int(now)}
+
+    def _dispatch(self, method, path, query, body):
+        path = path[len("/api/v2"):] if path.startswith("/api/v2/") else path
+        for route_method, pattern, name in ROUTES:
+            match = pattern.match(path)
+            if match and route_method == method:
+                with self._lock:
+                    self.requests[name] = self.requests.get(name, 0) + 1
+                    # Writes mutate shared fixtures; serialise them with the reads.
+                    return getattr(self, name)(match.group(1), query, body)
+        return 404, {"err": "Route not found", "ECODE": "APP_001"}
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self):
+                url = urlparse(self.path)
+                query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+                if mock.latency or mock.jitter:
+                    time.sleep(mock.latency + random.uniform(0, mock.jitter))
+                allowed, remaining, reset = mock._take_slot()
+                if allowed:
+                    status, payload = mock._dispatch(self.command, url.path, query, body)
+                else:
+                    status, payload = 429, {"err": "Rate limit reached", "ECODE": "APP_002"}
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                if mock.rate_limit is not None:
+                    self.send_header("X-RateLimit-Limit", str(mock.rate_limit))
+                    self.send_header("X-RateLimit-Remaining", str(remaining))
+                    self.send_header("X-RateLimit-Reset", str(reset))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_PUT = do_POST = _respond
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a mock ClickUp API")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--tasks", type=int, default=300, help="synthetic tasks when no fixture file is given")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fixtures", help="JSON fixture file to serve")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=None, help="requests per window before 429")
+    parser.add_argument("--period", type=float, default=60.0)
+    parser.add_argument("--record", nargs="+", metavar="LIST_ID", help="record fixtures from the live API")
+    parser.add_argument("--out", default="fixtures.json")
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixtures(args.record, args.out)
+        print(f"recorded {', '.join(args.record)} to {args.out}")
+        return
+
+    fixtures = load_fixtures(args.fixtures) if args.fixtures else synthetic_fixtures(args.tasks, args.seed)
+    mock = MockClickUp(fixtures, latency=args.latency, jitter=args.jitter, rate_limit=args.rate_limit,
+                       period=args.period, port=args.port).start()
+    print(f"mock ClickUp API on {mock.url}  (CLICKUP_API_URL={mock.url})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        mock.stop()
+
+
+if __name__ == "__main__":
+    main()
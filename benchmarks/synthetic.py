@@ -0,0 +1,82 @@
+"""Synthetic ClickUp task payloads shaped like the ones `cu2df` consumes."""
+import random
+
+STATUSES = [("open", "#d3d3d3"), ("in progress", "#4194f6"), ("blocked", "#e50000"),
+            ("pending", "#ff7800"), ("completed", "#6bc950")]
+PRIORITIES = [("1", "urgent", "#f50000"), ("2", "high", "#ffcc00"),
+              ("3", "normal", "#6fddff"), ("4", "low", "#d8d8d8")]
+ITEM_TYPES = ["story", "epic", "task", "bug", "improvements"]
+USERS = [{"id": 100 + i, "username": name, "email": f"{name.split()[0].lower()}@example.com"}
+         for i, name in enumerate(["Ankan Bera", "Anand Vishnu", "Arushi Gupta", "Amey Patil",
+                                   "Riya Sen", "Kabir Das"])]
+TSHIRT_OPTIONS = [{"id": f"opt-{i}", "name": size, "orderindex": i}
+                  for i, size in enumerate(["XS", "S", "M", "L", "XL"])]
+BASE_MS = 1735689600000  # 2025-01-01
+
+
+def make_task(i, rng):
+    status, color = rng.choice(STATUSES)
+    created = BASE_MS + rng.randint(0, 90) * 86400000 + rng.randint(0, 86399999)
+    task = {
+        "id": f"86c{i:06d}",
+        "custom_id": None,
+        "custom_item_id": rng.choice([0, 1001, None]),
+        "name": f"Task {i}: " + rng.choice(["Build", "Fix", "Design", "Refactor", "Document"])
+                + " " + rng.choice(["API layer", "data pipeline", "UI", "forecast model", "MLOps"]),
+        "description": " ".join(rng.choice(["the", "model", "should", "handle", "edge", "cases",
+                                            "pipeline", "deploy", "review", "tests"])
+                                for _ in range(rng.randint(5, 60))),
+        "status": {"status": status, "color": color, "type": "custom"},
+        "date_created": str(created),
+        "date_updated": str(created + rng.randint(0, 30) * 86400000 + rng.randint(0, 999)),
+        "archived": False,
+        "creator": dict(rng.choice(USERS)),
+        "assignees": [dict(u) for u in rng.sample(USERS, rng.choice([0, 1, 1, 1, 2]))],
+        "tags": [{"name": rng.choice(ITEM_TYPES)}, {"name": f"sprint {rng.randint(1, 4)}"}],
+        "parent": None if i < 10 or rng.random() < 0.7 else f"86c{rng.randint(0, i - 1):06d}",
+        "top_level_parent": None,
+        "list": {"id": "901607242495", "name": "Sprint Board"},
+        "project": {"id": "90160", "name": "Vantage"},
+        "custom_fields": [
+            {"id": "cf-1", "name": "T-shirt Size", "type": "drop_down",
+             "type_config": {"default": 0, "options": TSHIRT_OPTIONS},
+             **({"value": rng.randint(0, 4)} if rng.random() < 0.8 else {})},
+            {"id": "cf-2", "name": "Team", "type": "short_text", "type_config": {}},
+        ],
+    }
+    if rng.random() < 0.85:
+        orderindex, name, pcolor = rng.choice(PRIORITIES)
+        task["priority"] = {"id": orderindex, "priority": name, "color": pcolor, "orderindex": orderindex}
+    else:
+        task["priority"] = None
+    if rng.random() < 0.7:
+        task["points"] = rng.choice([1, 2, 3, 5, 8, 13])
+    if rng.random() < 0.5:
+        task["due_date"] = str(created + rng.randint(3, 20) * 86400000)
+    else:
+        task["due_date"] = None
+    return task
+
+
+def make_tasks(n, seed=0):
+    rng = random.Random(seed)
+    return [make_task(i, rng) for i in range(n)]
+
+
+COMMENT_TEXTS = ["Waiting on the API contract", "PR is up for review", "Blocked by the data pipeline migration",
+                 "Moved to next sprint", "Pairing on this tomorrow", "Needs clarification from the PO"]
+
+
+def make_comments(tasks, seed=0):
+    """Comments keyed by task id; open and blocked tasks get a few, completed ones rarely any."""
+    rng = random.Random(seed)
+    comments = {}
+    for task in tasks:
+        busy = task["status"]["status"] in ("in progress", "blocked", "pending")
+        count = rng.randint(1, 3) if busy else rng.choice([0, 0, 0, 1])
+        comments[task["id"]] = [
+            {"id": f"{task['id']}-c{j}", "comment_text": rng.choice(COMMENT_TEXTS),
+             "user": dict(rng.choice(USERS)), "date": str(int(task["date_updated"]) - j * 3600000)}
+            for j in range(count)
+        ]
+    return comments
@@ -0,0 +1,117 @@
+import re
+from typing import Iterable, List, Optional
+
+import pandas as pd
+
+# Columns of the preprocessed task frame, as described to the agent.
+TASK_SCHEMA = {
+    'id': "ClickUp task id",
+    'name': "task title",
+    'description': "task description (long; request only when needed)",
+    'status': "workflow status, e.g. open / in progress / blocked / pending / completed",
+    'assignees': "comma separated usernames",
+    'item_type': "story / epic / task / bug / improvements",
+    'sprint_name': "sprint tag, e.g. 'sprint 2'",
+    'date_created': "creation time (UTC)",
+    'date_updated': "last update time (UTC)",
+    'creator_id': "creator's user id",
+    'creator_username': "creator's username",
+    'creator_email': "creator's email",
+    'parent_task': "name of the parent task, if any",
+    'priority_orderindex': "priority rank, 1 is most urgent",
+    'points': "story points",
+    'priority_name': "urgent / high / normal / low",
+}
+DEFAULT_COLUMNS = ['id', 'name', 'status', 'assignees', 'item_type', 'sprint_name',
+                   'date_updated', 'points', 'priority_name', 'parent_task']
+MAX_LIMIT = 200
+
+
+def _as_list(values) -> List[str]:
+    if values is None:
+        return []
+    if isinstance(values, str):
+        values = [values]
+    return [str(v).strip().lower() for v in values if str(v).strip()]
+
+
+def _match_any(series: pd.Series, values: Iterable[str]) -> pd.Series:
+    return series.fillna('').astype(str).str.lower().isin(list(values))
+
+
+def filter_tasks(df: pd.DataFrame, status=None, sprint_name=None, assignee=None, item_type=None,
+                 priority=None, date_field: str = 'date_updated', date_from: Optional[str] = None,
+                 date_to: Optional[str] = None) -> pd.DataFrame:
+    """Filter the task frame; every filter is optional and case-insensitive.
+
+    Args:
+        df: Preprocessed task DataFrame
+        status, sprint_name, item_type, priority: Value or list of values to keep
+        assignee: Username(s) or part of one; matches tasks assigned to any of them
+        date_field: 'date_updated' or 'date_created', used by date_from/date_to
+        date_from, date_to: Inclusive ISO dates bounding `date_field`
+
+    Returns:
+        The matching rows, most recently updated first
+    """
+    mask = pd.Series(True, index=df.index)
+    for column, values in (('status', status), ('sprint_name', sprint_name),
+                           ('item_type', item_type), ('priority_name', priority)):
+        values = _as_list(values)
+        if values:
+            mask &= _match_any(df[column], values)
+
+    assignees = _as_list(assignee)
+    if assignees:
+        # Substring match so "ankan" finds "Ankan Bera".
+        pattern = '|'.join(re.escape(a) for a in assignees)
+        mask &= df['assignees'].fillna('').str.lower().str.contains(pattern, regex=True)
+
+    if date_field not in ('date_updated', 'date_created'):
+        raise ValueError(f"date_field must be 'date_updated' or 'date_created', got {date_field!r}")
+    if date_from:
+        mask &= df[date_field] >= pd.Timestamp(date_from)
+    if date_to:
+        # Inclusive of the whole end day.
+        mask &= df[date_field] < pd.Timestamp(date_to) + pd.Timedelta(days=1)
+
+    return df.loc[mask].sort_values('date_updated', ascending=False)
+
+
+def select_tasks(df: pd.DataFrame, columns: Optional[List[str]] = None, limit: int = 50) -> pd.DataFrame:
+    """Keep the requested columns (unknown names are ignored) and at most `limit` rows."""
+    columns = [c for c in (columns or DEFAULT_COLUMNS) if c in df.columns] or DEFAULT_COLUMNS
+    return df[columns].head(max(1, min(int(limit), MAX_LIMIT)))
+
+
+def board_summary(df: pd.DataFrame) -> str:
+    """A few lines of aggregate facts about the board for the system prompt."""
+    if df.empty:
+        return "The board has no tasks."
+
+    def counts(column):
+        values = df[column].fillna('').replace('', '(none)').value_counts()
+        return ', '.join(f"{name}: {count}" for name, count in values.items())
+
+    points = pd.to_numeric(df['points'], errors='coerce')
+    by_sprint = (df.assign(points=points)
+                 .groupby(df['sprint_name'].replace('', '(none)'))
+                 .agg(tasks=('id', 'size'), points=('points', 'sum')))
+    sprint_lines = ', '.join(f"{row.Index}: {row.tasks} tasks / {row.points:g} pts"
+                             for row in by_sprint.itertuples())
+    assignees = df['assignees'].fillna('').str.split(', ').explode()
+    assignees = assignees[assignees != '']
+
+    return "\n".join([
+        f"Total tasks: {len(df)} (updated {df['date_updated'].min():%Y-%m-%d} to {df['date_updated'].max():%Y-%m-%d})",
+        f"By status: {counts('status')}",
+        f"By sprint: {sprint_lines}",
+        f"By item type: {counts('item_type')}",
+        f"Assignees: {', '.join(sorted(assignees.unique()))}",
+    ])
+
+
+def board_context(df: pd.DataFrame) -> str:
+    """Compact schema plus board summary that replaces the full data dump in prompts."""
+    schema = "\n".join(f"- {column}: {meaning}" for column, meaning in TASK_SCHEMA.items())
+    return f"TASK COLUMNS:\n{schema}\n\nBOARD SUMMARY:\n{board_summary(df)}"
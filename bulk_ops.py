@@ -0,0 +1,162 @@
+import hashlib
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import tracing
+from clickup_client import get_client
+
+WRITE_CONCURRENCY = int(os.getenv("CLICKUP_WRITE_CONCURRENCY", 4))
+IDEMPOTENCY_TTL = float(os.getenv("CLICKUP_IDEMPOTENCY_TTL", 24 * 3600))
+MAX_OPERATIONS = 50
+
+
+def idempotency_key(task_id: str, text: str) -> str:
+    """Same task and same comment text (ignoring case and whitespace) give the same key."""
+    normalised = " ".join(text.split()).lower()
+    return hashlib.sha1(f"{task_id}\0{normalised}".encode()).hexdigest()
+
+
+class IdempotencyRegistry:
+    """Remembers which keyed writes succeeded recently, so retries do not repeat them.
+
+    Keys live in this process's memory only: they are lost on restart and
+    not shared with other processes.
+
+    Args:
+        ttl: Seconds a completed key blocks the same write
+    """
+
+    def __init__(self, ttl: float = IDEMPOTENCY_TTL):
+        self.ttl = ttl
+        self._done: Dict[str, float] = {}
+        self._in_flight = set()
+        self._lock = threading.Lock()
+
+    def claim(self, key: str) -> bool:
+        """True if the caller should perform the write; False if it is done or in flight."""
+        now = time.time()
+        with self._lock:
+            finished = self._done.get(key)
+            if finished is not None and now - finished <= self.ttl:
+                return False
+            if key in self._in_flight:
+                return False
+            self._in_flight.add(key)
+            return True
+
+    def complete(self, key: str, ok: bool) -> None:
+        """Record the outcome of a claimed write; failed writes can be retried."""
+        with self._lock:
+            self._in_flight.discard(key)
+            if ok:
+                self._done[key] = time.time()
+
+    def record(self, key: str) -> None:
+        """Record a write made without claiming it first."""
+        with self._lock:
+            self._done[key] = time.time()
+
+
+COMMENT_KEYS = IdempotencyRegistry()
+
+
+def _json(response) -> dict:
+    try:
+        return response.json()
+    except ValueError:
+        return {}
+
+
+def _error_detail(response) -> str:
+    return _json(response).get("err") or f"HTTP {response.status_code}"
+
+
+def set_status(task_id: str, new_status: str) -> dict:
+    try:
+        response = get_client().put(f"task/{task_id}", json={"status": new_status})
+    except Exception as e:
+        return {"task_id": task_id, "result": "error", "detail": str(e)}
+    if not response.ok:
+        return {"task_id": task_id, "result": "error", "detail": _error_detail(response)}
+    return {"task_id": task_id, "result": "updated", "status": new_status}
+
+
+def post_comment(task_id: str, text: str, registry: IdempotencyRegistry = COMMENT_KEYS) -> dict:
+    """Post a comment unless this process posted the identical one to the task within the TTL.
+
+    Returns:
+        Per-item result; "response" holds ClickUp's reply when the comment was posted
+    """
+    key = idempotency_key(task_id, text)
+    if not registry.claim(key):
+        return {"task_id": task_id, "result": "duplicate", "detail": "identical comment already posted"}
+    ok = False
+    try:
+        response = get_client().post(f"task/{task_id}/comment", params={"custom_task_ids": "false"},
+                                     json={"notify_all": False, "comment_text": text})
+        ok = response.ok
+    except Exception as e:
+        return {"task_id": task_id, "result": "error", "detail": str(e)}
+    finally:
+        registry.complete(key, ok)
+    if not ok:
+        return {"task_id": task_id, "result": "error", "detail": _error_detail(response)}
+    return {"task_id": task_id, "result": "posted", "response": _json(response)}
+
+
+def _run(calls: List[Tuple], max_workers: int) -> List[dict]:
+    if not calls:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(calls))) as pool:
+        return list(pool.map(tracing.propagate(lambda call: call[0](*call[1:])), calls))
+
+
+def update_statuses(changes: Iterable[Tuple[str, str]], current: Optional[Dict[str, str]] = None,
+                    max_workers: int = WRITE_CONCURRENCY) -> List[dict]:
+    """Apply status changes concurrently, skipping tasks already in the requested status.
+
+    Args:
+        changes: (task_id, new_status) pairs; for a task listed twice the last one wins
+        current: Known status per task id, e.g. from the task snapshot
+        max_workers: Concurrent requests (the client's rate limiter still applies)
+
+    Returns:
+        One result per input pair, in input order
+    """
+    current = current or {}
+    changes = [(str(task_id), status) for task_id, status in changes]
+    last = {task_id: i for i, (task_id, _) in enumerate(changes)}
+    results: List[Optional[dict]] = [None] * len(changes)
+    calls, slots = [], []
+    for i, (task_id, status) in enumerate(changes):
+        if last[task_id] != i:
+            results[i] = {"task_id": task_id, "result": "skipped", "detail": "superseded by a later change"}
+        elif str(current.get(task_id, "")).strip().lower() == status.strip().lower():
+            results[i] = {"task_id": task_id, "result": "skipped", "detail": f"already {status}"}
+        else:
+            calls.append((set_status, task_id, status))
+            slots.append(i)
+    for i, result in zip(slots, _run(calls, max_workers)):
+        results[i] = result
+    return results
+
+
+def post_comments(comments: Iterable[Tuple[str, str]], registry: IdempotencyRegistry = COMMENT_KEYS,
+                  max_workers: int = WRITE_CONCURRENCY) -> List[dict]:
+    """Post comments concurrently; repeats of a comment this process already posted on a task are skipped.
+
+    Returns:
+        One result per input pair, in input order
+    """
+    calls = [(post_comment, str(task_id), text, registry) for task_id, text in comments]
+    return _run(calls, max_workers)
+
+
+def summarise(results: List[dict]) -> dict:
+    counts = Counter(result["result"] for result in results)
+    return {"summary": dict(counts), "results": [{k: v for k, v in result.items() if k != "response"}
+                                                 for result in results]}
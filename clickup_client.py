@@ -0,0 +1,182 @@
+import os
+import threading
+import time
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+import tracing
+load_dotenv()
+
+CLICKUP_API_URL = os.getenv("CLICKUP_API_URL", "https://api.clickup.com/api/v2").rstrip("/")
+# Requests per minute for the token's plan; refined from response headers at runtime.
+CLICKUP_RATE_LIMIT = int(os.getenv("CLICKUP_RATE_LIMIT", 100))
+DEFAULT_TIMEOUT = (5, 30)  # (connect, read) seconds
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Only 429 means the server rejected the request outright; 5xx on a write may
+# already have been applied, so non-idempotent methods are retried on 429 only.
+IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "DELETE", "OPTIONS"}
+
+
+class RateLimiter:
+    """Token bucket that follows ClickUp's `X-RateLimit-*` response headers.
+
+    Starts from the configured per-token limit (requests per `period`) and
+    re-syncs its capacity, remaining tokens and reset time from every response.
+    """
+
+    def __init__(self, limit: int = 100, period: float = 60):
+        self.capacity = float(limit)
+        self.tokens = float(limit)
+        self.period = period
+        self.reset_at: Optional[float] = None
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        if self.reset_at is not None and time.time() >= self.reset_at:
+            self.tokens = self.capacity
+            self.reset_at = None
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.capacity / self.period)
+        self._updated = now
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                if self.reset_at is not None:
+                    wait = max(self.reset_at - time.time(), 0.05)
+                else:
+                    wait = (1 - self.tokens) * self.period / self.capacity
+            time.sleep(min(wait, self.period))
+
+    def update(self, headers) -> None:
+        """Re-sync the bucket from a response's rate-limit headers."""
+        try:
+            limit = headers.get("X-RateLimit-Limit")
+            remaining = headers.get("X-RateLimit-Remaining")
+            reset = headers.get("X-RateLimit-Reset")
+            with self._lock:
+                if limit is not None:
+                    self.capacity = max(float(limit), 1.0)
+                if remaining is not None:
+                    self.tokens = min(self.tokens, float(remaining))
+                if reset is not None:
+                    self.reset_at = float(reset)
+        except ValueError:
+            pass
+
+
+class ClickUpClient:
+    """Shared ClickUp HTTP client.
+
+    Keeps one keep-alive connection pool per process, applies default
+    timeouts, waits on the rate limiter before each request and retries
+    429/5xx responses with exponential backoff.
+
+    Args:
+        base_url: ClickUp API root, e.g. "https://api.clickup.com/api/v2"
+        token: ClickUp API key (defaults to CLICKUP_API_KEY)
+        timeout: Default (connect, read) timeout in seconds
+        max_retries: Retries after the first attempt
+        backoff: Base delay in seconds, doubled on every retry
+        pool_size: Connections kept alive per host
+        rate_limit: Requests per minute allowed before the first response arrives
+    """
+
+    def __init__(self, base_url: str = CLICKUP_API_URL, token: Optional[str] = None,
+                 timeout=DEFAULT_TIMEOUT, max_retries: int = 4, backoff: float = 0.5,
+                 pool_size: int = 16, rate_limit: int = CLICKUP_RATE_LIMIT):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.limiter = RateLimiter(rate_limit)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "accept": "application/json",
+            "Authorization": token or os.getenv("CLICKUP_API_KEY") or "",
+        })
+
+    def _retry_delay(self, response: Optional[requests.Response], attempt: int) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return float(retry_after)
+                except ValueError:
+                    pass
+            reset = response.headers.get("X-RateLimit-Reset")
+            if response.status_code == 429 and reset:
+                try:
+                    return max(float(reset) - time.time(), 0.0) + 0.1
+                except ValueError:
+                    pass
+        return self.backoff * (2 ** attempt)
+
+    def request(self, method: str, path: str, **kwargs) -> requests.Response:
+        """Send a request to `path` (relative to `base_url`) and return the final response."""
+        method = method.upper()
+        url = path if path.startswith("http") else f"{self.base_url}/{path.lstrip('/')}"
+        kwargs.setdefault("timeout", self.timeout)
+        retryable = RETRY_STATUSES if method in IDEMPOTENT_METHODS else {429}
+
+        with tracing.span(tracing.CLICKUP, f"{method} {tracing.endpoint(path)}") as attrs:
+            response = self._send(method, url, retryable, kwargs)
+            attrs["status"] = response.status_code
+            attrs["bytes"] = len(response.content) + len(response.request.body or b"")
+            return response
+
+    def _send(self, method: str, url: str, retryable: set, kwargs: dict) -> requests.Response:
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries or method not in IDEMPOTENT_METHODS:
+                    raise
+                time.sleep(self._retry_delay(None, attempt))
+                attempt += 1
+                tracing.incr("clickup_retries")
+                continue
+
+            self.limiter.update(response.headers)
+            if response.status_code not in retryable or attempt >= self.max_retries:
+                return response
+            time.sleep(self._retry_delay(response, attempt))
+            attempt += 1
+            tracing.incr("clickup_retries")
+
+    def get(self, path: str, **kwargs) -> requests.Response:
+        return self.request("GET", path, **kwargs)
+
+    def put(self, path: str, **kwargs) -> requests.Response:
+        return self.request("PUT", path, **kwargs)
+
+    def post(self, path: str, **kwargs) -> requests.Response:
+        return self.request("POST", path, **kwargs)
+
+
+_client: Optional[ClickUpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> ClickUpClient:
+    """Return the process-wide ClickUp client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = ClickUpClient(base_url=os.getenv("CLICKUP_API_URL", CLICKUP_API_URL))
+    return _client
@@ -0,0 +1,141 @@
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+import tracing
+from singleflight import SingleFlight
+from clickup_client import get_client
+from resources import Lazy
+from metrics import BLOCKED_STATUSES, IN_PROGRESS_STATUSES
+
+COMMENTS_CONCURRENCY = int(os.getenv("CLICKUP_COMMENTS_CONCURRENCY", 4))
+PREFETCH_COMMENTS = os.getenv("CLICKUP_PREFETCH_COMMENTS", "false").lower() in ("1", "true", "yes")
+PREFETCH_STATUSES = BLOCKED_STATUSES | IN_PROGRESS_STATUSES
+MAX_BATCH = 50
+
+
+def fetch_task_comments(task_id: str) -> list:
+    """Comments of one task as [{"comment_text", "username"}], straight from ClickUp."""
+    response = get_client().get(f"task/{task_id}/comment")
+    if not response.ok:
+        # An error body has no comments; raise so it is reported and never cached as [].
+        raise RuntimeError(f"ClickUp returned HTTP {response.status_code} for the comments of task {task_id}")
+    comments = response.json().get('comments', [])
+    return [{"comment_text": comment["comment_text"], "username": comment["user"]["username"]}
+            for comment in comments]
+
+
+def task_versions(df: pd.DataFrame) -> Dict[str, pd.Timestamp]:
+    """Map of task id to its date_updated, the version comment entries are checked against."""
+    return dict(zip(df["id"], df["date_updated"]))
+
+
+class CommentCache:
+    """Per-task comment cache with a bounded fetch pool.
+
+    Each entry remembers the task's date_updated when it was fetched and is
+    refetched once the snapshot shows a different one; a task without a
+    known date_updated is always refetched. `invalidate` drops
+    entries after a write such as a new comment, and a fetch still running
+    at that moment is not cached. Concurrent misses for the
+    same task (two sessions, or a prefetch and a tool call) share one fetch.
+
+    Args:
+        fetch: Fetches one task's comments
+        max_workers: Concurrent comment requests shared by every caller
+    """
+
+    def __init__(self, fetch: Callable[[str], list] = fetch_task_comments, max_workers: int = COMMENTS_CONCURRENCY):
+        self.fetch = fetch
+        self._entries: Dict[str, tuple] = {}
+        # Bumped by invalidate(); a fetch is only cached if no invalidate happened while it ran.
+        self._epoch = 0
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="comments")
+        self._flight = SingleFlight("comment_fetches")
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, task_id: str, version=None) -> list:
+        with self._lock:
+            entry = self._entries.get(task_id)
+            # With no version there is nothing to check an entry against.
+            if entry is not None and version is not None and entry[0] == version:
+                self.hits += 1
+                tracing.incr("comment_cache_hits")
+                return entry[1]
+            self.misses += 1
+        tracing.incr("comment_cache_misses")
+        return self._flight.do(task_id, self._fetch, task_id, version)
+
+    def _generation(self, task_id: str) -> tuple:
+        return self._epoch, self._generations.get(task_id, 0)
+
+    def _fetch(self, task_id: str, version) -> list:
+        with self._lock:
+            generation = self._generation(task_id)
+        comments = self.fetch(task_id)
+        with self._lock:
+            # Invalidated while fetching: the comments may predate the write, so they are
+            # returned to this fetch's callers but not cached.
+            if self._generation(task_id) == generation:
+                self._entries[task_id] = (version, comments)
+        return comments
+
+    def _get_or_error(self, task_id: str, version=None):
+        try:
+            return self.get(task_id, version)
+        except Exception as e:
+            return {"error": str(e)}
+
+    def get_many(self, task_ids: Iterable[str], versions: Optional[Dict[str, object]] = None) -> Dict[str, object]:
+        """Comments for several tasks, fetching the uncached ones concurrently.
+
+        Returns:
+            Dictionary of task id to its comments, or to {"error": ...} if that fetch failed
+        """
+        versions = versions or {}
+        ids = list(dict.fromkeys(str(task_id) for task_id in task_ids))
+        results = self._pool.map(tracing.propagate(lambda task_id: self._get_or_error(task_id, versions.get(task_id))), ids)
+        return dict(zip(ids, results))
+
+    def prefetch(self, task_ids: Iterable[str], versions: Optional[Dict[str, object]] = None) -> List[Future]:
+        """Warm the cache in the background; returns the pending futures."""
+        versions = versions or {}
+        get = tracing.propagate(self._get_or_error)
+        return [self._pool.submit(get, task_id, versions.get(task_id)) for task_id in task_ids]
+
+    def prefetch_open(self, df: pd.DataFrame) -> List[Future]:
+        """Prefetch comments of the blocked and in-progress tasks in a snapshot."""
+        if df.empty:
+            return []
+        open_tasks = df[df["status"].fillna("").str.lower().isin(PREFETCH_STATUSES)]
+        return self.prefetch(open_tasks["id"], task_versions(open_tasks))
+
+    def invalidate(self, task_id: Optional[str] = None) -> None:
+        with self._lock:
+            if task_id is None:
+                self._epoch += 1
+                self._entries.clear()
+            else:
+                task_id = str(task_id)
+                self._generations[task_id] = self._generations.get(task_id, 0) + 1
+                self._entries.pop(task_id, None)
+        # A fetch started before the write may miss it; later readers must not join it.
+        if task_id is None:
+            self._flight.forget_all()
+        else:
+            self._flight.forget(task_id)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+        return {**stats, "shared_fetches": self._flight.shared}
+
+
+# Built on first use, so importing the app starts no fetch pool.
+COMMENT_CACHE = Lazy(CommentCache, "COMMENT_CACHE")
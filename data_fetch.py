@@ -1,129 +1,231 @@
-from datetime import datetime
-import pandas as pd
-from langchain_core.messages import AIMessage
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.tools import tool
-from openai import OpenAI
-import requests, os
 import pandas as pd
+import os, threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 from typing import List, Dict, Any
 from dotenv import load_dotenv
+import tracing
+from snapshot import SnapshotCache
+from task_store import TaskStore
+from clickup_client import get_client
+from resources import Lazy
+from comments import COMMENT_CACHE, PREFETCH_COMMENTS
 load_dotenv()
 
-def fetch_clickup_tasks(list_id):
-    url = f"https://api.clickup.com/api/v2/list/{list_id}/task?subtasks=true&include_closed=true"
-    headers = {
-        "accept": "application/json",
-        "Authorization": os.getenv("CLICKUP_API_KEY")
-    }
-    response = requests.get(url, headers=headers)
-    tasks = response.json()['tasks']
+DEFAULT_LIST_ID = '901607242495'
+SNAPSHOT_TTL = float(os.getenv("CLICKUP_SNAPSHOT_TTL", 120))
+
+FETCH_CONCURRENCY = int(os.getenv("CLICKUP_FETCH_CONCURRENCY", 4))
+PAGE_SIZE = 100  # ClickUp's fixed page size for /list/{id}/task
+
+# Caps in-flight page requests across every list and caller in the process.
+_fetch_slots = threading.BoundedSemaphore(FETCH_CONCURRENCY)
+
+def fetch_task_page(list_id, page, **filters):
+    """Fetch one page of a list's tasks.
+
+    Extra keyword arguments are passed through as ClickUp query filters,
+    e.g. `date_updated_gt`.
+
+    Returns:
+        Tuple of (tasks, last_page)
+    """
+    params = {"subtasks": "true", "include_closed": "true", "page": page, **filters}
+    with _fetch_slots:
+        response = get_client().get(f"list/{list_id}/task", params=params)
+    if not response.ok:
+        # An error body has no tasks; raise rather than read it as an empty last page.
+        raise RuntimeError(f"ClickUp returned HTTP {response.status_code} for page {page} of list {list_id}")
+    body = response.json()
+    tasks = body.get('tasks', [])
+    last_page = body.get('last_page', len(tasks) < PAGE_SIZE)
+    return tasks, bool(last_page) or not tasks
+
+def fetch_clickup_tasks(list_id, max_workers=FETCH_CONCURRENCY, **filters):
+    """Fetch every task of a list, walking `page=` until ClickUp reports `last_page`.
+
+    The first page is fetched alone; if more exist, the following pages are
+    requested `max_workers` at a time and stitched back together in page order.
+    """
+    tasks, last_page = fetch_task_page(list_id, 0, **filters)
+    if last_page:
+        return tasks
+
+    next_page = 1
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while not last_page:
+            pages = range(next_page, next_page + max_workers)
+            results = list(pool.map(tracing.propagate(lambda page: fetch_task_page(list_id, page, **filters)), pages))
+            for page_tasks, page_is_last in results:
+                tasks.extend(page_tasks)
+                if page_is_last:
+                    last_page = True
+                    break
+            next_page += max_workers
     return tasks
 
+def fetch_clickup_tasks_many(list_ids, max_workers=FETCH_CONCURRENCY):
+    """Fetch several lists concurrently and merge them into one task list.
+
+    Tasks that live in more than one list are kept once, in first-seen order.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        per_list = list(pool.map(tracing.propagate(fetch_clickup_tasks), list_ids))
+
+    seen = set()
+    merged = []
+    for tasks in per_list:
+        for task in tasks:
+            if task.get('id') not in seen:
+                seen.add(task.get('id'))
+                merged.append(task)
+    return merged
+
+ITEM_TYPE_TAGS = ['story', 'epic', 'task', 'bug', 'improvements']
+_PRIORITY_KEYS = ['priority_color', 'priority_id', 'priority_orderindex', 'priority_name']
+_MISSING = np.nan  # what pd.DataFrame(list_of_dicts) puts in cells a row never set
+
+def _ms_to_datetime(values):
+    """Batch version of `pd.to_datetime(int(ms)/1000, unit='s')`.
+
+    Keeps the float-seconds conversion the per-row code used so the
+    resulting timestamps are bit-for-bit identical.
+    """
+    return pd.to_datetime(np.asarray(values, dtype='int64') / 1000, unit='s')
+
+def _custom_field_columns(fields):
+    """Return the custom-field columns a task contributes, in insertion order."""
+    custom_fields = {field['name']: field.get('type_config', {}).get('default') for field in fields}
+    if fields:
+        tshirt_size = None
+        for field in fields:
+            if field.get("name") == "T-shirt Size":
+                value = field.get("value")
+                tshirt_size = next((option.get("name") for option in field.get("type_config", {}).get("options", [])
+                                    if option.get("orderindex") == value), tshirt_size)
+        custom_fields['T-shirt Size'] = tshirt_size
+    return custom_fields
+
 def cu2df(tasks: List[Dict[str, Any]]) -> pd.DataFrame:
     """
     Convert a list of ClickUp task JSON objects to a pandas DataFrame.
-    
+
+    Fields are extracted column by column into plain lists and timestamps are
+    converted in one batch call per column. Column order, dtypes and values
+    match building the frame from one dict per task.
+
     Parameters:
     -----------
     tasks : List[Dict[str, Any]]
         A list of ClickUp task dictionaries
-    
+
     Returns:
     --------
     pd.DataFrame
         A DataFrame with extracted task information
     """
-    # Extract relevant information from tasks
-    task_data = []
-    
-    for task in tasks:
-        # Extract basic task information
-        task_info = {
-            'id': task.get('id'),
-            'custom_id': task.get('custom_id'),
-            'custom_item_id' : task.get('custom_item_id'),
-            'name': task.get('name'),
-            'description': task.get('description'),
-            'status': task.get('status', {}).get('status'),
-            'status_color': task.get('status', {}).get('color'),
-            'date_created': pd.to_datetime(int(task.get('date_created', 0))/1000, unit='s'),
-            'date_updated': pd.to_datetime(int(task.get('date_updated', 0))/1000, unit='s'),
-            'archived': task.get('archived', False),
-            'points' : task.get('points', None )
-        }
-        
-        # Handle priority JSON
-        priority = task.get('priority', {})
+    n = len(tasks)
+    if n == 0:
+        return pd.DataFrame()
+
+    columns = {}
+
+    def column(name):
+        # Cells a task never sets stay NaN, exactly like the dict-per-row frame.
+        if name not in columns:
+            columns[name] = [_MISSING] * n
+        elif not isinstance(columns[name], list):
+            columns[name] = list(columns[name])
+        return columns[name]
+
+    # Column order is the first-seen order of each row's keys, and a row's keys
+    # only vary in the priority and custom-field segments, so track those per row.
+    statuses = [task.get('status', {}) for task in tasks]
+    creators = [task.get('creator', {}) for task in tasks]
+    priorities = [task.get('priority', {}) for task in tasks]
+    custom_fields = [_custom_field_columns(task.get('custom_fields', [])) for task in tasks]
+    tag_names = [[tag.get('name', '') for tag in task.get('tags', [])] for task in tasks]
+
+    base = {
+        'id': [task.get('id') for task in tasks],
+        'custom_id': [task.get('custom_id') for task in tasks],
+        'custom_item_id': [task.get('custom_item_id') for task in tasks],
+        'name': [task.get('name') for task in tasks],
+        'description': [task.get('description') for task in tasks],
+        'status': [status.get('status') for status in statuses],
+        'status_color': [status.get('color') for status in statuses],
+        'date_created': _ms_to_datetime([int(task.get('date_created', 0)) for task in tasks]),
+        'date_updated': _ms_to_datetime([int(task.get('date_updated', 0)) for task in tasks]),
+        'archived': [task.get('archived', False) for task in tasks],
+        'points': [task.get('points', None) for task in tasks],
+    }
+    creator = {
+        'creator_id': [c.get('id') for c in creators],
+        'creator_username': [c.get('username') for c in creators],
+        'creator_email': [c.get('email') for c in creators],
+    }
+
+    due_raw = [task.get('due_date') for task in tasks]
+    due_rows = [i for i, due in enumerate(due_raw) if due]
+    due_dates = [None] * n
+    for i, ts in zip(due_rows, _ms_to_datetime([int(due_raw[i]) for i in due_rows])):
+        due_dates[i] = ts
+    tail = {
+        'item_type': [next((tag for tag in names if tag in ITEM_TYPE_TAGS), '') for names in tag_names],
+        'sprint_name': [next((tag for tag in names if tag.startswith('sprint ')), '') for names in tag_names],
+        'tags': [', '.join(names) for names in tag_names],
+        'assignees': [', '.join(a.get('username', '') for a in task.get('assignees', [])) for task in tasks],
+        'parent_task': [task.get('parent') for task in tasks],
+        'top_level_parent': [task.get('top_level_parent') for task in tasks],
+        'list_name': [task.get('list', {}).get('name') for task in tasks],
+        'project_name': [task.get('project', {}).get('name') for task in tasks],
+        'due_date': due_dates,
+    }
+
+    columns.update(base)
+
+    # Priority is a dict (four columns), a bare string (name only) or absent.
+    for i, priority in enumerate(priorities):
         if isinstance(priority, dict):
-            task_info.update({
-                'priority_color': priority.get('color'),
-                'priority_id': priority.get('id'),
-                'priority_orderindex': priority.get('orderindex'),
-                'priority_name': priority.get('priority')
-            })
+            column('priority_color')[i] = priority.get('color')
+            column('priority_id')[i] = priority.get('id')
+            column('priority_orderindex')[i] = priority.get('orderindex')
+            column('priority_name')[i] = priority.get('priority')
         elif isinstance(priority, str):
-            # If priority is a simple string
-            task_info['priority_name'] = priority
-        
-        # Extract creator information
-        creator = task.get('creator', {})
-        task_info.update({
-            'creator_id': creator.get('id'),
-            'creator_username': creator.get('username'),
-            'creator_email': creator.get('email'),
-        })
-        
-        # Extract custom fields
-        custom_fields = {field['name']: field.get('type_config', {}).get('default') 
-                         for field in task.get('custom_fields', [])}
-        
-        tshirt_size = None
-        for field in task.get("custom_fields", []):
-            if field.get("name") == "T-shirt Size":
-                
-                options = field.get("type_config", {}).get("options", [])
-                for option in options:
-                    
-                    if option.get("orderindex") == field.get("value"):
-                        tshirt_size = option.get("name")
-
-                        break
-            custom_fields['T-shirt Size'] = tshirt_size
-
-
-        
-        task_info.update(custom_fields)
-        
-        # Extract and categorize tags
-        tags = task.get('tags', [])
-        tag_names = [tag.get('name', '') for tag in tags]
-        
-        # Separate item type and sprint tags
-        task_info['item_type'] = next((tag for tag in tag_names if tag in ['story', 'epic', 'task', 'bug', 'improvements']), '')
-        task_info['sprint_name'] = next((tag for tag in tag_names if tag.startswith('sprint ')), '')
-        task_info['tags'] = ', '.join(tag_names)
-        
-        # Extract assignees
-        assignees = task.get('assignees', [])
-        assignee_names = [assignee.get('username', '') for assignee in assignees]
-        task_info['assignees'] = ', '.join(assignee_names)
-        
-        # Extract additional metadata
-        task_info.update({
-            'parent_task': task.get('parent'),
-            'top_level_parent': task.get('top_level_parent'),
-            'list_name': task.get('list', {}).get('name'),
-            'project_name': task.get('project', {}).get('name'),
-            'due_date': pd.to_datetime(int(task.get('due_date', 0))/1000, unit='s') if task.get('due_date') else None,
-        })
-        
-        task_data.append(task_info)
-    
-    # Create DataFrame
-    df = pd.DataFrame(task_data)
-    
-    return df
+            column('priority_name')[i] = priority
+
+    columns.update(creator)
+
+    for i, fields in enumerate(custom_fields):
+        for name, value in fields.items():
+            column(name)[i] = value
+
+    columns.update(tail)
+
+    order = _column_order(priorities, custom_fields, base, creator, tail)
+    return pd.DataFrame({name: columns[name] for name in order}, columns=order)
+
+def _column_order(priorities, custom_fields, base, creator, tail):
+    seen = {}
+    signatures = {}
+    for priority, fields in zip(priorities, custom_fields):
+        if isinstance(priority, dict):
+            kind = 'dict'
+        elif isinstance(priority, str):
+            kind = 'str'
+        else:
+            kind = None
+        signatures.setdefault((kind, tuple(fields)), None)
+    for kind, field_names in signatures:
+        keys = list(base)
+        if kind == 'dict':
+            keys += _PRIORITY_KEYS
+        elif kind == 'str':
+            keys.append('priority_name')
+        keys += list(creator) + list(field_names) + list(tail)
+        for key in keys:
+            seen.setdefault(key, None)
+    return list(seen)
 
 def preprocess(df):
     df = df.merge(df[['id', 'name']], left_on='parent_task', right_on='id', how='left', suffixes=('', '_parent'))
@@ -141,84 +243,72 @@ def preprocess(df):
     return df
 
 
-def run_get_tasks(list_id  = '901607242495'):
-    tasks = fetch_clickup_tasks(list_id)
-    df= cu2df(tasks)
+TASK_STORE_PATH = os.getenv("TASK_STORE_PATH", ".vantage/tasks.db")
+
+def open_task_store():
+    """The local task store, or None when TASK_STORE_PATH is empty."""
+    if not TASK_STORE_PATH:
+        return None
+    return TaskStore(TASK_STORE_PATH, fetch_clickup_tasks,
+                     full_sync_interval=float(os.getenv("TASK_STORE_FULL_SYNC", 24 * 3600)))
+
+# Opened on the first load, not at import: the first page renders before any SQLite file is touched.
+TASK_STORE = Lazy(open_task_store, "TASK_STORE")
+
+# (store revision, frame) per list, so a sync that changed nothing skips the rebuild.
+_store_frames = {}
+
+def load_tasks(list_id):
+    df = _load_frame(list_id)
+    if PREFETCH_COMMENTS:
+        # Warm comments of blocked and in-progress tasks while the board is read.
+        COMMENT_CACHE.prefetch_open(df)
+    return df
+
+def _load_frame(list_id):
+    store = TASK_STORE.get()
+    if store is None:
+        return preprocess(cu2df(fetch_clickup_tasks(list_id)))
+
+    store.sync(list_id)
+    revision = store.revision(list_id)
+    cached = _store_frames.get(list_id)
+    if cached is not None and cached[0] == revision:
+        return cached[1]
+    df = cu2df(store.tasks(list_id))
     df = preprocess(df)
+    _store_frames[list_id] = (revision, df)
     return df
 
-token = os.getenv("GITHUB_TOKEN")
-endpoint = "https://models.github.ai/inference"
-model_name = "openai/gpt-4o"
-
-LLM = OpenAI(
-    base_url=endpoint,
-    api_key=token,
-    temperature=0,
-    model=model_name
-)
-
-RETRO_FEEDBACK = """Sprint 1 Retrospective
-What Went Well
-
-"We successfully established the initial API architecture and implemented the foundational endpoints."
-"The UI design foundations and core components were completed as planned."
-"The experiment tracking setup was implemented without major hurdles."
-"We managed to develop the baseline forecasting model on schedule."
-"The initial MLOps pipeline foundations are in place and working."
-
-What Could Be Improved
-
-"Some team members had multiple critical path tasks assigned simultaneously, creating bottlenecks."
-"The data pipeline setup task became blocked and couldn't be completed this sprint."
-"Dependencies between stories weren't clearly identified during planning, which affected workflow."
-"Communication about blockers wasn't happening early enough in our daily standups."
-"We didn't allocate enough time for knowledge sharing about the MLOps infrastructure."
-"Acceptance criteria for some stories, especially around the API architecture, were somewhat vague."
-"We didn't properly account for the learning curve associated with some of the new technologies."
-"Documentation for completed components was minimal and inconsistent."
-
-Action Items
-
-Improve story breakdown to avoid assigning multiple critical path items to the same person
-Conduct a dependency mapping session before sprint planning
-Implement a "blocker identification" segment in daily standups
-Schedule regular knowledge sharing sessions for complex technical components
-Create templates for component documentation
-Develop clearer acceptance criteria templates
-Reserve buffer time for tasks involving new technologies
-
-Sprint 2 Retrospective
-What Went Well
-
-"The data visualization components were completed successfully and received positive feedback."
-"We implemented model predictions with confidence intervals ahead of schedule."
-"Extending the API layer is progressing well despite its complexity."
-"The experiment tracking capabilities have been expanded effectively."
-"Cross-team collaboration improved, especially between the UI and API developers."
-
-What Could Be Improved
-
-"We still have three blocked stories at the end of this sprint, including two carried over from Sprint 1."
-"The model deployment pipeline is blocked due to infrastructure dependencies."
-"Advanced model development couldn't proceed due to dependencies on the data pipeline."
-"The forecasting parameter customization task took longer than estimated due to unclear requirements."
-"Documentation continues to be inconsistent across components."
-"Communication about dependencies and blockers is still happening too late to resolve effectively."
-"We didn't properly account for the complexity of the model deployment pipeline."
-"Testing frameworks are still pending, which may create quality issues later."
-"Knowledge silos persist, particularly around MLOps infrastructure and advanced modeling techniques."
-
-Action Items
-
-Conduct an urgent unblocking session focused specifically on the data pipeline setup
-Create a visual dependency map for all remaining stories
-Implement a "blocker early warning system" where potential blockers are flagged in advance
-Prioritize the initial testing framework in Sprint 3
-Schedule dedicated documentation days at the end of each week
-Rotate team members across different components to reduce knowledge silos
-Break down complex tasks like model deployment into smaller, more manageable stories
-Implement pair programming for complex tasks to improve knowledge sharing
-
-Above given the retrospective feedback for the previous two sprints. Your task is to create a summary of theffedback for sprint 2 and analyse the feedback of both sprint 1 and 2 to identify the recurring issues in the project and how to rectify the same.
-"""
+SNAPSHOT_CACHE = Lazy(lambda: SnapshotCache(load_tasks, ttl=SNAPSHOT_TTL), "SNAPSHOT_CACHE")
+
+def get_snapshot(list_id=DEFAULT_LIST_ID, force_refresh=False):
+    return SNAPSHOT_CACHE.get().get(list_id, force_refresh=force_refresh)
+
+def run_get_tasks(list_id=DEFAULT_LIST_ID, force_refresh=False):
+    """Return the shared, read-only task DataFrame for `list_id`."""
+    return get_snapshot(list_id, force_refresh).df
+
+def invalidate_tasks(list_id=None):
+    """Drop cached snapshots after a write so the next read refetches."""
+    SNAPSHOT_CACHE.invalidate(list_id)
+
+def data_version(list_id=DEFAULT_LIST_ID):
+    """Content fingerprint of the loaded task snapshot, or None before the first load.
+
+    Only peeks at the cache: a model call must never trigger a ClickUp sync.
+    """
+    if not SNAPSHOT_CACHE.built:
+        return None
+    snapshot = SNAPSHOT_CACHE.peek(list_id)
+    return snapshot.fingerprint if snapshot is not None else None
+
+def build_llm():
+    """Chat model chosen by LLM_BACKEND (see llm_backend.py), behind the response cache."""
+    # Imported here: the model stack (langchain, openai) is only loaded when the first question needs it.
+    from llm_backend import create_llm
+    from llm_cache import CachedLLM, LLMCache
+    model, model_name = create_llm()
+    return CachedLLM(model, LLMCache(), version_fn=data_version, model_id=model_name)
+
+LLM = Lazy(build_llm, "LLM")
@@ -0,0 +1,145 @@
+from typing import List, NamedTuple
+
+TEXT = "text"
+CODE_START = "code_start"
+CODE = "code"
+CODE_END = "code_end"
+
+
+class FenceEvent(NamedTuple):
+    kind: str
+    text: str = ""
+    language: str = ""
+
+
+class FenceParser:
+    """Incremental parser that splits streamed markdown into prose and fenced code blocks.
+
+    `feed` takes chunks exactly as they arrive and returns typed events:
+
+    - ("text", text): prose outside code blocks
+    - ("code_start", "", language): an opening ``` fence, language from its info string
+    - ("code", text, language): code inside the block, fence lines excluded
+    - ("code_end", "", language): the block's closing fence
+
+    Fences follow markdown: a line of at least three backticks indented by
+    at most three spaces, closed by a line of at least as many backticks.
+    Each character is looked at once. Only a possible fence at the start of a
+    line is held back until its line is decided, so fences split across
+    chunks are still found. `close` flushes what is left and ends an
+    unterminated block.
+    """
+
+    def __init__(self):
+        self.in_code = False
+        self.language = ""
+        self._fence_len = 0
+        self._line_start = True
+        # Start of the current line while it may still be a fence.
+        self._held = ""
+        self._phase = "indent"
+        self._ticks = 0
+        self._events: List[FenceEvent] = []
+
+    def feed(self, chunk: str) -> List[FenceEvent]:
+        i, n = 0, len(chunk)
+        while i < n:
+            if self._line_start:
+                self._step(chunk[i])
+                i += 1
+                continue
+            end = chunk.find("\n", i)
+            if end == -1:
+                self._emit(chunk[i:])
+                i = n
+            else:
+                self._emit(chunk[i:end + 1])
+                self._line_start = True
+                i = end + 1
+        return self._drain()
+
+    def close(self) -> List[FenceEvent]:
+        if self._held:
+            if self._phase in ("info", "tail") or (self._phase == "ticks" and self._ticks >= 3):
+                self._finish_fence()
+            else:
+                self._release()
+        if self.in_code:
+            self._events.append(FenceEvent(CODE_END, "", self.language))
+            self.in_code = False
+        return self._drain()
+
+    def _step(self, char: str) -> None:
+        # Decide, one character at a time, whether the current line is a fence.
+        self._held += char
+        if self._phase == "indent":
+            if char == " " and len(self._held) <= 3:
+                return
+            if char == "`":
+                self._phase, self._ticks = "ticks", 1
+                return
+        elif self._phase == "ticks":
+            if char == "`":
+                self._ticks += 1
+                return
+            enough = self._ticks >= (self._fence_len if self.in_code else 3)
+            if enough and char == "\n":
+                self._finish_fence()
+                return
+            if enough and (char == " " or not self.in_code):
+                # Opening fences carry an info string; closing ones only spaces.
+                self._phase = "tail" if self.in_code else "info"
+                return
+        elif self._phase == "info":
+            if char == "\n":
+                self._finish_fence()
+            return
+        elif self._phase == "tail":
+            if char == "\n":
+                self._finish_fence()
+                return
+            if char == " ":
+                return
+        self._release()
+
+    def _finish_fence(self) -> None:
+        if self.in_code:
+            self._events.append(FenceEvent(CODE_END, "", self.language))
+            self.in_code = False
+        else:
+            info = self._held.strip().lstrip("`").split()
+            self.language = info[0].lower() if info else ""
+            self._fence_len = self._ticks
+            self.in_code = True
+            self._events.append(FenceEvent(CODE_START, "", self.language))
+        self._reset_line()
+
+    def _release(self) -> None:
+        # Not a fence after all: the held characters are ordinary content.
+        held = self._held
+        self._reset_line()
+        self._line_start = held.endswith("\n")
+        self._emit(held)
+
+    def _reset_line(self) -> None:
+        self._held, self._phase, self._ticks = "", "indent", 0
+        self._line_start = True
+
+    def _emit(self, text: str) -> None:
+        kind = CODE if self.in_code else TEXT
+        language = self.language if self.in_code else ""
+        if self._events and self._events[-1].kind == kind:
+            last = self._events[-1]
+            self._events[-1] = last._replace(text=last.text + text)
+        else:
+            self._events.append(FenceEvent(kind, text, language))
+
+    def _drain(self) -> List[FenceEvent]:
+        events, self._events = self._events, []
+        return events
+
+
+def parse_fences(text: str) -> List[FenceEvent]:
+    """Parse a complete markdown string in one go."""
+    parser = FenceParser()
+    return parser.feed(text) + parser.close()
@@ -0,0 +1,181 @@
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from dotenv import load_dotenv
+load_dotenv()
+
+LLM_BACKEND = os.getenv("LLM_BACKEND", "github")
+LLM_MODEL = os.getenv("LLM_MODEL", "openai/gpt-4o")
+GITHUB_MODELS_ENDPOINT = "https://models.github.ai/inference"
+
+FAKE_LLM_LATENCY = float(os.getenv("FAKE_LLM_LATENCY", 0))
+FAKE_LLM_TOKENS_PER_SECOND = float(os.getenv("FAKE_LLM_TOKENS_PER_SECOND", 0))
+FAKE_LLM_RESPONSE_CHARS = int(os.getenv("FAKE_LLM_RESPONSE_CHARS", 1500))
+
+# Tool calls the fake makes, in order, when the react agent binds its tools.
+DEFAULT_TOOL_PLAN = [
+    ("query_tasks", {"status": ["blocked", "in progress"], "limit": 20}),
+    ("get_sprint_metrics", {"include_burndown": False}),
+]
+FILLER = ("The sprint is progressing with several stories in flight. Blocked items need owner follow-up, "
+          "and carry-over from the previous sprint is still the main risk to the sprint goal. ")
+CHART_HTML = """```html
+<div class="container"><canvas id="burndown"></canvas></div>
+<script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
+<script>
+new Chart(document.getElementById('burndown'), {type: 'line', data: {labels: ['d1', 'd2', 'd3'],
+  datasets: [{label: 'Remaining points', data: [40, 31, 22]}]}});
+</script>
+```
+"""
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Deterministic stand-in chat model for measuring the app's own overhead.
+
+    - `with_structured_output(Router)` answers with a route picked by the
+      local fast router: the scrum master until an analysis message follows
+      the question, then the writer (or visualizer for chart questions)
+    - with tools bound (the react agent), it calls the tools of `tool_plan`
+      that are available, then answers once their results are in
+    - plain `invoke`/`stream` return `responses` in turn, or a filler answer of
+      `response_chars` characters with a Chart.js block when the prompt asks
+      for visuals
+
+    `latency` delays the first token and `tokens_per_second` paces the
+    stream (about four characters per token); 0 disables either delay.
+    """
+
+    responses: List[str] = []
+    response_chars: int = FAKE_LLM_RESPONSE_CHARS
+    latency: float = FAKE_LLM_LATENCY
+    tokens_per_second: float = FAKE_LLM_TOKENS_PER_SECOND
+    tool_plan: List[Tuple[str, Dict[str, Any]]] = DEFAULT_TOOL_PLAN
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any):
+        return self.bind(tools=[convert_to_openai_tool(t) for t in tools], **kwargs)
+
+    def _reply(self, messages: List[BaseMessage], tools: Optional[list]) -> AIMessage:
+        self.calls += 1
+        tool_names = [t["function"]["name"] for t in tools or []]
+        if "Router" in tool_names:
+            return self._tool_call("Router", {"next": self._route(messages)})
+        if tools:
+            if not isinstance(messages[-1], ToolMessage):
+                planned = [(name, args) for name, args in self.tool_plan if name in tool_names]
+                if planned:
+                    return AIMessage(content="", tool_calls=[
+                        {"name": name, "args": args, "id": f"call_{self.calls}_{i}", "type": "tool_call"}
+                        for i, (name, args) in enumerate(planned)])
+            results = [m for m in messages if isinstance(m, ToolMessage)]
+            return AIMessage(content=f"Scripted analysis of {len(results)} tool results: "
+                                     + " ".join(str(m.content)[:200] for m in results))
+        return AIMessage(content=self._text(messages))
+
+    def _tool_call(self, name: str, args: dict) -> AIMessage:
+        return AIMessage(content="", tool_calls=[
+            {"name": name, "args": args, "id": f"call_{self.calls}", "type": "tool_call"}])
+
+    def _route(self, messages: List[BaseMessage]) -> str:
+        from router import FAST_ROUTER, latest_question
+        question, answered = latest_question(messages)
+        intent = FAST_ROUTER.intent(question or "")
+        if intent is not None and intent.next != "scrum_master":
+            return intent.next
+        return "writer" if answered else "scrum_master"
+
+    def _text(self, messages: List[BaseMessage]) -> str:
+        if self.responses:
+            return self.responses[(self.calls - 1) % len(self.responses)]
+        body = (FILLER * (self.response_chars // len(FILLER) + 1))[:self.response_chars]
+        if any("Chart.js" in str(m.content) for m in messages):
+            body = body[:len(body) // 2] + "\n\n" + CHART_HTML + body[len(body) // 2:]
+        return body
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        if self.latency:
+            time.sleep(self.latency)
+        message = self._reply(messages, kwargs.get("tools"))
+        message.usage_metadata = _usage(messages, message)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        if self.latency:
+            time.sleep(self.latency)
+        message = self._reply(messages, kwargs.get("tools"))
+        usage = _usage(messages, message)
+        if message.tool_calls:
+            yield ChatGenerationChunk(message=AIMessageChunk(content="", usage_metadata=usage, tool_call_chunks=[
+                {"name": c["name"], "args": json.dumps(c["args"]), "id": c["id"], "index": i}
+                for i, c in enumerate(message.tool_calls)]))
+            return
+        delay = 4 / self.tokens_per_second if self.tokens_per_second else 0
+        text = message.content
+        for start in range(0, len(text), 4):
+            if delay:
+                time.sleep(delay)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=text[start:start + 4]))
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+        # Like OpenAI's stream_usage, token counts arrive in a final empty chunk.
+        yield ChatGenerationChunk(message=AIMessageChunk(content="", usage_metadata=usage))
+
+
+def _usage(messages: List[BaseMessage], reply: AIMessage) -> dict:
+    # Rough four-characters-per-token estimate, so traces of fake runs show plausible counts.
+    input_tokens = sum(len(str(m.content)) for m in messages) // 4
+    output_tokens = (len(str(reply.content)) + (len(json.dumps(reply.tool_calls)) if reply.tool_calls else 0)) // 4
+    return {"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens}
+
+
+def _github_models():
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(base_url=os.getenv("LLM_BASE_URL", GITHUB_MODELS_ENDPOINT), api_key=os.getenv("GITHUB_TOKEN"),
+                      model=LLM_MODEL, temperature=0, stream_usage=True)
+
+
+def _openai():
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(model=LLM_MODEL, temperature=0, base_url=os.getenv("LLM_BASE_URL") or None, stream_usage=True)
+
+
+BACKENDS: Dict[str, Callable[[], BaseChatModel]] = {
+    "github": _github_models,
+    "openai": _openai,
+    "fake": ScriptedChatModel,
+}
+
+
+def register_backend(name: str, factory: Callable[[], BaseChatModel]) -> None:
+    BACKENDS[name] = factory
+
+
+def create_llm(backend: Optional[str] = None) -> Tuple[BaseChatModel, str]:
+    """Build the configured chat model.
+
+    Args:
+        backend: Name in BACKENDS (defaults to LLM_BACKEND)
+
+    Returns:
+        Tuple of (model, model id used in LLM cache keys)
+    """
+    backend = backend or LLM_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown LLM backend {backend!r}; choose from {sorted(BACKENDS)}")
+    model_id = "scripted" if backend == "fake" else LLM_MODEL
+    return BACKENDS[backend](), f"{backend}:{model_id}"
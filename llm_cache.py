@@ -0,0 +1,281 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Iterator, Optional
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.messages.utils import convert_to_messages
+
+import tracing
+from singleflight import SingleFlight
+
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".vantage/llm_cache.db")
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", 256))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", 24 * 3600))
+
+
+class LLMCache:
+    """Two-tier response cache: an in-memory LRU in front of a SQLite table.
+
+    Args:
+        path: SQLite file for the disk tier; empty or None keeps it in memory only
+        max_entries: Entries kept in the in-memory LRU
+        max_age: Seconds after which an entry is ignored
+    """
+
+    def __init__(self, path: Optional[str] = LLM_CACHE_PATH, max_entries: int = LLM_CACHE_SIZE,
+                 max_age: float = LLM_CACHE_TTL):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._conn = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, created REAL NOT NULL, value TEXT NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None and self._conn is not None:
+                row = self._conn.execute("SELECT created, value FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    entry = (row[0], json.loads(row[1]))
+                    self._remember(key, entry)
+            if entry is None or now - entry[0] > self.max_age:
+                self.misses += 1
+                return None
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, value: dict) -> None:
+        entry = (time.time(), value)
+        with self._lock:
+            self._remember(key, entry)
+            if self._conn is not None:
+                try:
+                    serialised = json.dumps(value)
+                except TypeError:
+                    return
+                with self._conn:
+                    self._conn.execute("INSERT OR REPLACE INTO responses (key, created, value) VALUES (?, ?, ?)",
+                                       (key, entry[0], serialised))
+
+    def _remember(self, key: str, entry: tuple) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "memory_entries": len(self._memory)}
+
+
+def _normalise(messages) -> list:
+    if isinstance(messages, str):
+        return [{"type": "human", "content": messages}]
+    if hasattr(messages, "to_messages"):
+        messages = messages.to_messages()
+    return [
+        {"type": m.type, "name": m.name, "content": m.content, "tool_calls": getattr(m, "tool_calls", None) or None}
+        for m in convert_to_messages(messages)
+    ]
+
+
+def _replay_chunks(text: str, size: int) -> Iterator[str]:
+    # Re-split cached text on word boundaries into roughly `size`-character chunks.
+    buffer = ""
+    for word in re.findall(r"\s*\S+\s*", text) or [text]:
+        buffer += word
+        if len(buffer) >= size:
+            yield buffer
+            buffer = ""
+    if buffer:
+        yield buffer
+
+
+class CachedLLM:
+    """Drop-in wrapper around a chat model that caches `invoke`, `stream` and
+    `with_structured_output(...).invoke` results.
+
+    Keys hash the model id, the call kind and its options, the normalised
+    messages and the task snapshot fingerprint, so answers are reused only
+    while the board data is unchanged. Cache hits on `stream` are replayed
+    as `AIMessageChunk`s, so callers iterate them exactly like live output.
+    Identical calls made while the first is still running wait for it and
+    share its response instead of calling the model again. While the data
+    version is unknown (no snapshot loaded yet) calls bypass the cache.
+    Anything else (e.g. `bind_tools` for the react agent) goes straight to
+    the wrapped model.
+
+    Args:
+        llm: The chat model to wrap
+        cache: Response cache to use
+        version_fn: Returns the current data version included in every key, or None when unknown
+        model_id: Identifier of the wrapped model included in every key
+        replay_chunk_chars: Approximate size of replayed stream chunks
+    """
+
+    def __init__(self, llm, cache: LLMCache, version_fn: Optional[Callable[[], str]] = None,
+                 model_id: str = "", replay_chunk_chars: int = 24):
+        self.llm = llm
+        self.cache = cache
+        self.version_fn = version_fn
+        self.model_id = model_id
+        self.replay_chunk_chars = replay_chunk_chars
+        self._flight = SingleFlight("llm_calls")
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
+
+    def _version(self) -> Optional[str]:
+        if self.version_fn is None:
+            return ""
+        try:
+            version = self.version_fn()
+        except Exception:
+            return None
+        return None if version is None else str(version)
+
+    def _record_hit(self, kind: str, content, waited_since: Optional[float] = None) -> None:
+        # A call that waited on an identical one in flight is recorded as a hit too, with its wait time.
+        start, duration_ms, shared = time.time(), 0.0, {}
+        if waited_since is not None:
+            start, duration_ms, shared = waited_since, (time.time() - waited_since) * 1000, {"shared": True}
+        tracing.record(tracing.LLM, self.model_id or "cached", start, duration_ms, cache_hit=True, call=kind,
+                       node=tracing.current_node(), output_chars=len(str(content)), **shared)
+
+    def cache_key(self, kind: str, messages, **options) -> Optional[str]:
+        """Key of a call, or None when the data version is unknown and the call must not be cached."""
+        version = self._version()
+        if version is None:
+            return None
+        payload = json.dumps({
+            "model": self.model_id,
+            "kind": kind,
+            "options": options,
+            "data": version,
+            "messages": _normalise(messages),
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def invoke(self, input, config=None, **kwargs) -> AIMessage:
+        key = self.cache_key("invoke", input, **kwargs)
+        if key is None:
+            return self.llm.invoke(input, config, **kwargs)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self._record_hit("invoke", cached["content"])
+            return AIMessage(content=cached["content"])
+        start = time.time()
+        call, leader = self._flight.begin(key)
+        if not leader:
+            result = call.wait()
+            self._record_hit("invoke", result.content, waited_since=start)
+            # The graph assigns message ids in place; every session gets its own message.
+            return result.model_copy()
+        try:
+            result = self.llm.invoke(input, config, **kwargs)
+        except BaseException as e:
+            self._flight.finish(key, call, error=e)
+            raise
+        if not getattr(result, "tool_calls", None):
+            self.cache.put(key, {"content": result.content})
+        self._flight.finish(key, call, result)
+        return result
+
+    def stream(self, input, config=None, **kwargs) -> Iterator[AIMessageChunk]:
+        key = self.cache_key("invoke", input, **kwargs)
+        if key is None:
+            yield from self.llm.stream(input, config, **kwargs)
+            return
+        cached = self.cache.get(key)
+        if cached is not None:
+            self._record_hit("stream", cached["content"])
+            for piece in _replay_chunks(cached["content"], self.replay_chunk_chars):
+                yield AIMessageChunk(content=piece)
+            return
+        start = time.time()
+        call, leader = self._flight.begin(key)
+        if not leader:
+            try:
+                content = call.wait()
+            except BaseException:
+                content = None  # the first stream failed or was abandoned; run our own
+            if content is not None:
+                self._record_hit("stream", content, waited_since=start)
+                for piece in _replay_chunks(content, self.replay_chunk_chars):
+                    yield AIMessageChunk(content=piece)
+                return
+        parts = []
+        try:
+            for chunk in self.llm.stream(input, config, **kwargs):
+                parts.append(chunk.content if isinstance(chunk.content, str) else "")
+                yield chunk
+        except BaseException as e:
+            # Includes GeneratorExit when the caller stops early; waiting streams then run their own.
+            if leader:
+                self._flight.finish(key, call, error=e)
+            raise
+        # Only reached when the caller consumed the whole stream.
+        content = "".join(parts)
+        self.cache.put(key, {"content": content})
+        if leader:
+            self._flight.finish(key, call, content)
+
+    def with_structured_output(self, schema, **kwargs) -> "CachedStructuredOutput":
+        return CachedStructuredOutput(self, self.llm.with_structured_output(schema, **kwargs), schema, kwargs)
+
+
+class CachedStructuredOutput:
+    """`with_structured_output` runnable whose `invoke` goes through the cache."""
+
+    def __init__(self, parent: CachedLLM, runnable, schema, options: dict):
+        self.parent = parent
+        self.runnable = runnable
+        self.schema = schema
+        self.schema_name = getattr(schema, "__name__", str(schema))
+        self.options = options
+
+    def __getattr__(self, name):
+        return getattr(self.runnable, name)
+
+    def invoke(self, input, config=None, **kwargs) -> Any:
+        key = self.parent.cache_key("structured", input, schema=self.schema_name, **self.options, **kwargs)
+        if key is None:
+            return self.runnable.invoke(input, config, **kwargs)
+        cached = self.parent.cache.get(key)
+        if cached is not None:
+            value = cached["value"]
+            self.parent._record_hit(f"structured {self.schema_name}", value)
+            if hasattr(self.schema, "model_validate"):
+                return self.schema.model_validate(value)
+            return value
+        start = time.time()
+        call, leader = self.parent._flight.begin(key)
+        if not leader:
+            result = call.wait()
+            self.parent._record_hit(f"structured {self.schema_name}", result, waited_since=start)
+            return result.model_copy() if hasattr(result, "model_copy") else result
+        try:
+            result = self.runnable.invoke(input, config, **kwargs)
+        except BaseException as e:
+            self.parent._flight.finish(key, call, error=e)
+            raise
+        value = result.model_dump() if hasattr(result, "model_dump") else result
+        self.parent.cache.put(key, {"value": value})
+        self.parent._flight.finish(key, call, result)
+        return result
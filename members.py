@@ -0,0 +1,140 @@
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from clickup_client import get_client
+from data_fetch import DEFAULT_LIST_ID, get_snapshot
+from metrics import DONE_STATUSES, prepare
+from singleflight import SingleFlight
+from snapshot import UNCACHED_VERSION, Snapshot
+
+MEMBERS_LIST_ID = os.getenv("CLICKUP_MEMBERS_LIST_ID", '901607182023')
+
+
+def fetch_list_members(list_id: str = MEMBERS_LIST_ID) -> List[dict]:
+    """Members of a ClickUp list as [{"id", "username", "email"}], straight from the API."""
+    response = get_client().get(f"list/{list_id}/member")
+    if not response.ok:
+        raise RuntimeError(f"ClickUp returned HTTP {response.status_code} for the members of list {list_id}")
+    return [{"id": member["id"], "username": member["username"], "email": member["email"]}
+            for member in response.json()["members"]]
+
+
+class MemberDirectory:
+    """List members, refetched only when the task snapshot they belong to is reloaded.
+
+    Sessions asking at the same moment share one fetch.
+
+    Args:
+        fetch: Fetches the members of a list
+        list_id: List whose members make up the team
+    """
+
+    def __init__(self, fetch: Callable[[str], List[dict]] = fetch_list_members, list_id: str = MEMBERS_LIST_ID):
+        self.fetch = fetch
+        self.list_id = list_id
+        self._loaded_for: Optional[Tuple[str, float]] = None
+        self._members: List[dict] = []
+        self._lock = threading.Lock()
+        self._flight = SingleFlight("member_fetches")
+
+    def members(self, snapshot: Snapshot) -> List[dict]:
+        key = (snapshot.list_id, snapshot.fetched_at)
+        with self._lock:
+            if self._loaded_for == key:
+                return self._members
+        return self._flight.do(key, self._load, key)
+
+    def _load(self, key: Tuple[str, float]) -> List[dict]:
+        members = self.fetch(self.list_id)
+        with self._lock:
+            self._members, self._loaded_for = members, key
+        return members
+
+    def by_username(self, snapshot: Snapshot) -> Dict[str, dict]:
+        return {member["username"]: member for member in self.members(snapshot)}
+
+
+class AssigneeIndex:
+    """Task <-> assignee index of one task frame.
+
+    `pairs` is the long-format table (one row per task and assignee, with
+    the task's row position) and `positions` maps each username to the row
+    positions of its tasks, so a member's tasks are found without scanning
+    the frame.
+
+    Args:
+        df: Preprocessed task DataFrame; treated as read-only
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        names = df["assignees"].fillna("").str.split(", ").reset_index(drop=True).explode()
+        names = names[names.fillna("") != ""]
+        self.pairs = pd.DataFrame({"assignee": names.to_numpy(), "row": names.index.to_numpy()})
+        rows = self.pairs["row"].to_numpy()
+        self.positions: Dict[str, np.ndarray] = {
+            name: rows[idx] for name, idx in self.pairs.groupby("assignee").indices.items()
+        }
+
+    def names(self) -> List[str]:
+        return sorted(self.positions)
+
+    def resolve(self, name: str) -> List[str]:
+        """Usernames matching `name`: an exact case-insensitive match, else every partial match."""
+        wanted = name.strip().lower()
+        exact = [n for n in self.positions if n.lower() == wanted]
+        return exact or [n for n in self.positions if wanted and wanted in n.lower()]
+
+    def tasks_for(self, username: str, sprint_name: Optional[str] = None) -> pd.DataFrame:
+        tasks = self.df.iloc[self.positions.get(username, np.empty(0, dtype=int))]
+        if sprint_name:
+            tasks = tasks[tasks["sprint_name"].fillna("").str.lower() == sprint_name.strip().lower()]
+        return tasks
+
+
+def member_workload(tasks: pd.DataFrame) -> dict:
+    """Counts and story points of one member's tasks."""
+    prepared = prepare(tasks)
+    open_ = ~prepared["done"]
+    return {
+        "tasks": int(len(prepared)),
+        "open_tasks": int(open_.sum()),
+        "in_progress_tasks": int(prepared["in_progress"].sum()),
+        "blocked_tasks": int(prepared["blocked"].sum()),
+        "done_tasks": int(prepared["done"].sum()),
+        "assigned_points": float(prepared["points"].sum()),
+        "open_points": float(prepared["points"][open_].sum()),
+        "done_points": float(prepared["done_points"].sum()),
+    }
+
+
+def open_tasks(tasks: pd.DataFrame) -> pd.DataFrame:
+    return tasks[~tasks["status"].fillna("").str.lower().isin(DONE_STATUSES)]
+
+
+MEMBER_DIRECTORY = MemberDirectory()
+_indexes: Dict[str, Tuple[int, AssigneeIndex]] = {}
+_indexes_lock = threading.Lock()
+
+
+def assignee_index(snapshot: Snapshot) -> AssigneeIndex:
+    """The index for a snapshot, built once per snapshot version."""
+    if snapshot.version == UNCACHED_VERSION:
+        return AssigneeIndex(snapshot.df)
+    with _indexes_lock:
+        cached = _indexes.get(snapshot.list_id)
+        if cached is not None and cached[0] == snapshot.version:
+            return cached[1]
+    index = AssigneeIndex(snapshot.df)
+    with _indexes_lock:
+        _indexes[snapshot.list_id] = (snapshot.version, index)
+    return index
+
+
+def current_index(list_id: str = DEFAULT_LIST_ID) -> Tuple[Snapshot, AssigneeIndex]:
+    snapshot = get_snapshot(list_id)
+    return snapshot, assignee_index(snapshot)
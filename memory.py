@@ -0,0 +1,185 @@
+import os
+import re
+import threading
+from functools import lru_cache
+from typing import Callable, List, Optional, Tuple
+
+from fence_parser import CODE_END, CODE_START, parse_fences
+
+MEMORY_TURNS = int(os.getenv("MEMORY_TURNS", 3))
+MEMORY_TOKEN_BUDGET = int(os.getenv("MEMORY_TOKEN_BUDGET", 3000))
+MEMORY_SUMMARY_TOKENS = int(os.getenv("MEMORY_SUMMARY_TOKENS", 400))
+OMITTED_LANGUAGES = {"html", "htm", "javascript", "js", "css"}
+
+SUMMARY_PROMPT = """You maintain the running summary of a conversation between a Scrum team member and their \
+AI Scrum Master. Update the summary with the new turns below. Keep what later questions may refer back to: the \
+questions asked, the key facts and numbers in the answers, decisions and follow-ups. Drop formatting and chart code. \
+Write at most {max_words} words of plain prose and reply with the summary only.
+
+CURRENT SUMMARY:
+{summary}
+
+NEW TURNS:
+{turns}"""
+
+_WORD = re.compile(r"\w+|[^\w\s]")
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Tokens in `text` with the gpt-4o tokenizer, or a word/punctuation estimate without tiktoken."""
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return len(_WORD.findall(text))
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    if max_tokens <= 0:
+        return ""
+    encoding = _encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text, disallowed_special=())
+        return text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens]) + " …"
+    words = _WORD.findall(text)
+    return text if len(words) <= max_tokens else " ".join(words[:max_tokens]) + " …"
+
+
+def strip_code(text: str) -> str:
+    """Replace chart and page code blocks in an answer with a placeholder; they are no use as context."""
+    parts, skipping = [], False
+    for event in parse_fences(text):
+        if event.kind == CODE_START and event.language in OMITTED_LANGUAGES:
+            skipping = True
+            parts.append(f"[{event.language} code omitted]\n")
+        elif skipping:
+            skipping = event.kind != CODE_END
+        elif event.kind == CODE_START:
+            parts.append(f"```{event.language}\n")
+        elif event.kind == CODE_END:
+            parts.append("```\n")
+        else:
+            parts.append(event.text)
+    return "".join(parts)
+
+
+class ConversationMemory:
+    """Token-budgeted chat history for one session.
+
+    The last `turns` question/answer pairs are kept verbatim; older ones are
+    folded into a rolling summary by the model on a background thread, so a
+    turn never waits for it. `messages` returns the summary plus as many
+    recent turns as fit in `token_budget`, newest first, so the history sent
+    per question stays bounded however long the session runs.
+
+    Args:
+        llm: Chat model used for the summary; None keeps an extractive summary of past questions
+        turns: Recent turns kept verbatim
+        token_budget: Tokens of history (summary included) sent with each question
+        summary_tokens: Size the summary is kept under
+    """
+
+    def __init__(self, llm=None, turns: int = MEMORY_TURNS, token_budget: int = MEMORY_TOKEN_BUDGET,
+                 summary_tokens: int = MEMORY_SUMMARY_TOKENS):
+        self.llm = llm
+        self.turns = turns
+        self.token_budget = token_budget
+        self.summary_tokens = summary_tokens
+        self.summary = ""
+        self._recent: List[Tuple[str, str]] = []
+        # Turns past the verbatim window that the summary does not cover yet.
+        self._pending: List[Tuple[str, str]] = []
+        self._lock = threading.Lock()
+        self._refresh: Optional[threading.Thread] = None
+
+    def add_turn(self, question: str, answer: str) -> None:
+        """Record a finished turn; turns leaving the verbatim window are summarised in the background."""
+        with self._lock:
+            self._recent.append((question, strip_code(answer)))
+            overflow = len(self._recent) - self.turns
+            if overflow > 0:
+                self._pending.extend(self._recent[:overflow])
+                del self._recent[:overflow]
+            start = bool(self._pending) and (self._refresh is None or not self._refresh.is_alive())
+            if start:
+                self._refresh = threading.Thread(target=self._refresh_summary, name="memory-summary", daemon=True)
+                self._refresh.start()
+
+    def _refresh_summary(self) -> None:
+        while True:
+            with self._lock:
+                folding = list(self._pending)
+                summary = self.summary
+            if not folding:
+                return
+            updated = self._summarise(summary, folding)
+            with self._lock:
+                self.summary = updated
+                del self._pending[:len(folding)]
+
+    def _summarise(self, summary: str, turns: List[Tuple[str, str]]) -> str:
+        text = "\n\n".join(f"User: {question}\nAssistant: {truncate_tokens(answer, self.summary_tokens)}"
+                           for question, answer in turns)
+        if self.llm is not None:
+            prompt = SUMMARY_PROMPT.format(max_words=int(self.summary_tokens * 0.7), summary=summary or "(empty)",
+                                           turns=text)
+            try:
+                reply = self.llm.invoke([{"role": "user", "content": prompt}]).content
+                return truncate_tokens(str(reply).strip(), self.summary_tokens)
+            except Exception as e:
+                print(f"Could not refresh the conversation summary: {e}")
+        # Without a model, remember what was asked; the newest questions win when space runs out.
+        asked = "; ".join(question for question, _ in turns)
+        combined = f"{summary.rstrip('.')}; {asked}." if summary else f"Earlier questions: {asked}."
+        if count_tokens(combined) <= self.summary_tokens:
+            return combined
+        # Tokens average well over three characters, so this tail fits.
+        return "… " + combined[-self.summary_tokens * 3:]
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Block until the summary covers every folded turn (for scripts and benchmarks)."""
+        refresh = self._refresh
+        if refresh is not None:
+            refresh.join(timeout)
+
+    def messages(self, question: str) -> List[dict]:
+        """History for the next graph run: summary, recent turns within the budget, then `question`."""
+        with self._lock:
+            summary = self.summary
+            # Turns still waiting for the summary are the oldest candidates and drop out first.
+            candidates = self._pending + self._recent
+        budget = self.token_budget
+        history: List[dict] = []
+        if summary:
+            summary_message = {"role": "system", "content": f"Summary of the earlier conversation: {summary}"}
+            budget -= count_tokens(summary_message["content"])
+        for past_question, answer in reversed(candidates):
+            cost = count_tokens(past_question) + count_tokens(answer)
+            if cost > budget:
+                # The newest turn is always kept, with its answer cut to what fits.
+                if not history and budget > count_tokens(past_question):
+                    answer = truncate_tokens(answer, budget - count_tokens(past_question))
+                    history[:0] = [{"role": "user", "content": past_question}, {"role": "assistant", "content": answer}]
+                break
+            history[:0] = [{"role": "user", "content": past_question}, {"role": "assistant", "content": answer}]
+            budget -= cost
+        if summary:
+            history.insert(0, summary_message)
+        return history + [{"role": "user", "content": question}]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"recent_turns": len(self._recent), "pending_turns": len(self._pending),
+                    "summary_tokens": count_tokens(self.summary)}
+
+
+def history_tokens(messages: List[dict], count: Callable[[str], int] = count_tokens) -> int:
+    return sum(count(str(message["content"])) for message in messages)
@@ -0,0 +1,171 @@
+import json
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+DONE_STATUSES = {'completed', 'complete', 'done', 'closed'}
+BLOCKED_STATUSES = {'blocked'}
+IN_PROGRESS_STATUSES = {'in progress', 'in review', 'review'}
+
+
+def _utcnow() -> pd.Timestamp:
+    return pd.Timestamp.now(tz='UTC').tz_localize(None)
+
+
+def prepare(df: pd.DataFrame, now: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+    """Add the numeric/boolean helper columns every metric is computed from."""
+    now = now if now is not None else _utcnow()
+    status = df['status'].fillna('').str.lower()
+    points = pd.to_numeric(df['points'], errors='coerce').fillna(0.0)
+    done = status.isin(DONE_STATUSES)
+    return pd.DataFrame({
+        'id': df['id'],
+        'name': df['name'],
+        'sprint_name': df['sprint_name'].fillna(''),
+        'sprint_no': pd.to_numeric(df['sprint_name'].fillna('').str.extract(r'(\d+)', expand=False), errors='coerce'),
+        'assignees': df['assignees'].fillna(''),
+        'status': status,
+        'points': points,
+        'done': done,
+        'blocked': status.isin(BLOCKED_STATUSES),
+        'in_progress': status.isin(IN_PROGRESS_STATUSES),
+        'done_points': points.where(done, 0.0),
+        'date_created': df['date_created'],
+        'date_updated': df['date_updated'],
+        'age_days': (now - df['date_updated']).dt.total_seconds() / 86400,
+    })
+
+
+def current_sprint(prepared: pd.DataFrame) -> str:
+    """The sprint with the highest number, or '' when no task is tagged."""
+    tagged = prepared.dropna(subset=['sprint_no'])
+    if tagged.empty:
+        return ''
+    return tagged.loc[tagged['sprint_no'].idxmax(), 'sprint_name']
+
+
+def sprint_metrics(prepared: pd.DataFrame) -> pd.DataFrame:
+    """Per-sprint scope, velocity, completion, carry-over and blocked age."""
+    tagged = prepared[prepared['sprint_name'] != '']
+    if tagged.empty:
+        return pd.DataFrame()
+    latest = tagged['sprint_no'].max()
+    open_before_latest = ~tagged['done'] & (tagged['sprint_no'] < latest)
+    frame = tagged.assign(
+        open_points=tagged['points'].where(~tagged['done'], 0.0),
+        carry_over=open_before_latest,
+        carry_over_points=tagged['points'].where(open_before_latest, 0.0),
+        blocked_age=tagged['age_days'].where(tagged['blocked']),
+    )
+    metrics = frame.groupby('sprint_name').agg(
+        sprint_no=('sprint_no', 'first'),
+        tasks=('id', 'size'),
+        done_tasks=('done', 'sum'),
+        in_progress_tasks=('in_progress', 'sum'),
+        blocked_tasks=('blocked', 'sum'),
+        committed_points=('points', 'sum'),
+        velocity=('done_points', 'sum'),
+        remaining_points=('open_points', 'sum'),
+        carry_over_tasks=('carry_over', 'sum'),
+        carry_over_points=('carry_over_points', 'sum'),
+        max_blocked_age_days=('blocked_age', 'max'),
+        mean_blocked_age_days=('blocked_age', 'mean'),
+    )
+    metrics['completion_ratio'] = np.where(
+        metrics['committed_points'] > 0,
+        metrics['velocity'] / metrics['committed_points'].where(metrics['committed_points'] > 0, 1),
+        metrics['done_tasks'] / metrics['tasks'],
+    )
+    return metrics.sort_values('sprint_no').round(2)
+
+
+def assignee_metrics(prepared: pd.DataFrame) -> pd.DataFrame:
+    """Per-assignee workload. Shared tasks count in full for every assignee."""
+    exploded = prepared.assign(assignee=prepared['assignees'].str.split(', ')).explode('assignee')
+    exploded = exploded[exploded['assignee'].fillna('') != '']
+    if exploded.empty:
+        return pd.DataFrame()
+    exploded = exploded.assign(
+        open=~exploded['done'],
+        open_points=exploded['points'].where(~exploded['done'], 0.0),
+        blocked_age=exploded['age_days'].where(exploded['blocked']),
+    )
+    return exploded.groupby('assignee').agg(
+        tasks=('id', 'size'),
+        open_tasks=('open', 'sum'),
+        in_progress_tasks=('in_progress', 'sum'),
+        blocked_tasks=('blocked', 'sum'),
+        done_tasks=('done', 'sum'),
+        assigned_points=('points', 'sum'),
+        done_points=('done_points', 'sum'),
+        open_points=('open_points', 'sum'),
+        max_blocked_age_days=('blocked_age', 'max'),
+    ).sort_values('open_points', ascending=False).round(2)
+
+
+def burndown(prepared: pd.DataFrame, sprint_name: str, now: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+    """Daily remaining points for one sprint.
+
+    ClickUp has no closing date on tasks, so a done task is counted as
+    burned on its last `date_updated`. The series runs from the sprint's
+    earliest `date_created` to its latest `date_updated` (capped at `now`).
+    """
+    now = now if now is not None else _utcnow()
+    sprint = prepared[prepared['sprint_name'] == sprint_name]
+    if sprint.empty:
+        return pd.DataFrame(columns=['date', 'remaining_points', 'ideal_points'])
+    start = sprint['date_created'].min().normalize()
+    end = max(start, min(now, sprint['date_updated'].max()).normalize())
+    days = pd.date_range(start, end, freq='D')
+    burned = (sprint.loc[sprint['done']]
+              .groupby(sprint.loc[sprint['done'], 'date_updated'].dt.normalize())['points'].sum()
+              .reindex(days, fill_value=0.0)
+              .cumsum())
+    committed = sprint['points'].sum()
+    ideal = np.linspace(committed, 0.0, num=len(days)) if len(days) > 1 else np.array([committed])
+    return pd.DataFrame({
+        'date': days.strftime('%Y-%m-%d'),
+        'remaining_points': (committed - burned.to_numpy()).round(2),
+        'ideal_points': ideal.round(2),
+    })
+
+
+def _records(frame: pd.DataFrame) -> list:
+    # Round-trip through to_json so numpy scalars and NaN become plain JSON values.
+    return json.loads(frame.to_json(orient='records'))
+
+
+def compute_metrics(df: pd.DataFrame, sprint_name: Optional[str] = None,
+                    include_burndown: bool = True, now: Optional[pd.Timestamp] = None) -> dict:
+    """Every sprint metric the agents ask for, computed in one pass over the task frame.
+
+    Args:
+        df: Preprocessed task DataFrame
+        sprint_name: Sprint to focus on (defaults to the latest sprint)
+        include_burndown: Whether to add the daily burndown series for that sprint
+        now: Reference time for ages (defaults to the current UTC time)
+
+    Returns:
+        Dictionary of JSON-serialisable metrics
+    """
+    prepared = prepare(df, now)
+    latest = current_sprint(prepared)
+    focus = (sprint_name or latest).strip().lower()
+    per_sprint = sprint_metrics(prepared)
+    focus_tasks = prepared[prepared['sprint_name'].str.lower() == focus] if focus else prepared
+
+    finished = per_sprint[per_sprint['sprint_no'] < per_sprint['sprint_no'].max()] if len(per_sprint) else per_sprint
+    result = {
+        'current_sprint': latest,
+        'focus_sprint': focus,
+        'average_velocity_previous_sprints': round(float(finished['velocity'].mean()), 2) if len(finished) else None,
+        'per_sprint': _records(per_sprint.reset_index()),
+        'per_assignee': _records(assignee_metrics(focus_tasks).reset_index()),
+    }
+    if focus and len(per_sprint) and focus in set(per_sprint.index.str.lower()):
+        result['focus_sprint_summary'] = next(row for row in result['per_sprint'] if row['sprint_name'].lower() == focus)
+    if include_burndown and focus:
+        result['burndown'] = burndown(prepared, focus_tasks['sprint_name'].iloc[0] if len(focus_tasks) else focus,
+                                      now).to_dict(orient='records')
+    return result
@@ -0,0 +1,298 @@
+"""Background sprint monitor: syncs the board, diffs it against the last run and raises alerts.
+
+Alerts come from rules over the snapshot diff, never from the model. The
+model is only asked, once per run, to phrase that run's alerts as short
+notifications. Run it next to the Streamlit app:
+
+    python monitor.py                  # every MONITOR_INTERVAL seconds
+    python monitor.py --once --no-llm  # one pass, rule text only
+    python monitor.py --comment        # also post each alert as a comment on its task
+"""
+import argparse
+import json
+import os
+import re
+import threading
+import time
+from typing import Callable, List, Optional
+
+import pandas as pd
+from dotenv import load_dotenv
+
+import tracing
+from bulk_ops import post_comments, summarise
+from data_fetch import DEFAULT_LIST_ID, LLM, get_snapshot
+from metrics import prepare
+load_dotenv()
+
+MONITOR_INTERVAL = float(os.getenv("MONITOR_INTERVAL", 300))
+MONITOR_STATE_PATH = os.getenv("MONITOR_STATE_PATH", ".vantage/monitor_state.json")
+MONITOR_ALERTS_PATH = os.getenv("MONITOR_ALERTS_PATH", ".vantage/alerts.jsonl")
+STALE_DAYS = float(os.getenv("MONITOR_STALE_DAYS", 3))
+PHRASE_BATCH = 40  # alerts phrased per model call
+
+STATUS_CHANGED = "status_changed"
+NEWLY_BLOCKED = "newly_blocked"
+STALE = "stale"
+UNASSIGNED_IN_PROGRESS = "unassigned_in_progress"
+# Rules about a task's current condition (rather than a change) alert once
+# until the condition clears.
+CONDITION_RULES = {STALE, UNASSIGNED_IN_PROGRESS}
+SEVERITY = {STATUS_CHANGED: "info", NEWLY_BLOCKED: "critical", STALE: "warning", UNASSIGNED_IN_PROGRESS: "warning"}
+STATE_COLUMNS = ["id", "status", "date_updated", "assignees"]
+ALERT_COLUMNS = ["rule", "severity", "key", "task_id", "name", "status", "previous_status", "assignees",
+                 "sprint_name", "age_days"]
+
+PHRASE_PROMPT = """You write short notifications for a Scrum team's chat. Each numbered line below is an alert \
+raised by the sprint monitor about one task. For every alert write one friendly, specific sentence addressed to the \
+assignees (or to the team when there are none) saying what happened and what to do next. Keep task names as given.
+Reply with exactly one line per alert, starting with its number in square brackets, e.g. "[3] ...", and nothing else.
+
+ALERTS:
+{alerts}"""
+
+
+def _frame_state(df: pd.DataFrame) -> pd.DataFrame:
+    return df[STATE_COLUMNS].assign(status=df["status"].fillna("").str.lower(),
+                                    assignees=df["assignees"].fillna(""))
+
+
+def diff_snapshots(previous: Optional[pd.DataFrame], current: pd.DataFrame, now: Optional[pd.Timestamp] = None,
+                   stale_days: float = STALE_DAYS) -> pd.DataFrame:
+    """Alerts for the changes between two snapshots and for the current board's conditions.
+
+    Args:
+        previous: id/status/date_updated/assignees of the last run, or None on the first run
+            (then only condition rules fire, as there is no change to report)
+        current: The task snapshot DataFrame
+        now: Reference time for staleness (defaults to now, UTC)
+        stale_days: Days without an update after which open, started work is stale
+
+    Returns:
+        One row per alert with ALERT_COLUMNS
+    """
+    tasks = prepare(current, now)
+    if previous is not None:
+        tasks = tasks.merge(previous[["id", "status"]].rename(columns={"status": "previous_status"}),
+                            on="id", how="left")
+    else:
+        tasks = tasks.assign(previous_status=pd.NA)
+
+    seen_before = tasks["previous_status"].notna()
+    changed = seen_before & (tasks["status"] != tasks["previous_status"])
+    if previous is None:
+        newly_blocked = pd.Series(False, index=tasks.index)
+    else:
+        # A task created since the last run that is already blocked got blocked since then too.
+        newly_blocked = tasks["blocked"] & (changed | ~seen_before)
+    started = tasks["in_progress"] | tasks["blocked"]
+    masks = {
+        NEWLY_BLOCKED: newly_blocked,
+        STATUS_CHANGED: changed & ~newly_blocked,
+        STALE: started & ~tasks["done"] & (tasks["age_days"] >= stale_days),
+        UNASSIGNED_IN_PROGRESS: tasks["in_progress"] & (tasks["assignees"].str.strip() == ""),
+    }
+
+    frames = []
+    for rule, mask in masks.items():
+        hits = tasks[mask.fillna(False).astype(bool)]
+        if hits.empty:
+            continue
+        # Event keys carry the update time, so each change alerts once; condition
+        # keys stay the same while the condition holds.
+        if rule in CONDITION_RULES:
+            keys = rule + ":" + hits["id"].astype(str) + ":" + hits["status"]
+        else:
+            keys = rule + ":" + hits["id"].astype(str) + ":" + hits["date_updated"].astype(str)
+        frames.append(pd.DataFrame({
+            "rule": rule, "severity": SEVERITY[rule], "key": keys, "task_id": hits["id"], "name": hits["name"],
+            "status": hits["status"], "previous_status": hits["previous_status"], "assignees": hits["assignees"],
+            "sprint_name": hits["sprint_name"], "age_days": hits["age_days"].round(1),
+        }))
+    if not frames:
+        return pd.DataFrame(columns=ALERT_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def alert_text(alert: dict) -> str:
+    """Plain rule text of an alert, used when the model is off or skips one."""
+    who = alert["assignees"] or "unassigned"
+    if alert["rule"] == STATUS_CHANGED:
+        return f"{alert['name']} moved from {alert['previous_status']} to {alert['status']} ({who})."
+    if alert["rule"] == NEWLY_BLOCKED:
+        return f"{alert['name']} is now blocked ({who}); it needs an owner to clear the blocker."
+    if alert["rule"] == STALE:
+        return f"{alert['name']} has been {alert['status']} with no update for {alert['age_days']:.0f} days ({who})."
+    return f"{alert['name']} is {alert['status']} but nobody is assigned to it."
+
+
+def phrase_alerts(alerts: List[dict], llm=None, batch_size: int = PHRASE_BATCH) -> List[str]:
+    """Notification text per alert, from one model call per `batch_size` alerts.
+
+    Falls back to `alert_text` without a model, on a failed call, or for any
+    alert the reply leaves out.
+    """
+    messages = [alert_text(alert) for alert in alerts]
+    if llm is None:
+        return messages
+    for start in range(0, len(alerts), batch_size):
+        batch = alerts[start:start + batch_size]
+        lines = "\n".join(
+            f"[{i}] rule={a['rule']}; task={a['name']}; status={a['status']}; previous={a['previous_status'] or '-'}; "
+            f"assignees={a['assignees'] or '-'}; days_since_update={a['age_days']:.0f}"
+            for i, a in enumerate(batch, 1))
+        try:
+            reply = llm.invoke([{"role": "user", "content": PHRASE_PROMPT.format(alerts=lines)}]).content
+        except Exception as e:
+            print(f"Could not phrase alerts: {e}")
+            continue
+        for number, text in re.findall(r"^\s*\[(\d+)\]\s*(.+?)\s*$", reply, flags=re.MULTILINE):
+            if 1 <= int(number) <= len(batch):
+                messages[start + int(number) - 1] = text
+    return messages
+
+
+class SprintMonitor:
+    """Periodic board check that alerts on what changed since the previous run.
+
+    The previous run's task states and the condition alerts still open are
+    kept in `state_path`, so a restarted monitor neither re-reports old
+    changes nor repeats an alert whose condition has not cleared.
+
+    Args:
+        list_id: ClickUp list to watch
+        llm: Chat model used to phrase notifications; None keeps the rule text
+        notify: Extra callables given each run's alerts, e.g. to post comments
+        state_path: JSON file for the previous run's state; empty keeps it in memory
+        alerts_path: JSON lines file alerts are appended to; empty disables it
+        stale_days: Days without an update after which started work is stale
+    """
+
+    def __init__(self, list_id: str = DEFAULT_LIST_ID, llm=None, notify: Optional[List[Callable]] = None,
+                 state_path: str = MONITOR_STATE_PATH, alerts_path: str = MONITOR_ALERTS_PATH,
+                 stale_days: float = STALE_DAYS):
+        self.list_id = list_id
+        self.llm = llm
+        self.notify = notify or []
+        self.state_path = state_path
+        self.alerts_path = alerts_path
+        self.stale_days = stale_days
+        self.previous: Optional[pd.DataFrame] = None
+        self.open_conditions: set = set()
+        self._load_state()
+
+    def _load_state(self) -> None:
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+        with open(self.state_path) as f:
+            state = json.load(f)
+        previous = pd.DataFrame(state.get("tasks", []), columns=STATE_COLUMNS)
+        self.previous = previous.assign(date_updated=pd.to_datetime(previous["date_updated"]))
+        self.open_conditions = set(state.get("open_conditions", []))
+
+    def _save_state(self) -> None:
+        if not self.state_path:
+            return
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tasks = self.previous.assign(date_updated=self.previous["date_updated"].astype(str))
+        state = {"tasks": tasks.to_dict(orient="records"), "open_conditions": sorted(self.open_conditions)}
+        temp = self.state_path + ".tmp"
+        with open(temp, "w") as f:
+            json.dump(state, f)
+        os.replace(temp, self.state_path)
+
+    def _write_alerts(self, alerts: List[dict]) -> None:
+        if not self.alerts_path or not alerts:
+            return
+        directory = os.path.dirname(self.alerts_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.alerts_path, "a") as f:
+            for alert in alerts:
+                f.write(json.dumps(alert, default=str) + "\n")
+
+    def run_once(self, now: Optional[pd.Timestamp] = None) -> List[dict]:
+        """Sync the board, diff it and deliver the new alerts.
+
+        Returns:
+            This run's new alerts, each with a "message"
+        """
+        with tracing.trace("monitor", list_id=self.list_id):
+            df = get_snapshot(self.list_id, force_refresh=True).df
+            found = diff_snapshots(self.previous, df, now, self.stale_days)
+            conditions = found["rule"].isin(CONDITION_RULES)
+            fresh = found[~conditions | ~found["key"].isin(self.open_conditions)]
+            alerts = fresh.astype(object).where(fresh.notna(), None).to_dict(orient="records")
+            for alert, message in zip(alerts, phrase_alerts(alerts, self.llm)):
+                alert["message"] = message
+                alert["raised_at"] = pd.Timestamp.now(tz="UTC").isoformat()
+
+            self._write_alerts(alerts)
+            for notify in self.notify:
+                try:
+                    notify(alerts)
+                except Exception as e:
+                    print(f"Alert delivery failed in {getattr(notify, '__name__', notify)}: {e}")
+            # Conditions that cleared drop out, so they alert again if they come back.
+            self.open_conditions = set(found.loc[conditions, "key"])
+            self.previous = _frame_state(df)
+            self._save_state()
+        return alerts
+
+    def run_forever(self, interval: float = MONITOR_INTERVAL, stop: Optional[threading.Event] = None) -> None:
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            started = time.monotonic()
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Monitor run failed: {e}")
+            stop.wait(max(interval - (time.monotonic() - started), 0))
+
+    def start(self, interval: float = MONITOR_INTERVAL) -> threading.Event:
+        """Run in a daemon thread of this process; set the returned event to stop it."""
+        stop = threading.Event()
+        threading.Thread(target=self.run_forever, args=(interval, stop), name="sprint-monitor", daemon=True).start()
+        return stop
+
+
+def print_alerts(alerts: List[dict]) -> None:
+    for alert in alerts:
+        print(f"[{alert['severity']}] {alert['message']}")
+
+
+def comment_alerts(alerts: List[dict]) -> None:
+    """Post each non-informational alert as a comment on its task (identical comments are posted once)."""
+    comments = [(alert["task_id"], f"Sprint monitor: {alert['message']}") for alert in alerts
+                if alert["severity"] != "info"]
+    if comments:
+        print(f"Posted alert comments: {summarise(post_comments(comments))['summary']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch the sprint board and raise alerts")
+    parser.add_argument("--list-id", default=DEFAULT_LIST_ID)
+    parser.add_argument("--interval", type=float, default=MONITOR_INTERVAL, help="seconds between runs")
+    parser.add_argument("--once", action="store_true", help="run a single pass and exit")
+    parser.add_argument("--stale-days", type=float, default=STALE_DAYS)
+    parser.add_argument("--no-llm", action="store_true", help="use the rule text instead of model-phrased messages")
+    parser.add_argument("--comment", action="store_true", help="post warning and critical alerts as task comments")
+    args = parser.parse_args()
+
+    notify = [print_alerts] + ([comment_alerts] if args.comment else [])
+    monitor = SprintMonitor(args.list_id, llm=None if args.no_llm else LLM, notify=notify,
+                            stale_days=args.stale_days)
+    if args.once:
+        monitor.run_once()
+        return
+    print(f"Monitoring list {args.list_id} every {args.interval:.0f}s")
+    try:
+        monitor.run_forever(args.interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import re
+from typing import List, Sequence
+
+from router import ANALYSIS_BRANCHES, FAST_ROUTER, FastRouter, latest_question
+
+# Independent sub-tasks a question can fan out to. They run in parallel and
+# join at the supervisor, which then hands over to the writer or visualizer.
+BRANCHES = ANALYSIS_BRANCHES
+
+METRICS_PATTERN = re.compile(
+    r"\b(velocity|burn ?down|burn ?up|on track|progress|story points?|points|completion|carry[- ]?over|"
+    r"capacity|workload|health|risks?|forecast)\b", re.I)
+COMMENTS_PATTERN = re.compile(r"\b(stand ?ups?|blockers?|blocked|comments?|overdue|stuck|impediments?)\b", re.I)
+RETRO_PATTERN = re.compile(r"\b(retro(spective)?s?|went well|could be improved|action items?|recurring)\b", re.I)
+
+
+def plan_branches(question: str, router: FastRouter = FAST_ROUTER) -> List[str]:
+    """Branches to run in parallel for a user question.
+
+    The scrum master analysis runs for every data question; metrics, the
+    comments lookup, chart data and the retrospective history are added when
+    the question asks for them. Retrospective requests only need the history.
+
+    Args:
+        question: The latest user question
+        router: Router used to classify the question's intent
+
+    Returns:
+        Branch names from BRANCHES, in that order
+    """
+    intent = router.intent(question)
+    retro = bool(RETRO_PATTERN.search(question))
+    if intent is not None and intent.next == "writer" and intent.confidence >= 1.0:
+        return ["retro"] if retro else []
+    branches = ["scrum_master"]
+    if METRICS_PATTERN.search(question):
+        branches.append("metrics")
+    if COMMENTS_PATTERN.search(question):
+        branches.append("comments")
+    if intent is not None and intent.next == "visualizer":
+        branches.append("chart_data")
+    if retro:
+        branches.append("retro")
+    return branches
+
+
+def plan_for_messages(messages: Sequence, router: FastRouter = FAST_ROUTER) -> List[str]:
+    question, _ = latest_question(messages)
+    return plan_branches(question, router) if question else ["scrum_master"]
@@ -0,0 +1,126 @@
+import os
+from typing import Callable, Dict, Optional
+
+import pandas as pd
+
+PROMPT_ENCODING = os.getenv("PROMPT_ENCODING", "compact")
+DESCRIPTION_CHARS = int(os.getenv("PROMPT_DESCRIPTION_CHARS", 160))
+
+# Shorter header names for the compact table.
+HEADER_NAMES = {
+    "item_type": "type",
+    "sprint_name": "sprint",
+    "date_created": "created",
+    "date_updated": "updated",
+    "creator_username": "creator",
+    "parent_task": "parent",
+    "priority_name": "priority",
+}
+
+
+def encode_json_records(df: pd.DataFrame) -> str:
+    """The original encoding: one JSON object per task."""
+    return df.to_json(orient="records")
+
+
+def _cell(value) -> str:
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    if isinstance(value, pd.Timestamp):
+        return value.strftime("%Y-%m-%d")
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).replace("\\", "\\\\").replace("|", "\\|").replace("\r", " ").replace("\n", " ")
+
+
+def _truncate(text, limit: int) -> str:
+    text = _cell(text)
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
+
+
+def encode_compact(df: pd.DataFrame, description_chars: int = DESCRIPTION_CHARS) -> str:
+    """Pipe-separated table with one header and dictionary-encoded repeated values.
+
+    Works on any subset of the preprocessed task columns:
+
+    - statuses become S<n> and people (assignees and creators) become P<n>,
+      each defined once in a legend above the table
+    - creator id and email move into the people legend
+    - priority rank and name are merged into one "rank:name" cell
+    - timestamps are written as dates
+    - descriptions are cut to `description_chars` characters
+    """
+    if df.empty:
+        return "(no tasks)"
+
+    columns = list(df.columns)
+    cells: Dict[str, list] = {}
+    legend = []
+
+    people: Dict[str, str] = {}
+    details: Dict[str, str] = {}
+    if "creator_username" in df:
+        ids = df["creator_id"] if "creator_id" in df else [None] * len(df)
+        emails = df["creator_email"] if "creator_email" in df else [None] * len(df)
+        for username, user_id, email in zip(df["creator_username"], ids, emails):
+            if isinstance(username, str) and username not in people:
+                people[username] = f"P{len(people)}"
+                details[username] = " ".join(
+                    part for part in (f"<{_cell(email)}>" if _cell(email) else "",
+                                      f"#{_cell(user_id)}" if _cell(user_id) else "") if part)
+        columns = [c for c in columns if c not in ("creator_id", "creator_email")]
+    if "assignees" in df:
+        assignee_lists = df["assignees"].fillna("").str.split(", ")
+        for names in assignee_lists:
+            for name in names:
+                if name and name not in people:
+                    people[name] = f"P{len(people)}"
+        cells["assignees"] = [",".join(people[n] for n in names if n) for names in assignee_lists]
+    if "creator_username" in df:
+        cells["creator_username"] = df["creator_username"].map(people).fillna("").tolist()
+    if people:
+        legend.append("people: " + "; ".join(
+            f"{code}={name}" + (f" {details[name]}" if details.get(name) else "") for name, code in people.items()))
+
+    if "status" in df:
+        statuses = {status: f"S{i}" for i, status in enumerate(pd.unique(df["status"].dropna()))}
+        cells["status"] = df["status"].map(statuses).fillna("").tolist()
+        legend.append("status: " + "; ".join(f"{code}={status}" for status, code in statuses.items()))
+
+    if "priority_name" in df and "priority_orderindex" in df:
+        cells["priority_name"] = [f"{_cell(rank)}:{_cell(name)}" if _cell(name) else ""
+                                  for rank, name in zip(df["priority_orderindex"], df["priority_name"])]
+        columns = [c for c in columns if c != "priority_orderindex"]
+
+    if "description" in df:
+        cells["description"] = [_truncate(text, description_chars) for text in df["description"]]
+
+    for column in columns:
+        if column not in cells:
+            series = df[column]
+            if pd.api.types.is_datetime64_any_dtype(series):
+                cells[column] = series.dt.strftime("%Y-%m-%d").fillna("").tolist()
+            else:
+                cells[column] = [_cell(value) for value in series]
+
+    header = "|".join(HEADER_NAMES.get(c, c) for c in columns)
+    body = ["|".join(row) for row in zip(*(cells[c] for c in columns))]
+    return "\n".join(legend + [header] + body)
+
+
+ENCODERS: Dict[str, Callable[[pd.DataFrame], str]] = {
+    "json": encode_json_records,
+    "compact": encode_compact,
+}
+
+
+def register_encoder(name: str, encoder: Callable[[pd.DataFrame], str]) -> None:
+    ENCODERS[name] = encoder
+
+
+def encode_tasks(df: pd.DataFrame, encoding: Optional[str] = None) -> str:
+    """Serialise a task frame for a prompt with the configured encoder."""
+    encoding = encoding or PROMPT_ENCODING
+    if encoding not in ENCODERS:
+        raise ValueError(f"Unknown prompt encoding {encoding!r}; choose from {sorted(ENCODERS)}")
+    return ENCODERS[encoding](df)
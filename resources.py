@@ -0,0 +1,50 @@
+import threading
+from typing import Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Lazy(Generic[T]):
+    """Process-wide resource built on first use.
+
+    Stands in for the object itself: attribute access is forwarded to it,
+    so `LLM.stream(...)` works whether or not the model was built yet. The
+    factory (and the imports inside it) runs once, by whichever thread
+    needs it first; the others wait for that result.
+
+    Args:
+        factory: Builds the resource
+        name: Shown in repr and errors
+    """
+
+    def __init__(self, factory: Callable[[], T], name: Optional[str] = None):
+        self._factory = factory
+        self._name = name or getattr(factory, "__name__", "resource")
+        self._value: Optional[T] = None
+        self._built = False
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        if not self._built:
+            with self._lock:
+                if not self._built:
+                    self._value = self._factory()
+                    self._built = True
+        return self._value
+
+    @property
+    def built(self) -> bool:
+        return self._built
+
+    def reset(self) -> None:
+        """Drop the built resource; the next use builds it again."""
+        with self._lock:
+            self._value = None
+            self._built = False
+
+    def __getattr__(self, name):
+        # Only reached for names Lazy itself lacks.
+        return getattr(self.get(), name)
+
+    def __repr__(self) -> str:
+        return f"Lazy({self._name}, built={self._built})"
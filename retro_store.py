@@ -0,0 +1,451 @@
+"""Retrospective and standup history: a SQLite store with full-text and TF-IDF indexes.
+
+Entries are kept per sprint, member and category, and retrieval returns
+only the snippets relevant to a question, so the prompt stays the same size
+however many sprints are stored.
+
+    python retro_store.py import notes.md            # "Sprint N Retrospective" files, like assets/retrospectives.md
+    python retro_store.py add "Sprint 3" improve "Standups ran long" --member ankan
+    python retro_store.py search "blockers raised too late"
+    python retro_store.py recurring
+"""
+import argparse
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from resources import Lazy
+
+RETRO_STORE_PATH = os.getenv("RETRO_STORE_PATH", ".vantage/retros.db")
+RETRO_SEED_PATH = os.getenv("RETRO_SEED_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                            "assets", "retrospectives.md"))
+
+RETRO, STANDUP = "retro", "standup"
+CATEGORIES = {
+    "went_well": "What went well",
+    "improve": "What could be improved",
+    "action_item": "Action item",
+    "update": "Standup update",
+    "blocker": "Standup blocker",
+}
+# Headings of the retrospective notes the team writes.
+SECTION_HEADINGS = {"what went well": "went_well", "what could be improved": "improve", "action items": "action_item"}
+RECURRING_THRESHOLD = 0.3
+# Reciprocal-rank constant when full-text and TF-IDF rankings are fused.
+RRF_K = 60
+# Words left out of the index and of search queries.
+STOPWORDS = {"a", "an", "the", "is", "are", "was", "were", "be", "of", "for", "to", "in", "on", "at",
+             "and", "or", "me", "my", "we", "our", "us", "you", "your", "it", "this", "that", "what",
+             "which", "who", "how", "can", "could", "please", "give", "do", "does", "did", "i"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    sprint TEXT NOT NULL,
+    sprint_order INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    category TEXT NOT NULL,
+    member TEXT NOT NULL DEFAULT '',
+    text TEXT NOT NULL,
+    created REAL NOT NULL,
+    UNIQUE (sprint, source, category, member, text)
+);
+"""
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(text, content='entries', content_rowid='id',
+                                                          tokenize='porter');
+CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN
+    INSERT INTO entries_fts(rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN
+    INSERT INTO entries_fts(entries_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+_WORD = re.compile(r"[a-z0-9]+")
+_SPRINT_NUMBER = re.compile(r"(\d+)")
+
+
+@dataclass
+class Entry:
+    sprint: str
+    category: str
+    text: str
+    member: str = ""
+    source: str = RETRO
+    created: float = 0.0
+    id: Optional[int] = None
+
+    def to_dict(self, score: Optional[float] = None) -> dict:
+        entry = {"sprint": self.sprint, "category": self.category, "text": self.text}
+        if self.member:
+            entry["member"] = self.member
+        if self.source != RETRO:
+            entry["source"] = self.source
+        if score is not None:
+            entry["score"] = round(score, 3)
+        return entry
+
+
+def terms(text: str) -> List[str]:
+    """Index terms: lower-case words without stopwords, with a plural "s" dropped."""
+    words = [w for w in _WORD.findall(text.lower()) if w not in STOPWORDS and len(w) > 1]
+    return [w[:-1] if len(w) > 3 and w.endswith("s") and not w.endswith("ss") else w for w in words]
+
+
+def sprint_order(sprint: str) -> int:
+    """Sort key of a sprint name: its number, so "Sprint 10" comes after "Sprint 9"."""
+    match = _SPRINT_NUMBER.search(sprint)
+    return int(match.group(1)) if match else 0
+
+
+def parse_retro_text(text: str, sprint: Optional[str] = None) -> List[Entry]:
+    """Entries of retrospective notes written as "Sprint N Retrospective" blocks.
+
+    Each block has "What Went Well", "What Could Be Improved" and "Action
+    Items" sections with one point per line; quotes and bullets are stripped.
+
+    Args:
+        text: The notes
+        sprint: Sprint for notes without a "Sprint N Retrospective" heading
+    """
+    entries, category = [], None
+    for line in text.splitlines():
+        line = line.strip().lstrip("#*-• ").strip()
+        heading = re.match(r"^(sprint\s+\d+)\s+retrospective$", line, re.I)
+        if heading:
+            sprint, category = heading.group(1).title(), None
+        elif line.lower().rstrip(":") in SECTION_HEADINGS:
+            category = SECTION_HEADINGS[line.lower().rstrip(":")]
+        elif line and category and sprint:
+            entries.append(Entry(sprint=sprint, category=category, text=line.strip('"“” ')))
+    return entries
+
+
+class TfidfIndex:
+    """TF-IDF vectors of a set of texts as an inverted index, searched by cosine similarity in numpy.
+
+    Postings hold each term's documents and L2-normalised weights, so a
+    query only touches the documents sharing a term with it.
+    """
+
+    def __init__(self, texts: List[str]):
+        docs = [terms(text) for text in texts]
+        self.size = len(docs)
+        doc_freq: Dict[str, int] = {}
+        for doc in docs:
+            for term in set(doc):
+                doc_freq[term] = doc_freq.get(term, 0) + 1
+        self.idf = {term: float(np.log((1 + self.size) / (1 + count)) + 1) for term, count in doc_freq.items()}
+        postings: Dict[str, tuple] = {}
+        for i, doc in enumerate(docs):
+            weights = self._weights(doc)
+            for term, weight in weights.items():
+                postings.setdefault(term, ([], []))
+                postings[term][0].append(i)
+                postings[term][1].append(weight)
+        self.postings = {term: (np.array(ids), np.array(weights)) for term, (ids, weights) in postings.items()}
+
+    def _weights(self, doc: List[str]) -> Dict[str, float]:
+        counts: Dict[str, float] = {}
+        for term in doc:
+            if term in self.idf:
+                counts[term] = counts.get(term, 0.0) + self.idf[term]
+        norm = float(np.sqrt(sum(w * w for w in counts.values())))
+        return {term: w / norm for term, w in counts.items()} if norm else {}
+
+    def scores(self, text: str) -> np.ndarray:
+        """Cosine similarity of `text` to every indexed text."""
+        scores = np.zeros(self.size)
+        for term, weight in self._weights(terms(text)).items():
+            ids, weights = self.postings[term]
+            scores[ids] += weight * weights
+        return scores
+
+    def matrix(self, rows: Iterable[int]) -> np.ndarray:
+        """Dense unit vectors of the given documents, over the terms they use."""
+        rows = list(rows)
+        position = {row: i for i, row in enumerate(rows)}
+        columns = []
+        for ids, weights in self.postings.values():
+            keep = np.isin(ids, rows)
+            if keep.any():
+                column = np.zeros(len(rows))
+                column[[position[i] for i in ids[keep]]] = weights[keep]
+                columns.append(column)
+        return np.column_stack(columns) if columns else np.zeros((len(rows), 0))
+
+
+class RetroStore:
+    """Retrospective and standup entries in SQLite, with full-text (FTS5) and TF-IDF search.
+
+    The TF-IDF index is rebuilt in memory on the next search after the
+    database changes, whether this process or another one (the CLI next to
+    the app) wrote to it.
+
+    Args:
+        path: SQLite file to use (":memory:" works for throwaway stores)
+        seed_path: Notes imported when the store is empty, if the file exists
+    """
+
+    def __init__(self, path: str = RETRO_STORE_PATH, seed_path: Optional[str] = RETRO_SEED_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        try:
+            self._conn.executescript(FTS_SCHEMA)
+            self.full_text = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5: TF-IDF alone ranks the results.
+            self.full_text = False
+        self._lock = threading.RLock()
+        self._index = None
+        self._entries: List[Entry] = []
+        if seed_path and os.path.exists(seed_path) and not self.count():
+            with open(seed_path, encoding="utf-8") as f:
+                self.add_many(parse_retro_text(f.read()))
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def add_many(self, entries: Iterable[Entry]) -> int:
+        """Store entries, skipping ones already stored; returns how many were new."""
+        rows = []
+        for entry in entries:
+            if entry.category not in CATEGORIES:
+                raise ValueError(f"Unknown category {entry.category!r}; expected one of {', '.join(CATEGORIES)}")
+            rows.append((entry.sprint, sprint_order(entry.sprint), entry.source, entry.category, entry.member or "",
+                         entry.text.strip(), entry.created or time.time()))
+        with self._lock, self._conn:
+            # Counted from the table: total_changes would include the full-text triggers' writes.
+            before = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO entries (sprint, sprint_order, source, category, member, text, created) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0] - before
+
+    def add(self, sprint: str, category: str, text: str, member: str = "", source: str = RETRO) -> bool:
+        return self.add_many([Entry(sprint=sprint, category=category, text=text, member=member, source=source)]) > 0
+
+    def add_standup(self, sprint: str, member: str, text: str, blocker: bool = False) -> bool:
+        return self.add(sprint, "blocker" if blocker else "update", text, member=member, source=STANDUP)
+
+    def sprints(self) -> List[str]:
+        """Sprints with entries, oldest first."""
+        with self._lock:
+            rows = self._conn.execute("SELECT sprint FROM entries GROUP BY sprint ORDER BY MIN(sprint_order), sprint")
+            return [row[0] for row in rows]
+
+    def _revision(self) -> tuple:
+        # data_version moves when another connection commits; the row count and
+        # largest id move with this connection's own inserts.
+        data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        return (data_version,) + tuple(self._conn.execute("SELECT COUNT(*), MAX(id) FROM entries").fetchone())
+
+    def _all(self):
+        # Entries and their TF-IDF index, rebuilt whenever the database changed.
+        with self._lock:
+            revision = self._revision()
+            if self._index is None or self._index[0] != revision:
+                rows = self._conn.execute(
+                    "SELECT id, sprint, source, category, member, text, created FROM entries "
+                    "ORDER BY sprint_order, id").fetchall()
+                self._entries = [Entry(id=row[0], sprint=row[1], source=row[2], category=row[3], member=row[4],
+                                       text=row[5], created=row[6]) for row in rows]
+                self._index = (revision, TfidfIndex([entry.text for entry in self._entries]))
+            return self._entries, self._index[1]
+
+    def _mask(self, entries: List[Entry], sprint=None, category=None, member=None, source=None) -> np.ndarray:
+        def allowed(value):
+            if value is None:
+                return None
+            return {v.lower() for v in ([value] if isinstance(value, str) else value)}
+        sprints, categories, members, sources = allowed(sprint), allowed(category), allowed(member), allowed(source)
+        return np.array([
+            (sprints is None or entry.sprint.lower() in sprints)
+            and (categories is None or entry.category in categories)
+            and (members is None or entry.member.lower() in members)
+            and (sources is None or entry.source in sources)
+            for entry in entries
+        ], dtype=bool)
+
+    def entries(self, sprint=None, category=None, member=None, source=None) -> List[Entry]:
+        entries, _ = self._all()
+        mask = self._mask(entries, sprint, category, member, source)
+        return [entry for entry, keep in zip(entries, mask) if keep]
+
+    def _full_text_ranks(self, query: str) -> Dict[int, int]:
+        if not self.full_text:
+            return {}
+        words = [w for w in _WORD.findall(query.lower()) if w not in STOPWORDS]
+        if not words:
+            return {}
+        match = " OR ".join(f'"{w}"' for w in words)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT rowid FROM entries_fts WHERE entries_fts MATCH ? ORDER BY bm25(entries_fts) LIMIT 200",
+                (match,)).fetchall()
+        return {row[0]: rank for rank, row in enumerate(rows)}
+
+    def search(self, query: str, limit: int = 8, sprint=None, category=None, member=None,
+               source=None) -> List[dict]:
+        """Entries most relevant to `query`, best first.
+
+        The TF-IDF cosine ranking and the FTS5 (stemmed, BM25) ranking are
+        fused by reciprocal rank, so close paraphrases and word forms both match.
+
+        Returns:
+            Entries as dicts with their cosine similarity to the query as "score"
+        """
+        entries, index = self._all()
+        if not entries:
+            return []
+        cosine = index.scores(query)
+        mask = self._mask(entries, sprint, category, member, source)
+        full_text = self._full_text_ranks(query)
+        fused = np.zeros(len(entries))
+        for rank, i in enumerate(np.argsort(-cosine)):
+            if cosine[i] <= 0:
+                break
+            fused[i] += 1 / (RRF_K + rank)
+        for i, entry in enumerate(entries):
+            if entry.id in full_text:
+                fused[i] += 1 / (RRF_K + full_text[entry.id])
+        fused[~mask] = 0
+        best = [i for i in np.argsort(-fused)[:limit] if fused[i] > 0]
+        return [entries[i].to_dict(float(cosine[i])) for i in best]
+
+    def recurring_issues(self, category: str = "improve", threshold: float = RECURRING_THRESHOLD,
+                         min_sprints: int = 2, limit: int = 8, sprints: Optional[List[str]] = None) -> List[dict]:
+        """Issues raised in more than one sprint, with the action items taken against them.
+
+        Entries of `category` are grouped greedily, oldest first, with the
+        group whose centroid they are most similar to (cosine >= `threshold`).
+
+        Returns:
+            Themes seen in at least `min_sprints` sprints, most widespread first:
+            {"issue", "sprints", "mentions", "examples", "actions"}
+        """
+        entries, index = self._all()
+        rows = [i for i, keep in enumerate(self._mask(entries, sprint=sprints, category=category)) if keep]
+        if not rows:
+            return []
+        vectors = index.matrix(rows)
+        groups: List[List[int]] = []
+        centroids: List[np.ndarray] = []
+        for position, vector in enumerate(vectors):
+            sims = [float(centroid @ vector) / (np.linalg.norm(centroid) or 1) for centroid in centroids]
+            best = int(np.argmax(sims)) if sims else -1
+            if best >= 0 and sims[best] >= threshold:
+                groups[best].append(position)
+                centroids[best] = centroids[best] + vector
+            else:
+                groups.append([position])
+                centroids.append(vector.copy())
+
+        actions = [i for i, keep in enumerate(self._mask(entries, sprint=sprints, category="action_item")) if keep]
+        themes = []
+        for group in groups:
+            members = [entries[rows[p]] for p in group]
+            seen = list(dict.fromkeys(entry.sprint for entry in members))
+            if len(seen) < min_sprints:
+                continue
+            # The latest mention names the issue as it stands now.
+            theme = {"issue": members[-1].text, "sprints": seen, "mentions": len(members),
+                     "examples": [entry.text for entry in members[:-1]][-3:], "actions": []}
+            if actions:
+                scores = index.scores(" ".join(entry.text for entry in members))
+                # Actions are in sprint order: keep when the issue was first acted on and the latest attempts.
+                related = [i for i in actions if scores[i] >= threshold / 2]
+                related = related if len(related) <= 3 else [related[0]] + related[-2:]
+                theme["actions"] = [{"sprint": entries[i].sprint, "text": entries[i].text} for i in related]
+            themes.append(theme)
+        themes.sort(key=lambda theme: (-len(theme["sprints"]), -theme["mentions"]))
+        return themes[:limit]
+
+    def sprint_report(self, sprint: Optional[str] = None) -> Dict[str, List[dict]]:
+        """Every entry of one sprint (the latest by default), grouped by category."""
+        sprints = self.sprints()
+        sprint = sprint or (sprints[-1] if sprints else None)
+        report: Dict[str, List[dict]] = {}
+        for entry in self.entries(sprint=sprint) if sprint else []:
+            item = {"text": entry.text, **({"member": entry.member} if entry.member else {})}
+            report.setdefault(entry.category, []).append(item)
+        return report
+
+
+def open_retro_store() -> RetroStore:
+    return RetroStore()
+
+
+RETRO_STORE = Lazy(open_retro_store, "RETRO_STORE")
+
+
+def retro_context(question: str, store=RETRO_STORE, snippets: int = 10, themes: int = 6) -> dict:
+    """What a retrospective question needs from the history, bounded in size.
+
+    The latest sprint's notes in full, the recurring issues across every
+    sprint and the snippets most relevant to the question.
+    """
+    sprints = store.sprints()
+    latest = sprints[-1] if sprints else None
+    context = {
+        "sprints_recorded": len(sprints),
+        "latest_sprint": latest,
+        "latest_sprint_notes": store.sprint_report(latest) if latest else {},
+        "recurring_issues": store.recurring_issues(limit=themes),
+    }
+    # Snippets from earlier sprints; the latest one is already included in full.
+    earlier = [sprint for sprint in sprints if sprint != latest]
+    context["relevant_earlier_notes"] = store.search(question, limit=snippets, sprint=earlier) if earlier else []
+    return context
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_notes = commands.add_parser("import", help="import retrospective notes")
+    import_notes.add_argument("path")
+    import_notes.add_argument("--sprint", help="sprint for notes without a 'Sprint N Retrospective' heading")
+    add = commands.add_parser("add", help="add one entry")
+    add.add_argument("sprint")
+    add.add_argument("category", choices=sorted(CATEGORIES))
+    add.add_argument("text")
+    add.add_argument("--member", default="")
+    search = commands.add_parser("search", help="search the history")
+    search.add_argument("query")
+    search.add_argument("--limit", type=int, default=8)
+    search.add_argument("--sprint")
+    search.add_argument("--category", choices=sorted(CATEGORIES))
+    recurring = commands.add_parser("recurring", help="issues raised in more than one sprint")
+    recurring.add_argument("--threshold", type=float, default=RECURRING_THRESHOLD)
+    args = parser.parse_args()
+
+    store = RETRO_STORE.get()
+    if args.command == "import":
+        with open(args.path, encoding="utf-8") as f:
+            entries = parse_retro_text(f.read(), args.sprint)
+        print(f"{store.add_many(entries)} of {len(entries)} entries added")
+    elif args.command == "add":
+        source = STANDUP if args.category in ("update", "blocker") else RETRO
+        print("added" if store.add(args.sprint, args.category, args.text, args.member, source) else "already stored")
+    elif args.command == "search":
+        for hit in store.search(args.query, args.limit, sprint=args.sprint, category=args.category):
+            print(f"{hit['score']:.2f}  {hit['sprint']:<10} {hit['category']:<12} {hit['text']}")
+    else:
+        for theme in store.recurring_issues(threshold=args.threshold):
+            print(f"{', '.join(theme['sprints'])}: {theme['issue']}")
+            for action in theme["actions"]:
+                print(f"    action ({action['sprint']}): {action['text']}")
+
+
+if __name__ == "__main__":
+    main()
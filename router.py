@@ -0,0 +1,215 @@
+import re
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+WORKERS = ["scrum_master", "writer", "visualizer"]
+# Named messages the parallel analysis branches add to the conversation.
+ANALYSIS_BRANCHES = ["scrum_master", "metrics", "comments", "chart_data", "retro"]
+
+# Questions the UI sends verbatim (quick questions, standup and retro buttons).
+QUICK_ROUTES = {
+    "summarise the progress of the team": "scrum_master",
+    "list blockers that have been long overdue": "scrum_master",
+    "what's the team velocity in this sprint?": "scrum_master",
+    "are we on track for the sprint?": "scrum_master",
+    "what are the risks for this sprint?": "scrum_master",
+    "summarize the standup updates": "scrum_master",
+    "get the retrospective report": "writer",
+}
+
+RULES: List[Tuple[re.Pattern, str]] = [
+    (re.compile(r"\bretro(spective)?s?\b", re.I), "writer"),
+    (re.compile(r"\b(chart|graph|plot|visuali[sz]e|visuali[sz]ation|diagram|burn ?down|burn ?up|histogram|heat ?map|dashboard)s?\b", re.I), "visualizer"),
+]
+
+EXAMPLES: List[Tuple[str, str]] = [
+    ("summarise the progress of the team", "scrum_master"),
+    ("what is the status of the sprint", "scrum_master"),
+    ("list the blocked tasks", "scrum_master"),
+    ("which tasks are overdue", "scrum_master"),
+    ("who is working on the api layer", "scrum_master"),
+    ("what is the team velocity", "scrum_master"),
+    ("are we on track for the sprint", "scrum_master"),
+    ("what are the risks for this sprint", "scrum_master"),
+    ("how many story points are left", "scrum_master"),
+    ("which tasks are in progress for ankan", "scrum_master"),
+    ("what did the team complete last sprint", "scrum_master"),
+    ("show me the workload of each member", "scrum_master"),
+    ("mark the task as completed", "scrum_master"),
+    ("add a comment to the blocked task", "scrum_master"),
+    ("update the status of the data pipeline task", "scrum_master"),
+    ("who has the most open items", "scrum_master"),
+    ("summarize the standup updates", "scrum_master"),
+    ("what are the comments on the deployment task", "scrum_master"),
+    ("write a report for the stakeholders", "writer"),
+    ("draft an email to the team about the sprint", "writer"),
+    ("rewrite that summary in bullet points", "writer"),
+    ("make the answer shorter", "writer"),
+    ("format the previous answer as a table", "writer"),
+    ("write the retrospective report", "writer"),
+    ("what went well and what could be improved", "writer"),
+    ("thanks", "writer"),
+    ("hello who are you", "writer"),
+    ("show the burndown chart for the sprint", "visualizer"),
+    ("plot the velocity across sprints", "visualizer"),
+    ("draw a graph of tasks by status", "visualizer"),
+    ("visualize the workload per assignee", "visualizer"),
+    ("give me a pie chart of item types", "visualizer"),
+    ("show the burnup trend", "visualizer"),
+    ("create a dashboard of sprint health", "visualizer"),
+]
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+STOPWORDS = {"a", "an", "the", "is", "are", "was", "were", "be", "of", "for", "to", "in", "on", "at",
+             "and", "or", "me", "my", "we", "our", "us", "you", "your", "it", "this", "that", "what",
+             "which", "who", "how", "can", "could", "please", "give", "do", "does", "did", "i"}
+
+
+def _tokens(text: str) -> List[str]:
+    words = [w for w in _TOKEN.findall(text.lower()) if w not in STOPWORDS]
+    return words + [f"{a}_{b}" for a, b in zip(words, words[1:])]
+
+
+class CentroidClassifier:
+    """TF-IDF nearest-centroid text classifier in plain numpy."""
+
+    def __init__(self, examples: Sequence[Tuple[str, str]]):
+        docs = [_tokens(text) for text, _ in examples]
+        self.vocab: Dict[str, int] = {}
+        for doc in docs:
+            for token in doc:
+                self.vocab.setdefault(token, len(self.vocab))
+        df = np.zeros(len(self.vocab))
+        for doc in docs:
+            df[[self.vocab[t] for t in set(doc)]] += 1
+        self.idf = np.log((1 + len(docs)) / (1 + df)) + 1
+
+        self.labels = sorted({label for _, label in examples})
+        matrix = np.vstack([self._vector(doc) for doc in docs])
+        targets = np.array([self.labels.index(label) for _, label in examples])
+        centroids = np.vstack([matrix[targets == i].mean(axis=0) for i in range(len(self.labels))])
+        self.centroids = centroids / np.linalg.norm(centroids, axis=1, keepdims=True)
+
+    def _vector(self, tokens: List[str]) -> np.ndarray:
+        vector = np.zeros(len(self.vocab))
+        for token in tokens:
+            index = self.vocab.get(token)
+            if index is not None:
+                vector[index] += 1
+        vector *= self.idf
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def scores(self, text: str) -> Dict[str, float]:
+        sims = self.centroids @ self._vector(_tokens(text))
+        return dict(zip(self.labels, sims.tolist()))
+
+
+@dataclass
+class Route:
+    next: str
+    reason: str
+    confidence: float
+
+
+class RouterStats:
+    """Thread-safe counters for the fast path."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.fast_hits = 0
+        self.llm_calls = 0
+        self.llm_seconds = 0.0
+
+    def record_hit(self) -> None:
+        with self._lock:
+            self.fast_hits += 1
+
+    def record_llm(self, seconds: float) -> None:
+        with self._lock:
+            self.llm_calls += 1
+            self.llm_seconds += seconds
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            total = self.fast_hits + self.llm_calls
+            avg_llm = self.llm_seconds / self.llm_calls if self.llm_calls else None
+            return {
+                "decisions": total,
+                "fast_hits": self.fast_hits,
+                "llm_calls": self.llm_calls,
+                "hit_rate": self.fast_hits / total if total else 0.0,
+                "avg_llm_seconds": avg_llm,
+                # Estimated from the measured average supervisor call.
+                "saved_seconds": self.fast_hits * avg_llm if avg_llm is not None else None,
+            }
+
+
+class FastRouter:
+    """Decides the supervisor's next worker without the LLM when it is sure.
+
+    Args:
+        min_score: Minimum cosine similarity to the winning centroid
+        min_margin: Minimum gap between the best and second-best label
+    """
+
+    def __init__(self, examples: Sequence[Tuple[str, str]] = EXAMPLES, min_score: float = 0.2,
+                 min_margin: float = 0.1):
+        self.classifier = CentroidClassifier(examples)
+        self.min_score = min_score
+        self.min_margin = min_margin
+        self.stats = RouterStats()
+
+    def intent(self, question: str) -> Optional[Route]:
+        """Which worker the user's question ultimately needs, if we are confident."""
+        key = question.strip().lower()
+        if key in QUICK_ROUTES:
+            return Route(QUICK_ROUTES[key], "quick question", 1.0)
+        for pattern, worker in RULES:
+            if pattern.search(question):
+                return Route(worker, "keyword rule", 1.0)
+        scores = sorted(self.classifier.scores(question).items(), key=lambda item: item[1], reverse=True)
+        (best, score), (_, runner_up) = scores[0], scores[1]
+        if score >= self.min_score and score - runner_up >= self.min_margin:
+            return Route(best, "classifier", score)
+        return None
+
+    def route(self, messages: Sequence) -> Optional[Route]:
+        """Next worker for the conversation, or None to defer to the LLM supervisor.
+
+        Once the scrum master has answered the latest question, a data
+        question goes on to the writer instead of back to the scrum master.
+        """
+        question, answered = latest_question(messages)
+        if not question:
+            return None
+        route = self.intent(question)
+        if route is None:
+            return None
+        if route.next == "scrum_master" and answered:
+            route = Route("writer", f"{route.reason}, analysis done", route.confidence)
+        self.stats.record_hit()
+        return route
+
+
+def _field(message, name):
+    return message.get(name) if isinstance(message, dict) else getattr(message, name, None)
+
+
+def latest_question(messages: Sequence) -> Tuple[Optional[str], bool]:
+    """The last user message and whether an analysis branch replied after it."""
+    answered = False
+    for message in reversed(messages):
+        role = _field(message, "role") or _field(message, "type")
+        name = _field(message, "name")
+        if name in ANALYSIS_BRANCHES:
+            answered = True
+        elif role in ("user", "human") and name not in WORKERS:
+            return _field(message, "content"), answered
+    return None, answered
+
+
+FAST_ROUTER = FastRouter()
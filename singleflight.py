@@ -0,0 +1,124 @@
+import threading
+import weakref
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import tracing
+
+_groups: "weakref.WeakSet[SingleFlight]" = weakref.WeakSet()
+_groups_lock = threading.Lock()
+
+
+class Call:
+    """One in-flight computation that followers wait on."""
+
+    def __init__(self):
+        self._done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+
+    def resolve(self, value) -> None:
+        self.value = value
+        self._done.set()
+
+    def fail(self, error: BaseException) -> None:
+        self.error = error
+        self._done.set()
+
+    def wait(self):
+        """The leader's result; re-raises its exception."""
+        self._done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one upstream call.
+
+    The first caller for a key runs the function; callers that arrive while
+    it is still running wait and get the same result (or exception). Nothing
+    is kept once the call finishes, so this sits in front of a cache, not in
+    place of one.
+
+    Args:
+        name: Reported in `stats()` and as the prefix of the counters it adds to the current trace
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, Call] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.executed = 0
+        self.shared = 0
+        with _groups_lock:
+            _groups.add(self)
+
+    def begin(self, key: Hashable) -> Tuple[Call, bool]:
+        """Join the call in flight for `key`, or start one.
+
+        Returns:
+            The call and whether this caller leads it. A leader must `finish` it.
+        """
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            if call is not None:
+                call.followers += 1
+                self.shared += 1
+                leader = False
+            else:
+                call = self._calls[key] = Call()
+                self.executed += 1
+                leader = True
+        tracing.incr(f"{self.name}_executed" if leader else f"{self.name}_shared")
+        return call, leader
+
+    def finish(self, key: Hashable, call: Call, value=None, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+        if error is not None:
+            call.fail(error)
+        else:
+            call.resolve(value)
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs):
+        """Result of `fn(*args, **kwargs)`, shared with every concurrent caller for `key`."""
+        call, leader = self.begin(key)
+        if not leader:
+            return call.wait()
+        try:
+            value = fn(*args, **kwargs)
+        except BaseException as e:
+            self.finish(key, call, error=e)
+            raise
+        self.finish(key, call, value)
+        return value
+
+    def forget(self, key: Hashable) -> None:
+        """Detach the call in flight for `key`; later callers start a new one (e.g. after a write)."""
+        with self._lock:
+            self._calls.pop(key, None)
+
+    def forget_all(self) -> None:
+        with self._lock:
+            self._calls.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"calls": self.calls, "executed": self.executed, "shared": self.shared,
+                    "in_flight": len(self._calls)}
+
+
+def stats() -> Dict[str, dict]:
+    """Counters of every live group, summed by name; `shared` is the number of upstream calls saved."""
+    with _groups_lock:
+        groups = list(_groups)
+    totals: Dict[str, dict] = {}
+    for flight in groups:
+        total = totals.setdefault(flight.name, {"calls": 0, "executed": 0, "shared": 0, "in_flight": 0})
+        for counter, value in flight.stats().items():
+            total[counter] += value
+    return totals
@@ -0,0 +1,141 @@
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+import pandas as pd
+
+import singleflight
+import tracing
+
+# Version of a snapshot that was never cached (its load was invalidated while it ran).
+UNCACHED_VERSION = -1
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """One immutable view of a ClickUp list.
+
+    Every consumer that reads the same `version` sees the same DataFrame
+    object, so the sidebar, the agent prompt and the tools agree on the data.
+    Treat `df` as read-only: copy it before mutating.
+
+    `version` counts reloads within this process; `fingerprint` is a content
+    hash that stays stable across processes for identical data. A snapshot
+    that was not cached has version UNCACHED_VERSION, which consumers must
+    not cache against.
+    """
+    list_id: str
+    version: int
+    fetched_at: float
+    df: pd.DataFrame
+    fingerprint: str = ""
+
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+
+def fingerprint(df: pd.DataFrame) -> str:
+    """Content hash of a frame's columns and values."""
+    digest = hashlib.sha1(",".join(map(str, df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class SnapshotCache:
+    """Process-wide, TTL-bounded cache of task snapshots keyed by list id.
+
+    Args:
+        loader: Callable that takes a list id and returns the preprocessed DataFrame
+        ttl: Seconds a snapshot stays fresh before the next read reloads it
+    """
+
+    def __init__(self, loader: Callable[[str], pd.DataFrame], ttl: float = 120):
+        self._loader = loader
+        self.ttl = ttl
+        self._snapshots: Dict[str, Snapshot] = {}
+        self._versions: Dict[str, int] = {}
+        self._stale: set = set()
+        # Bumped by invalidate(); a load is only cached if no invalidate happened while it ran.
+        self._epoch = 0
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._flight = singleflight.SingleFlight("snapshot_loads")
+
+    def _is_fresh(self, snapshot: Optional[Snapshot]) -> bool:
+        return (
+            snapshot is not None
+            and snapshot.list_id not in self._stale
+            and snapshot.age() < self.ttl
+        )
+
+    def get(self, list_id: str, force_refresh: bool = False) -> Snapshot:
+        """Return the current snapshot for `list_id`, reloading it if stale."""
+        snapshot = self._snapshots.get(list_id)
+        if not force_refresh and self._is_fresh(snapshot):
+            tracing.incr("snapshot_hits")
+            return snapshot
+
+        # Only one caller per list reloads; the others, forced refreshes
+        # included, wait for that load and share its snapshot.
+        return self._flight.do(list_id, self._reload, list_id, force_refresh)
+
+    def _generation(self, list_id: str) -> tuple:
+        return self._epoch, self._generations.get(list_id, 0)
+
+    def _reload(self, list_id: str, force_refresh: bool) -> Snapshot:
+        with self._lock:
+            snapshot = self._snapshots.get(list_id)
+            # A load that finished just before this one started is reused too.
+            if not force_refresh and self._is_fresh(snapshot):
+                return snapshot
+            generation = self._generation(list_id)
+        with tracing.span(tracing.SNAPSHOT, f"load {list_id}"):
+            df = self._loader(list_id)
+        with self._lock:
+            if self._generation(list_id) != generation:
+                # Invalidated while loading: this frame may predate the write. Its own
+                # callers get it, but it is not cached, so the list stays stale until a
+                # load started after the invalidate finishes.
+                return Snapshot(list_id=list_id, version=UNCACHED_VERSION, fetched_at=time.monotonic(), df=df,
+                                fingerprint=fingerprint(df))
+            version = self._versions.get(list_id, 0)
+            # A loader may hand back the very same frame when nothing changed
+            # upstream; keep the version so downstream caches stay valid.
+            if snapshot is None or df is not snapshot.df:
+                version += 1
+                digest = fingerprint(df)
+            else:
+                digest = snapshot.fingerprint
+            self._versions[list_id] = version
+            snapshot = Snapshot(list_id=list_id, version=version, fetched_at=time.monotonic(), df=df,
+                                fingerprint=digest)
+            self._snapshots[list_id] = snapshot
+            self._stale.discard(list_id)
+        return snapshot
+
+    def peek(self, list_id: str) -> Optional[Snapshot]:
+        """Return the cached snapshot for `list_id` without loading, if any."""
+        return self._snapshots.get(list_id)
+
+    def version(self, list_id: str) -> int:
+        """Version of the latest snapshot for `list_id` (0 if never loaded)."""
+        return self._versions.get(list_id, 0)
+
+    def invalidate(self, list_id: Optional[str] = None) -> None:
+        """Mark one list (or every list) stale so the next read refetches it.
+
+        A load already in flight is detached, so reads after the write start a new one.
+        """
+        with self._lock:
+            if list_id is None:
+                self._epoch += 1
+                self._stale.update(self._snapshots)
+            else:
+                self._generations[list_id] = self._generations.get(list_id, 0) + 1
+                self._stale.add(list_id)
+        if list_id is None:
+            self._flight.forget_all()
+        else:
+            self._flight.forget(list_id)
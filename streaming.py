@@ -0,0 +1,65 @@
+import os
+import time
+from typing import Callable, List
+
+STREAM_FLUSH_MS = float(os.getenv("STREAM_FLUSH_MS", 100))
+STREAM_FLUSH_CHARS = int(os.getenv("STREAM_FLUSH_CHARS", 400))
+
+
+class StreamRenderer:
+    """Collects streamed text and redraws a placeholder in batches.
+
+    Chunks go into a list and the placeholder is only redrawn once
+    `flush_ms` milliseconds have passed or `flush_chars` new characters have
+    arrived since the last redraw. Call `close()` (or leave the `with`
+    block) for the final flush.
+
+    Args:
+        render: Called with the full text on every flush, e.g. `placeholder.markdown`
+        flush_ms: Longest time between redraws while text is arriving
+        flush_chars: Pending characters that force a redraw
+        clock: Time source in seconds
+    """
+
+    def __init__(self, render: Callable[[str], object], flush_ms: float = STREAM_FLUSH_MS,
+                 flush_chars: int = STREAM_FLUSH_CHARS, clock: Callable[[], float] = time.perf_counter):
+        self.render = render
+        self.flush_ms = flush_ms
+        self.flush_chars = flush_chars
+        self.clock = clock
+        self.parts: List[str] = []
+        self.pending = 0
+        self.flushes = 0
+        self.last_flush = clock()
+
+    @property
+    def text(self) -> str:
+        if len(self.parts) > 1:
+            self.parts = ["".join(self.parts)]
+        return self.parts[0] if self.parts else ""
+
+    def write(self, chunk: str) -> None:
+        if not chunk:
+            return
+        self.parts.append(chunk)
+        self.pending += len(chunk)
+        if self.pending >= self.flush_chars or (self.clock() - self.last_flush) * 1000 >= self.flush_ms:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.pending:
+            return
+        self.render(self.text)
+        self.pending = 0
+        self.flushes += 1
+        self.last_flush = self.clock()
+
+    def close(self) -> str:
+        self.flush()
+        return self.text
+
+    def __enter__(self) -> "StreamRenderer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,161 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Re-read a little before the watermark: ClickUp filters with a strict
+# `date_updated_gt` in milliseconds and upserts are idempotent anyway.
+WATERMARK_OVERLAP_MS = 5000
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    list_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    date_created INTEGER,
+    date_updated INTEGER,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (list_id, id)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    list_id TEXT PRIMARY KEY,
+    watermark INTEGER NOT NULL,
+    last_full_sync REAL NOT NULL
+);
+"""
+
+
+class TaskStore:
+    """Local SQLite store of raw ClickUp tasks with incremental sync.
+
+    The first sync of a list downloads everything; later syncs only ask
+    ClickUp for tasks with `date_updated_gt` past the stored watermark and
+    upsert them. Deleted tasks never show up in an incremental pull, so a
+    full resync still runs every `full_sync_interval` seconds.
+
+    Several processes (the app and monitor.py) may share one file. A sync
+    that finds sync_state changed by another process reloads its mirror
+    from SQLite first, so the changes that process pulled are not skipped.
+
+    Args:
+        path: SQLite file to use (":memory:" works for throwaway stores)
+        fetch: Callable(list_id, **filters) returning raw task dicts
+        full_sync_interval: Seconds between full resyncs of a list
+    """
+
+    def __init__(self, path: str, fetch: Callable[..., List[Dict[str, Any]]],
+                 full_sync_interval: float = 24 * 3600):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.fetch = fetch
+        self.full_sync_interval = full_sync_interval
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.RLock()
+        # In-memory mirror so a refresh only touches changed tasks.
+        self._tasks: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._revisions: Dict[str, int] = {}
+        # sync_state this process last wrote per list; anything else means another process synced.
+        self._written: Dict[str, tuple] = {}
+
+    def _state(self, list_id: str) -> Optional[tuple]:
+        return self._conn.execute(
+            "SELECT watermark, last_full_sync FROM sync_state WHERE list_id = ?", (list_id,)
+        ).fetchone()
+
+    def _mirror(self, list_id: str) -> Dict[str, Dict[str, Any]]:
+        if list_id not in self._tasks:
+            rows = self._conn.execute(
+                "SELECT id, payload FROM tasks WHERE list_id = ? ORDER BY date_created DESC, id",
+                (list_id,),
+            )
+            self._tasks[list_id] = {task_id: json.loads(payload) for task_id, payload in rows}
+        return self._tasks[list_id]
+
+    def sync(self, list_id: str, full: bool = False) -> int:
+        """Bring the stored copy of `list_id` up to date.
+
+        A full sync that returns no tasks for a list with stored tasks is
+        treated as a bad response: the stored copy is kept and the next sync
+        tries the full download again.
+
+        Returns:
+            Number of tasks that were new, changed or removed
+        """
+        with self._lock:
+            state = self._state(list_id)
+            if list_id in self._tasks and state != self._written.get(list_id):
+                del self._tasks[list_id]
+                self._revisions[list_id] = self._revisions.get(list_id, 0) + 1
+            full = full or state is None or time.time() - state[1] >= self.full_sync_interval
+            if full:
+                tasks = self.fetch(list_id)
+                if not tasks and self._mirror(list_id):
+                    logger.warning("Full sync of list %s returned no tasks; keeping the stored copy", list_id)
+                    return 0
+            else:
+                tasks = self.fetch(list_id, date_updated_gt=max(state[0] - WATERMARK_OVERLAP_MS, 0))
+
+            rows = [
+                (list_id, task["id"], int(task.get("date_created", 0)), int(task.get("date_updated", 0)),
+                 json.dumps(task))
+                for task in tasks
+            ]
+            watermark = max([row[3] for row in rows], default=state[0] if state else 0)
+            if state is not None and not full:
+                watermark = max(watermark, state[0])
+            last_full_sync = time.time() if full else state[1]
+
+            fetched_ids = {task["id"] for task in tasks}
+            removed = [task_id for task_id in self._mirror(list_id) if task_id not in fetched_ids] if full else []
+            with self._conn:
+                # Only tasks missing from a successful full fetch are deleted, in the same transaction.
+                self._conn.executemany("DELETE FROM tasks WHERE list_id = ? AND id = ?",
+                                       [(list_id, task_id) for task_id in removed])
+                self._conn.executemany(
+                    "INSERT INTO tasks (list_id, id, date_created, date_updated, payload) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (list_id, id) DO UPDATE SET date_created = excluded.date_created, "
+                    "date_updated = excluded.date_updated, payload = excluded.payload",
+                    rows,
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sync_state (list_id, watermark, last_full_sync) VALUES (?, ?, ?)",
+                    (list_id, watermark, last_full_sync),
+                )
+            self._written[list_id] = (watermark, last_full_sync)
+
+            mirror = self._mirror(list_id)
+            changed = len(removed)
+            for task_id in removed:
+                del mirror[task_id]
+            for task in tasks:
+                known = mirror.get(task["id"])
+                if known != task:
+                    changed += 1
+                mirror[task["id"]] = task
+            if full:
+                # A full sync lists the tasks in the order ClickUp returned them.
+                self._tasks[list_id] = {task["id"]: mirror[task["id"]] for task in tasks}
+            if changed or list_id not in self._revisions:
+                self._revisions[list_id] = self._revisions.get(list_id, 0) + 1
+            return changed
+
+    def revision(self, list_id: str) -> int:
+        """Counter bumped whenever a sync changes the stored tasks of `list_id`."""
+        return self._revisions.get(list_id, 0)
+
+    def tasks(self, list_id: str) -> List[Dict[str, Any]]:
+        """Return every stored task of `list_id` as raw ClickUp dicts."""
+        with self._lock:
+            return list(self._mirror(list_id).values())
+
+    def watermark(self, list_id: str) -> int:
+        """Largest `date_updated` (ms) seen for `list_id`, 0 if never synced."""
+        with self._lock:
+            state = self._state(list_id)
+        return state[0] if state else 0
@@ -1,10 +1,19 @@
 from langchain_core.tools import tool
 # from analyzer import data_picker_agent, report_generator_agent
 # from data_fetch import get_task_comments
-import requests
 import math, os
-from typing import Optional, Union
+from typing import List, Optional, Union
 from dotenv import load_dotenv
+from data_fetch import get_snapshot, invalidate_tasks, run_get_tasks
+from board_query import filter_tasks, select_tasks
+from prompt_encoding import encode_tasks
+from metrics import compute_metrics
+from clickup_client import get_client
+from comments import COMMENT_CACHE, MAX_BATCH, task_versions
+from members import MEMBER_DIRECTORY, current_index, member_workload, open_tasks
+from bulk_ops import COMMENT_KEYS, MAX_OPERATIONS, idempotency_key, post_comments, summarise, update_statuses
+from retro_store import CATEGORIES, RETRO_STORE
+from pydantic import BaseModel, Field
 load_dotenv()
 
 
@@ -19,15 +28,10 @@ def update_task_status(task_id: str, new_status: str) -> dict:
     Returns:
         Response from the API as a dictionary
     """
-    url = f"https://api.clickup.com/api/v2/task/{task_id}"
     payload = {"status": new_status}
-    headers = {
-        "accept": "application/json",
-        "content-type": "application/json",
-        "Authorization": os.getenv("CLICKUP_API_KEY")
-    }
-    
-    response = requests.put(url, json=payload, headers=headers)
+    response = get_client().put(f"task/{task_id}", json=payload)
+    if response.ok:
+        invalidate_tasks()
     return response.json()
 
 
@@ -44,18 +48,21 @@ def get_task_comments(task_id: str, fetch_comments: bool = False) -> list:
     """
     if not fetch_comments:
         return []
-        
-    url = f"https://api.clickup.com/api/v2/task/{task_id}/comment"
-    headers = {
-        "accept": "application/json",
-        "Authorization": os.getenv("CLICKUP_API_KEY")
-    }
-    
-    response = requests.get(url, headers=headers)
-    comments = response.json().get('comments', [])
-    
-    refined_comments = [{"comment_text": comment["comment_text"], "username": comment["user"]["username"]} for comment in comments]
-    return refined_comments
+    return COMMENT_CACHE.get().get(task_id, task_versions(run_get_tasks()).get(task_id))
+
+
+@tool
+def get_comments_for_tasks(task_ids: List[str]) -> dict:
+    """Get the comments of several tasks in one call; they are fetched concurrently.
+    Prefer this over calling get_task_comments once per task.
+
+    Args:
+        task_ids: The IDs of the tasks to get comments for (up to 50)
+
+    Returns:
+        Dictionary mapping each task ID to its list of comments (text and username), or to an error
+    """
+    return COMMENT_CACHE.get_many(task_ids[:MAX_BATCH], task_versions(run_get_tasks()))
 
 @tool
 def get_list_members() -> dict:
@@ -64,17 +71,38 @@ def get_list_members() -> dict:
     Returns:
         Dictionary containing a list of members with their id, username, and email
     """
-    url = "https://api.clickup.com/api/v2/list/901607182023/member"
-    headers = {
-        "accept": "application/json",
-        "Authorization": os.getenv("CLICKUP_API_KEY")
+    return {"members": MEMBER_DIRECTORY.members(get_snapshot())}
+
+
+@tool
+def get_member_workload(member: Optional[str] = None, sprint_name: Optional[str] = None, limit: int = 20) -> dict:
+    """Workload of a team member: task counts (open, in progress, blocked, done), story points and open items.
+    Without `member`, returns the workload of every assignee.
+
+    Args:
+        member: Username or part of one, e.g. "ankan"
+        sprint_name: Only count tasks of this sprint, e.g. "sprint 3"
+        limit: Maximum number of open items to list
+
+    Returns:
+        Dictionary with the member's details, workload and open items (a '|' separated table)
+    """
+    snapshot, index = current_index()
+    if not member:
+        return {"members": [{"assignee": username, **member_workload(index.tasks_for(username, sprint_name))}
+                            for username in index.names()]}
+    matches = index.resolve(member)
+    if len(matches) != 1:
+        reason = f"{member!r} matches several assignees" if matches else f"No assignee matches {member!r}"
+        return {"error": reason, "assignees": matches or index.names()}
+    username = matches[0]
+    tasks = index.tasks_for(username, sprint_name)
+    pending = open_tasks(tasks)
+    return {
+        "member": MEMBER_DIRECTORY.by_username(snapshot).get(username, {"username": username}),
+        "workload": member_workload(tasks),
+        "open_items": encode_tasks(select_tasks(pending, limit=limit)),
     }
-    
-    response = requests.get(url, headers=headers)
-    members_data = response.json()
-    members = [{"id": member["id"], "username": member["username"], "email": member["email"]} for member in members_data["members"]]
-    
-    return {"members": members}
 
 @tool
 def add_comment(task_id: str, new_comment: str) -> dict:
@@ -87,21 +115,172 @@ def add_comment(task_id: str, new_comment: str) -> dict:
     Returns:
         Response from the API as a dictionary
     """
-    url = f"https://api.clickup.com/api/v2/task/{task_id}/comment?custom_task_ids=false"
-    
+    # A single comment is always posted, even when it repeats an earlier one; it is
+    # recorded so bulk_add_comments does not post it again.
     payload = {
         "notify_all": False,
         "comment_text": new_comment
     }
-    headers = {
-        "accept": "application/json",
-        "content-type": "application/json",
-        "Authorization": os.getenv("CLICKUP_API_KEY")
-    }
-    
-    response = requests.post(url, json=payload, headers=headers)
-    
+    response = get_client().post(f"task/{task_id}/comment", params={"custom_task_ids": "false"}, json=payload)
+    if response.ok:
+        COMMENT_KEYS.record(idempotency_key(task_id, new_comment))
+        COMMENT_CACHE.invalidate(task_id)
+        invalidate_tasks()
+
     return response.json()
+
+
+class StatusChange(BaseModel):
+    task_id: str = Field(description="The ID of the task to update")
+    new_status: str = Field(description="The new status to set for the task")
+
+
+class NewComment(BaseModel):
+    task_id: str = Field(description="The ID of the task to comment on")
+    comment: str = Field(description="The text of the comment")
+
+
+@tool
+def bulk_update_task_status(changes: List[StatusChange]) -> dict:
+    """Update the status of several tasks in one call. Tasks already in the requested status are skipped.
+
+    Args:
+        changes: The status changes to make (up to 50)
+
+    Returns:
+        Dictionary with a count per outcome (updated, skipped, error) and one result per change
+    """
+    df = run_get_tasks()
+    results = update_statuses([(c.task_id, c.new_status) for c in changes[:MAX_OPERATIONS]],
+                              current=dict(zip(df["id"], df["status"])))
+    if any(r["result"] == "updated" for r in results):
+        invalidate_tasks()
+    return summarise(results)
+
+
+@tool
+def bulk_add_comments(comments: List[NewComment]) -> dict:
+    """Add comments to several tasks in one call. A comment identical to one this app recently posted on the task is not posted again.
+
+    Args:
+        comments: The comments to add (up to 50)
+
+    Returns:
+        Dictionary with a count per outcome (posted, duplicate, error) and one result per comment
+    """
+    results = post_comments([(c.task_id, c.comment) for c in comments[:MAX_OPERATIONS]])
+    posted = {r["task_id"] for r in results if r["result"] == "posted"}
+    for task_id in posted:
+        COMMENT_CACHE.invalidate(task_id)
+    if posted:
+        invalidate_tasks()
+    return summarise(results)
+
+
+@tool
+def query_tasks(
+    status: Optional[List[str]] = None,
+    sprint_name: Optional[List[str]] = None,
+    assignee: Optional[List[str]] = None,
+    item_type: Optional[List[str]] = None,
+    priority: Optional[List[str]] = None,
+    date_field: str = "date_updated",
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    limit: int = 50,
+) -> dict:
+    """Search the project board and return only the matching tasks.
+
+    Args:
+        status: Statuses to keep, e.g. ["blocked", "in progress"]
+        sprint_name: Sprints to keep, e.g. ["sprint 2"]
+        assignee: Usernames (or parts of them) to keep
+        item_type: Item types to keep: story, epic, task, bug, improvements
+        priority: Priority names to keep: urgent, high, normal, low
+        date_field: Date column used by date_from/date_to: "date_updated" or "date_created"
+        date_from: Inclusive start date, YYYY-MM-DD
+        date_to: Inclusive end date, YYYY-MM-DD
+        columns: Columns to return; defaults to a compact set without descriptions
+        limit: Maximum number of tasks to return (up to 200)
+
+    Returns:
+        Dictionary with the total match count and the returned tasks, most recently updated first.
+        Tasks are a '|' separated table; its first lines define the S<n> status and P<n> people codes.
+    """
+    try:
+        matches = filter_tasks(run_get_tasks(), status=status, sprint_name=sprint_name, assignee=assignee,
+                               item_type=item_type, priority=priority, date_field=date_field,
+                               date_from=date_from, date_to=date_to)
+    except ValueError as e:
+        return {"error": str(e)}
+    selected = select_tasks(matches, columns=columns, limit=limit)
+    return {"total_matches": len(matches), "returned": len(selected), "tasks": encode_tasks(selected)}
+
+
+@tool
+def get_sprint_metrics(sprint_name: Optional[str] = None, include_burndown: bool = True) -> dict:
+    """Compute sprint metrics from the board in one call: velocity, committed and remaining points,
+    completion ratio, carry-over, blocked counts and blocked age per sprint, workload per assignee,
+    and the daily burndown of one sprint.
+
+    Args:
+        sprint_name: Sprint to focus the per-assignee and burndown figures on, e.g. "sprint 3"
+            (defaults to the latest sprint)
+        include_burndown: Whether to include the daily burndown series
+
+    Returns:
+        Dictionary of metrics; ages are in days and points are story points
+    """
+    return compute_metrics(run_get_tasks(), sprint_name=sprint_name, include_burndown=include_burndown)
+
+
+@tool
+def search_retrospectives(
+    query: str,
+    sprint_name: Optional[List[str]] = None,
+    category: Optional[List[str]] = None,
+    member: Optional[str] = None,
+    limit: int = 8,
+) -> dict:
+    """Search the retrospective and standup history and return only the relevant notes.
+
+    Args:
+        query: What to look for, e.g. "blockers raised too late" or "documentation"
+        sprint_name: Sprints to search, e.g. ["Sprint 2"]; defaults to all
+        category: Kinds of notes to keep: went_well, improve, action_item, update, blocker
+        member: Only notes from this team member
+        limit: Maximum number of notes to return (up to 30)
+
+    Returns:
+        Dictionary with the sprints on record and the matching notes, most relevant first
+    """
+    unknown = sorted(set(category or []) - set(CATEGORIES))
+    if unknown:
+        return {"error": f"Unknown categories {unknown}; use {', '.join(CATEGORIES)}"}
+    sprints = RETRO_STORE.sprints()
+    if sprint_name:
+        wanted = {name.strip().lower() for name in sprint_name}
+        sprint_name = [sprint for sprint in sprints if sprint.lower() in wanted]
+    notes = RETRO_STORE.search(query, limit=min(limit, 30), sprint=sprint_name, category=category, member=member)
+    return {"sprints_recorded": sprints, "notes": notes}
+
+
+@tool
+def get_recurring_issues(sprint_name: Optional[List[str]] = None, limit: int = 8) -> dict:
+    """Issues raised under "what could be improved" in more than one retrospective, with the sprints they
+    came up in and the action items already taken against them.
+
+    Args:
+        sprint_name: Sprints to consider, e.g. ["Sprint 4", "Sprint 5"]; defaults to all
+        limit: Maximum number of issues to return
+
+    Returns:
+        Dictionary with the recurring issues, most widespread first
+    """
+    return {"recurring_issues": RETRO_STORE.recurring_issues(limit=limit, sprints=sprint_name)}
+
+
 @tool
 def math_calculator(
     operation: str, 
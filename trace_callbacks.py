@@ -0,0 +1,69 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+import tracing
+
+
+def _usage(response) -> Dict[str, Optional[int]]:
+    """Token counts from an LLMResult, from usage_metadata or the provider's llm_output."""
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                return {"input_tokens": usage.get("input_tokens"), "output_tokens": usage.get("output_tokens")}
+    usage = (response.llm_output or {}).get("token_usage") or {}
+    return {"input_tokens": usage.get("prompt_tokens"), "output_tokens": usage.get("completion_tokens")}
+
+
+class TraceCallbackHandler(BaseCallbackHandler):
+    """Turns LangChain model and tool callbacks into `llm` and `tool` spans of the current trace.
+
+    Covers calls that never pass through our own wrappers, such as the react
+    agent's tool-bound model and its tool executions.
+    """
+
+    def __init__(self):
+        self._starts: Dict[Any, tuple] = {}
+        self._lock = threading.Lock()
+
+    def _start(self, run_id, name: str, **attrs) -> None:
+        if tracing.current_trace() is None:
+            return
+        with self._lock:
+            self._starts[run_id] = (name, time.time(), time.perf_counter(), tracing.current_span_id(), attrs)
+
+    def _end(self, kind: str, run_id, error: Optional[str] = None, **attrs) -> None:
+        with self._lock:
+            started = self._starts.pop(run_id, None)
+        if started is None:
+            return
+        name, start, perf_start, parent_id, start_attrs = started
+        tracing.record(kind, name, start, (time.perf_counter() - perf_start) * 1000, parent_id=parent_id,
+                       error=error, **start_attrs, **attrs)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        params = kwargs.get("invocation_params") or {}
+        model = params.get("model_name") or params.get("model") or (serialized or {}).get("name") or "chat_model"
+        self._start(run_id, model, node=tracing.current_node() or (metadata or {}).get("langgraph_node"),
+                    messages=sum(len(m) for m in messages))
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._end(tracing.LLM, run_id, **_usage(response))
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._end(tracing.LLM, run_id, error=f"{type(error).__name__}: {error}")
+
+    def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        self._start(run_id, (serialized or {}).get("name") or kwargs.get("name") or "tool")
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._end(tracing.TOOL, run_id)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._end(tracing.TOOL, run_id, error=f"{type(error).__name__}: {error}")
+
+
+TRACE_CALLBACK = TraceCallbackHandler()
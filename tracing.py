@@ -0,0 +1,238 @@
+import contextvars
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+from dotenv import load_dotenv
+load_dotenv()
+
+# JSON lines file spans are appended to; empty disables writing.
+TRACE_PATH = os.getenv("TRACE_PATH", ".vantage/traces.jsonl")
+TRACING = os.getenv("TRACING", "true").lower() in ("1", "true", "yes")
+
+NODE = "node"
+LLM = "llm"
+TOOL = "tool"
+CLICKUP = "clickup"
+SNAPSHOT = "snapshot"
+_ID_SEGMENT = re.compile(r"/(?=[^/]*\d)[^/?]+")
+
+_current_trace: contextvars.ContextVar[Optional["Trace"]] = contextvars.ContextVar("trace", default=None)
+_current_span: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("span", default=None)
+_current_node: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("node", default=None)
+_write_lock = threading.Lock()
+
+
+def _new_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+class Trace:
+    """Spans and counters recorded while answering one question.
+
+    Spans are dicts with kind (node, llm, tool, clickup, snapshot), name, start (epoch
+    seconds), duration_ms, parent_id and free-form attrs such as token counts,
+    bytes transferred or cache hits.
+    """
+
+    def __init__(self, name: str, **attrs):
+        self.trace_id = _new_id()
+        self.name = name
+        self.attrs = attrs
+        self.start = time.time()
+        self.duration_ms: Optional[float] = None
+        self.spans: List[dict] = []
+        self.counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, span: dict) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def incr(self, counter: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + n
+
+    def breakdown(self) -> List[dict]:
+        """Spans aggregated per (kind, name), slowest first; model calls are split by the node making them."""
+        rows: Dict[tuple, dict] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            name = span["name"]
+            if span["kind"] == LLM and span["attrs"].get("node"):
+                name = f"{span['attrs']['node']}: {name}"
+            row = rows.setdefault((span["kind"], name), {
+                "kind": span["kind"], "name": name, "calls": 0, "total_ms": 0.0,
+                "input_tokens": 0, "output_tokens": 0, "bytes": 0, "cache_hits": 0, "errors": 0})
+            attrs = span["attrs"]
+            row["calls"] += 1
+            row["total_ms"] += span["duration_ms"]
+            row["input_tokens"] += attrs.get("input_tokens") or 0
+            row["output_tokens"] += attrs.get("output_tokens") or 0
+            row["bytes"] += attrs.get("bytes") or 0
+            row["cache_hits"] += 1 if attrs.get("cache_hit") else 0
+            row["errors"] += 1 if span["status"] == "error" else 0
+        for row in rows.values():
+            row["total_ms"] = round(row["total_ms"], 1)
+        return sorted(rows.values(), key=lambda row: -row["total_ms"])
+
+    def summary(self) -> dict:
+        with self._lock:
+            spans = list(self.spans)
+            counters = dict(self.counters)
+        llm = [s for s in spans if s["kind"] == LLM]
+        clickup = [s for s in spans if s["kind"] == CLICKUP]
+        return {
+            "total_ms": round(self.duration_ms or (time.time() - self.start) * 1000, 1),
+            "llm_calls": sum(1 for s in llm if not s["attrs"].get("cache_hit")),
+            "llm_cache_hits": sum(1 for s in llm if s["attrs"].get("cache_hit")),
+            "input_tokens": sum(s["attrs"].get("input_tokens") or 0 for s in llm),
+            "output_tokens": sum(s["attrs"].get("output_tokens") or 0 for s in llm),
+            "clickup_requests": len(clickup),
+            "clickup_bytes": sum(s["attrs"].get("bytes") or 0 for s in clickup),
+            **counters,
+        }
+
+    def to_records(self) -> List[dict]:
+        with self._lock:
+            spans = list(self.spans)
+        root = {"trace_id": self.trace_id, "span_id": self.trace_id, "parent_id": None, "kind": "trace",
+                "name": self.name, "start": self.start, "duration_ms": self.duration_ms, "status": "ok",
+                "attrs": {**self.attrs, **self.summary()}}
+        return [root] + [{"trace_id": self.trace_id, **span} for span in spans]
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def current_span_id() -> Optional[str]:
+    return _current_span.get()
+
+
+def current_node() -> Optional[str]:
+    """Name of the graph node running in this context, if any."""
+    return _current_node.get()
+
+
+def write_trace(trace: Trace, path: str = TRACE_PATH) -> None:
+    if not path:
+        return
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    lines = "".join(json.dumps(record, default=str) + "\n" for record in trace.to_records())
+    with _write_lock, open(path, "a") as f:
+        f.write(lines)
+
+
+@contextmanager
+def trace(name: str, path: str = TRACE_PATH, **attrs):
+    """Record every span started in this context (and the threads it hands work to) into one Trace.
+
+    Yields None when tracing is disabled.
+    """
+    if not TRACING:
+        yield None
+        return
+    current = Trace(name, **attrs)
+    trace_token = _current_trace.set(current)
+    span_token = _current_span.set(current.trace_id)
+    started = time.perf_counter()
+    try:
+        yield current
+    finally:
+        current.duration_ms = (time.perf_counter() - started) * 1000
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+        try:
+            write_trace(current, path)
+        except OSError as e:
+            print(f"Could not write trace to {path}: {e}")
+
+
+def record(kind: str, name: str, start: float, duration_ms: float, parent_id: Optional[str] = None,
+           error: Optional[str] = None, **attrs) -> None:
+    """Add an already finished span to the current trace, if any."""
+    current = _current_trace.get()
+    if current is None:
+        return
+    current.add({
+        "span_id": _new_id(), "parent_id": parent_id or _current_span.get(), "kind": kind, "name": name,
+        "start": start, "duration_ms": round(duration_ms, 3), "status": "error" if error else "ok",
+        "error": error, "attrs": attrs,
+    })
+
+
+@contextmanager
+def span(kind: str, name: str, **attrs):
+    """Time the enclosed block as a child of the current span.
+
+    Yields the attrs dict, so the block can add details (status, bytes, ...)
+    as it learns them. Outside a trace this costs one ContextVar lookup.
+    """
+    current = _current_trace.get()
+    if current is None:
+        yield attrs
+        return
+    span_id = _new_id()
+    parent_id = _current_span.get()
+    token = _current_span.set(span_id)
+    start, started = time.time(), time.perf_counter()
+    error = None
+    try:
+        yield attrs
+    except BaseException as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current_span.reset(token)
+        current.add({
+            "span_id": span_id, "parent_id": parent_id, "kind": kind, "name": name, "start": start,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+            "status": "error" if error else "ok", "error": error, "attrs": attrs,
+        })
+
+
+def incr(counter: str, n: int = 1) -> None:
+    current = _current_trace.get()
+    if current is not None:
+        current.incr(counter, n)
+
+
+def traced_node(name: str, func: Callable) -> Callable:
+    """Wrap a graph node so each run is a `node` span."""
+    @wraps(func)
+    def node(state):
+        token = _current_node.set(name)
+        try:
+            with span(NODE, name):
+                return func(state)
+        finally:
+            _current_node.reset(token)
+    return node
+
+
+def propagate(func: Callable) -> Callable:
+    """Run `func` in a copy of the caller's context, so pool threads record into the caller's trace."""
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        # A Context can only be entered by one thread at a time; copy it per call.
+        return context.copy().run(func, *args, **kwargs)
+    return run
+
+
+def endpoint(path: str) -> str:
+    """ClickUp path with ids collapsed, e.g. "task/86abc/comment" -> "task/:id/comment"."""
+    path = urlparse(path).path if "://" in path else path.split("?", 1)[0]
+    path = path.split("/api/v2", 1)[-1]
+    return _ID_SEGMENT.sub("/:id", "/" + path.strip("/")).lstrip("/")